@@ -0,0 +1,60 @@
+"""
+Product changelist latency, stock admin against ADMIN_PERFORMANCE_MODE, on a
+seeded catalog: the first page, a deep page, filters and a search.
+
+    python benchmarks/admin_changelist.py [--products 1000000] [--repeat 3]
+"""
+
+import argparse
+
+from common import seed_products, setup_django, timed
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--products', type=int, default=1000000)
+parser.add_argument('--repeat', type=int, default=3)
+args = parser.parse_args()
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+from furniture_app.models import Product  # noqa: E402
+
+CHANGELIST = '/admin/furniture_app/product/'
+PAGE = 500
+
+print(f'seeded {args.products} products in {seed_products(args.products):.0f} s')
+client = Client()
+client.force_login(User.objects.create_superuser('root', 'root@example.com', 'pw'))
+# The keyset page that holds the same rows as ?p=PAGE + 1.
+after = Product.objects.order_by('-pk').values_list('pk', flat=True)[PAGE * 100]
+
+CASES = {
+    False: [
+        ('first page', ''),
+        (f'page {PAGE}', f'?p={PAGE + 1}'),
+        ('category filter', '?category__exact=OFFICE'),
+        ('two filters', '?category__exact=OFFICE&on_sale__exact=1'),
+        ('search', '?q=walnut+rustic'),
+    ],
+    True: [
+        ('first page', ''),
+        (f'page {PAGE}', f'?after={after}'),
+        ('category filter', '?category=OFFICE'),
+        ('two filters', '?category=OFFICE&on_sale=True'),
+        ('search', '?q=walnut+rustic'),
+    ],
+}
+
+
+def load(url):
+    response = client.get(url)
+    assert response.status_code == 200, (url, response.status_code)
+
+
+for mode, label in ((False, 'stock changelist'), (True, 'performance mode')):
+    print(label)
+    with override_settings(ADMIN_PERFORMANCE_MODE=mode):
+        for case, query in CASES[mode]:
+            # Best of --repeat: the facet cache is warm after the first load.
+            print(f'  {case:16} {min(timed(lambda: load(CHANGELIST + query), args.repeat)):8.0f} ms')
@@ -0,0 +1,67 @@
+"""
+Reading the whole catalog through the JSON API against scraping the index
+page, at the same product count. API reads walk every cursor page, once with
+a cold cache, once warm and once revalidating each page's ETag (304s).
+
+    python benchmarks/api.py [--products 500] [--limit 200] [--repeat 30]
+"""
+
+import argparse
+
+from common import setup_django, summary, timed
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--products', type=int, default=500)
+parser.add_argument('--limit', type=int, default=200, help='API page size')
+parser.add_argument('--repeat', type=int, default=30)
+args = parser.parse_args()
+setup_django()
+
+from django.test import Client, override_settings  # noqa: E402
+
+from furniture_app.caching import bump_catalog_version  # noqa: E402
+from furniture_app.models import Product  # noqa: E402
+
+Product.objects.bulk_create([
+    Product(name=f'Product {i}', price=10 + i % 90, category=['OFFICE', 'BEDROOM', 'KITCHEN'][i % 3])
+    for i in range(args.products)
+])
+client = Client()
+# Per page URL: the ETag last served and the next page's URL.
+etags, pages = {}, {}
+
+
+def read_api(revalidate=False):
+    url, count = f'/api/v1/products/?limit={args.limit}', 0
+    while url:
+        headers = {'If-None-Match': etags[url]} if revalidate else {}
+        response = client.get(url, headers=headers)
+        if response.status_code == 304:
+            url = pages[url]
+            continue
+        etags[url] = response['ETag']
+        payload = response.json()
+        pages[url] = payload['next']
+        count += len(payload['results'])
+        url = payload['next']
+    return count
+
+
+def read_api_uncached():
+    bump_catalog_version()
+    read_api()
+
+
+assert read_api() == args.products
+
+with override_settings(ANONYMOUS_PAGE_CACHE=False):
+    cases = {
+        'scrape index': lambda: client.get('/'),
+        'api uncached': read_api_uncached,
+        'api cached': read_api,
+        'api 304': lambda: read_api(revalidate=True),
+    }
+    print(f'{args.products} products per read')
+    for label, read in cases.items():
+        read()
+        print(f'  {label:14} {summary(timed(read, args.repeat))}')
@@ -0,0 +1,72 @@
+"""
+The admin orders dashboard and a customer's order history page before and
+after archiving finished orders out of the hot Order/OrderItem tables
+(furniture_app.archive).
+
+    python benchmarks/archive.py [--orders 20000] [--old 0.9] [--repeat 3]
+"""
+
+import argparse
+import random
+from datetime import timedelta
+
+from common import setup_django, summary, timed
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--orders', type=int, default=20000)
+parser.add_argument('--old', type=float, default=0.9, help='share of orders older than the archive cutoff')
+parser.add_argument('--repeat', type=int, default=3)
+args = parser.parse_args()
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from furniture_app.archive import archive_batch, default_cutoff  # noqa: E402
+from furniture_app.models import Order, OrderItem, Product  # noqa: E402
+from furniture_app.order_summary import suspend_summary_updates  # noqa: E402
+
+rnd = random.Random(1)
+users = User.objects.bulk_create([User(username=f'user{i}') for i in range(50)])
+product = Product.objects.create(name='Oak Chair', price=5)
+with suspend_summary_updates():
+    orders = Order.objects.bulk_create([
+        Order(user=rnd.choice(users), total_price=15, payment_method='COD',
+              status=rnd.choice(['DELIVERED', 'DELIVERED', 'CANCELLED', 'PENDING']))
+        for _ in range(args.orders)
+    ])
+    OrderItem.objects.bulk_create([
+        OrderItem(order=order, product=product, quantity=1, price=5, product_name=product.name)
+        for order in orders for _ in range(3)
+    ])
+Order.objects.filter(pk__lte=orders[int(args.orders * args.old) - 1].pk).update(
+    order_date=timezone.now() - timedelta(days=800),
+)
+
+
+staff = Client()
+staff.force_login(User.objects.create_user('staff', is_staff=True))
+customer = Client()
+customer.force_login(users[0])
+
+
+def get(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.status_code
+    b''.join(response.streaming_content) if response.streaming else response.content
+
+
+def report(label):
+    print(f'{label}: {Order.objects.count()} hot orders')
+    print(f'  orders dashboard  {summary(timed(lambda: get(staff, "/admin-dashboard/orders/"), args.repeat))}')
+    print(f'  order history     {summary(timed(lambda: get(customer, "/profile/orders/"), args.repeat * 10))}')
+
+
+report('before')
+cutoff = default_cutoff()
+moved = timed(lambda: archive_batch(cutoff, 2000), 1)[0]
+while archive_batch(cutoff, 2000):
+    pass
+report('after')
+print(f'first 2000-order archive batch took {moved:.0f} ms')
@@ -0,0 +1,131 @@
+"""
+Add-to-cart POSTs from many logged-in users against real servers: gunicorn
+with sync workers (gunicorn.conf.py) and uvicorn with the async views
+(myfurniture_app.asgi). Both share one SQLite file and file cache in a
+temporary directory.
+
+    python benchmarks/asgi_load.py [--users 200] [--requests 2000] [--concurrency 50 200] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--users', type=int, default=200)
+parser.add_argument('--requests', type=int, default=2000)
+parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200])
+parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+parser.add_argument('--port', type=int, default=8765)
+args = parser.parse_args()
+
+tmp = Path(tempfile.mkdtemp(prefix='furniture-bench-'))
+env = {
+    **os.environ,
+    'DJANGO_SETTINGS_MODULE': 'myfurniture_app.settings',
+    'DB_PATH': str(tmp / 'db.sqlite3'),
+    'CACHE_BACKEND': 'file',
+    'CACHE_DIR': str(tmp / 'cache'),
+}
+os.environ.update(env)
+sys.path.insert(0, str(ROOT))
+subprocess.run([sys.executable, 'manage.py', 'migrate', '--verbosity', '0'], cwd=ROOT, env=env, check=True)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from furniture_app.models import Product  # noqa: E402
+
+product = Product.objects.create(name='Oak Chair', price=10)
+sessions = []
+for i in range(args.users):
+    client = Client()
+    client.force_login(User.objects.create_user(f'user{i}'))
+    client.get('/cart/summary/')
+    sessions.append((client.cookies['sessionid'].value, client.cookies['csrftoken'].value))
+
+SERVERS = {
+    f'gunicorn, {args.workers} sync workers': (
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        {'GUNICORN_BIND': f'127.0.0.1:{args.port}', 'WEB_CONCURRENCY': str(args.workers)},
+    ),
+    'uvicorn, 1 worker (async views)': (
+        [sys.executable, '-m', 'uvicorn', 'myfurniture_app.asgi:application', '--port', str(args.port), '--log-level', 'warning'],
+        {},
+    ),
+}
+
+
+async def post(session_id, csrf_token):
+    body = b'quantity=1'
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', args.port)
+    writer.write((
+        f'POST /add_to_cart/{product.pk}/ HTTP/1.1\r\nHost: localhost\r\n'
+        f'Cookie: sessionid={session_id}; csrftoken={csrf_token}\r\nX-CSRFToken: {csrf_token}\r\n'
+        f'Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n'
+    ).encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return time.perf_counter() - start, response.split(b' ', 2)[1].decode()
+
+
+async def load(concurrency):
+    latencies, statuses, sent = [], {}, 0
+
+    async def user(i):
+        nonlocal sent
+        while sent < args.requests:
+            sent += 1
+            seconds, status = await post(*sessions[i % len(sessions)])
+            latencies.append(seconds)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[user(i) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f'  c={concurrency:<4} {len(latencies) / elapsed:5.0f} req/s   p50 {latencies[len(latencies) // 2]:5.2f} s'
+          f'   p99 {latencies[int(len(latencies) * 0.99)]:5.2f} s   statuses {statuses}')
+
+
+def wait_for_port(log):
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', args.port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit('server did not start:\n' + log.read_text())
+
+
+try:
+    for label, (command, server_env) in SERVERS.items():
+        log = tmp / 'server.log'
+        with open(log, 'w') as output:
+            server = subprocess.Popen(command, cwd=ROOT, env={**env, **server_env}, stdout=output, stderr=output)
+        try:
+            wait_for_port(log)
+            print(label)
+            for concurrency in args.concurrency:
+                asyncio.run(load(concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
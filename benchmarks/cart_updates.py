@@ -0,0 +1,48 @@
+"""
+Concurrent add-to-cart throughput: threads adding to the same cart line
+through furniture_app.cart.add_item on a file database, checking that no
+increment is lost.
+
+    python benchmarks/cart_updates.py [--threads 1 4 8] [--adds 200]
+"""
+
+import argparse
+import threading
+import time
+
+from common import setup_django
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+parser.add_argument('--adds', type=int, default=200, help='adds per thread')
+args = parser.parse_args()
+setup_django()
+
+from django.db import connection  # noqa: E402
+
+from furniture_app.cart import add_item  # noqa: E402
+from furniture_app.models import Cart, CartItem, Product  # noqa: E402
+
+product = Product.objects.create(name='Oak Chair', price=25)
+
+
+def worker(cart):
+    try:
+        for _ in range(args.adds):
+            add_item(cart, product, 1, product.price)
+    finally:
+        connection.close()
+
+
+for count in args.threads:
+    cart = Cart.objects.create()
+    threads = [threading.Thread(target=worker, args=(cart,)) for _ in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    quantity = CartItem.objects.get(cart=cart).quantity
+    cart.refresh_from_db()
+    print(f'{count} threads: {count * args.adds / seconds:6.0f} adds/s   quantity {quantity}/{count * args.adds}   cart count {cart.item_count}')
@@ -0,0 +1,95 @@
+"""
+Order and cart write throughput across processes, with carts and sessions in
+the primary database file ("one file") and in their own DB_CARTS_PATH file
+("two files").
+
+Cart processes add to a cart and save a session in a loop, as shoppers
+browsing do; order processes place orders at the same time. With one file
+every write queues on the same SQLite lock.
+
+    python benchmarks/carts_database.py [--seconds 10] [--cart-procs 4] [--order-procs 2]
+"""
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--seconds', type=float, default=10)
+parser.add_argument('--cart-procs', type=int, default=4)
+parser.add_argument('--order-procs', type=int, default=2)
+parser.add_argument('--layout', choices=['one', 'two'], help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+if args.layout is None:
+    # DB_CARTS_PATH is read when settings load, so each layout runs in its own process.
+    for layout, label in (('one', 'one file'), ('two', 'two files')):
+        env = dict(os.environ)
+        env.pop('DB_CARTS_PATH', None)
+        if layout == 'two':
+            # Only switches the carts database on; setup_django() puts it in its temp dir.
+            env['DB_CARTS_PATH'] = 'carts.sqlite3'
+        output = subprocess.run(
+            [sys.executable, __file__, '--layout', layout, *sys.argv[1:]],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        print(f'{label:10} {output.strip()}')
+    sys.exit()
+
+from common import setup_django  # noqa: E402
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.contrib.sessions.backends.db import SessionStore  # noqa: E402
+from django.db import connections, transaction  # noqa: E402
+
+from furniture_app.cart import add_item  # noqa: E402
+from furniture_app.models import Cart, Order, OrderItem, Product  # noqa: E402
+
+products = Product.objects.bulk_create([Product(name=f'Product {i}', price=10) for i in range(50)])
+users = User.objects.bulk_create([User(username=f'buyer{i}') for i in range(args.order_procs)])
+carts = Cart.objects.bulk_create([Cart() for _ in range(args.cart_procs)])
+connections.close_all()
+
+
+def shopper(index, results):
+    cart, count = carts[index], 0
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        product = products[count % len(products)]
+        add_item(cart, product, 1, product.price)
+        session = SessionStore()
+        session['cart_id'] = cart.pk
+        session.save()
+        count += 1
+    results.put(('cart writes', count))
+
+
+def buyer(index, results):
+    user, product, count = users[index], products[0], 0
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        with transaction.atomic():
+            order = Order.objects.create(user=user, total_price=10, payment_method='COD')
+            OrderItem.objects.create(order=order, product=product, quantity=1, price=10, product_name=product.name)
+        count += 1
+    results.put(('orders', count))
+
+
+context = multiprocessing.get_context('fork')
+results = context.Queue()
+processes = [context.Process(target=shopper, args=(i, results)) for i in range(args.cart_procs)]
+processes += [context.Process(target=buyer, args=(i, results)) for i in range(args.order_procs)]
+for process in processes:
+    process.start()
+totals = {'orders': 0, 'cart writes': 0}
+for _ in processes:
+    kind, count = results.get()
+    totals[kind] += count
+for process in processes:
+    process.join()
+print('   '.join(f'{kind} {count / args.seconds:.0f}/s' for kind, count in totals.items()))
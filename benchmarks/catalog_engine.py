@@ -0,0 +1,41 @@
+"""
+Storefront filter queries answered by the in-memory catalog snapshot
+(CATALOG_ENGINE) against the same queries through the ORM, at growing
+catalog sizes. Each size is seeded into a fresh table.
+
+    python benchmarks/catalog_engine.py [--sizes 10000 100000 1000000] [--repeat 20]
+"""
+
+import argparse
+
+from common import seed_products, setup_django, summary, timed
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+parser.add_argument('--repeat', type=int, default=20)
+args = parser.parse_args()
+setup_django()
+
+from furniture_app.caching import bump_catalog_version  # noqa: E402
+from furniture_app.catalog import filter_products, parse_filters  # noqa: E402
+from furniture_app.catalog_engine import get_snapshot  # noqa: E402
+from furniture_app.models import Product  # noqa: E402
+
+QUERIES = {
+    'newest': {},
+    'category by price': {'category': 'OFFICE', 'sort_by': 'price'},
+    'three filters': {'category': 'BEDROOM', 'material': 'WOOD', 'requires_assembly': 'false'},
+    'price range': {'min_price': '200', 'max_price': '300', 'sort_by': '-price'},
+}
+
+for size in args.sizes:
+    Product.objects.all().delete()
+    print(f'{size} products (seeded in {seed_products(size):.0f}s)')
+    bump_catalog_version()
+    build = timed(get_snapshot, 1)[0]
+    print(f'  snapshot build {build:.0f} ms')
+    snapshot = get_snapshot()
+    for label, params in QUERIES.items():
+        orm = timed(lambda: list(filter_products(params).values_list('pk', flat=True)), max(1, args.repeat // 4))
+        engine = timed(lambda: snapshot.query(**parse_filters(params)), args.repeat)
+        print(f'  {label:18} orm {summary(orm)}   engine {summary(engine)}')
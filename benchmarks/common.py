@@ -0,0 +1,100 @@
+"""
+Shared setup for the benchmark scripts in this directory.
+
+Run a benchmark from the project root, e.g. ``python benchmarks/page_cache.py``.
+setup_django() creates throwaway databases the way the test runner does,
+but as files in a temporary directory (so threads and subprocesses can
+share them), and never touches db.sqlite3. Caches are per-process unless
+CACHE_BACKEND says otherwise.
+"""
+
+import atexit
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Configure Django on fresh databases and return the temporary directory."""
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myfurniture_app.settings')
+    os.environ.setdefault('CACHE_BACKEND', 'locmem')
+    tmp = Path(tempfile.mkdtemp(prefix='furniture-bench-'))
+    os.environ.setdefault('CACHE_DIR', str(tmp / 'cache'))
+
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.db import connections
+
+    # Like the test runner: no query log, no debug pages.
+    settings.DEBUG = False
+    for alias in connections:
+        connection = connections[alias]
+        mirror = connection.settings_dict['TEST'].get('MIRROR')
+        if mirror:
+            connection.creation.set_as_test_mirror(connections[mirror].settings_dict)
+            continue
+        connection.settings_dict['TEST']['NAME'] = str(tmp / f'{alias}.sqlite3')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    def cleanup():
+        connections.close_all()
+        shutil.rmtree(tmp, ignore_errors=True)
+    atexit.register(cleanup)
+    return tmp
+
+
+def timed(func, repeat):
+    """Per-call wall times of ``repeat`` calls to ``func``, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summary(times):
+    return f'median {statistics.median(times):7.2f} ms   {1000 * len(times) / sum(times):8.0f}/s'
+
+
+WORDS = 'oak teak walnut steel glass leather sofa chair table lamp desk bed shelf stool bench cabinet modern rustic compact folding'.split()
+
+
+def seed_products(count, seed=1):
+    """
+    Insert ``count`` varied products with plain INSERTs (no model signals,
+    so no ProductStats rows) and return how many seconds it took.
+    """
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from furniture_app.models import Product
+
+    categories = [value for value, _ in Product.CATEGORY_CHOICES]
+    materials = [value for value, _ in Product.MATERIAL_CHOICES]
+    rnd = random.Random(seed)
+    now = timezone.now()
+    start = time.perf_counter()
+    with transaction.atomic(), connection.cursor() as cursor:
+        for first in range(0, count, 50000):
+            cursor.executemany(
+                'INSERT INTO furniture_app_product (name, description, price, image, category, material,'
+                ' stock_quantity, is_available, requires_assembly, on_sale, discount_percentage, created_at, updated_at)'
+                " VALUES (%s, %s, %s, '', %s, %s, 5, %s, %s, %s, 0, %s, %s)",
+                [(
+                    ' '.join(rnd.sample(WORDS, 3)) + f' {i}', ' '.join(rnd.sample(WORDS, 8)), rnd.randint(100, 99900) / 100,
+                    rnd.choice(categories), rnd.choice(materials), rnd.random() < 0.9, rnd.random() < 0.5, i % 4 == 0,
+                    now - timedelta(minutes=i), now - timedelta(minutes=i),
+                ) for i in range(first, min(count, first + 50000))],
+            )
+    return time.perf_counter() - start
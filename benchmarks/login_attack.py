@@ -0,0 +1,48 @@
+"""
+Password-guessing against one account, with and without the login
+throttle (AUTH_THROTTLE_RATES): attempts handled per second and how many
+reached the password hasher, then how long a real user's login from
+another address takes once the attacker is being limited.
+
+    python benchmarks/login_attack.py [--attempts 200]
+"""
+
+import argparse
+
+from common import setup_django, summary, timed
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--attempts', type=int, default=200)
+args = parser.parse_args()
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+from furniture_app.throttle import DEFAULT_RATES  # noqa: E402
+
+print(f'password hasher: {settings.PASSWORD_HASHERS[0].rsplit(".", 1)[-1]}')
+User.objects.create_user('victim', password='correct horse')
+User.objects.create_user('shopper', password='battery staple')
+attacker = Client(REMOTE_ADDR='203.0.113.5')
+guesses = iter(range(10 ** 9))
+
+
+def guess():
+    return attacker.post('/login/', {'username': 'victim', 'password': f'guess{next(guesses)}'}).status_code
+
+
+for throttled in (False, True):
+    rates = settings.AUTH_THROTTLE_RATES if throttled else dict.fromkeys(DEFAULT_RATES)
+    with override_settings(AUTH_THROTTLE_RATES=rates):
+        caches['default'].clear()
+        codes = []
+        times = timed(lambda: codes.append(guess()), args.attempts)
+        print(f'{"throttled" if throttled else "unthrottled":11}  {summary(times)}   {codes.count(200)} of {len(codes)} attempts checked the password')
+
+        def login():
+            client = Client(REMOTE_ADDR='198.51.100.7')
+            assert client.post('/login/', {'username': 'shopper', 'password': 'battery staple'}).status_code == 302
+        print(f'  login from another address    {summary(timed(login, 5))}')
@@ -0,0 +1,68 @@
+"""
+Queries and time for checkout and the order pages with the product details
+snapshotted onto order items: checkout should cost the same number of
+queries whatever the number of lines, and the order pages should never read
+Product.
+
+    python benchmarks/order_snapshots.py [--lines 5 20 50] [--repeat 20]
+"""
+
+import argparse
+import time
+
+from common import setup_django, summary, timed
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--lines', type=int, nargs='+', default=[5, 20, 50])
+parser.add_argument('--repeat', type=int, default=20)
+args = parser.parse_args()
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from furniture_app.cart import add_item  # noqa: E402
+from furniture_app.models import Address, Cart, Order, Product  # noqa: E402
+
+user = User.objects.create_user('buyer')
+address = Address.objects.create(user=user, street_address='1 Main St', city='Pune', state='MH', zip_code='411001', country='India')
+products = Product.objects.bulk_create([
+    Product(name=f'Chair {i}', price=10 + i % 50, image=f'product_images/chair{i}.jpg') for i in range(max(args.lines))
+])
+cart = Cart.objects.create(user=user)
+client = Client()
+client.force_login(user)
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    return len(queries), sum('furniture_app_product' in query['sql'] for query in queries)
+
+
+def checkout():
+    assert client.post('/checkout/', {'shipping_address': address.pk}).status_code == 302
+
+
+for lines in args.lines:
+    def fill():
+        for product in products[:lines]:
+            add_item(cart, product, 1, product.price)
+
+    fill()
+    checkout()
+    fill()
+    queries, product_queries = count_queries(checkout)
+    times = []
+    for _ in range(args.repeat):
+        fill()
+        start = time.perf_counter()
+        checkout()
+        times.append((time.perf_counter() - start) * 1000)
+    order = Order.objects.latest('pk')
+    detail_queries, detail_product_queries = count_queries(lambda: client.get(f'/order/{order.pk}/'))
+    print(f'{lines:3} lines  checkout {queries} queries ({product_queries} on Product) {summary(times)}')
+    print(f'           order detail {detail_queries} queries ({detail_product_queries} on Product) '
+          f'{summary(timed(lambda: client.get(f"/order/{order.pk}/"), args.repeat))}')
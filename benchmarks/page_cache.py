@@ -0,0 +1,35 @@
+"""
+Anonymous storefront requests per second with and without the full-page
+cache (ANONYMOUS_PAGE_CACHE), through the whole middleware stack.
+
+    python benchmarks/page_cache.py [--products 500] [--requests 300]
+"""
+
+import argparse
+
+from common import setup_django, summary, timed
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--products', type=int, default=500)
+parser.add_argument('--requests', type=int, default=300)
+args = parser.parse_args()
+setup_django()
+
+from django.test import Client, override_settings  # noqa: E402
+
+from furniture_app.models import Product  # noqa: E402
+
+Product.objects.bulk_create([
+    Product(name=f'Product {i}', price=10 + i % 90, category=['OFFICE', 'BEDROOM', 'KITCHEN'][i % 3])
+    for i in range(args.products)
+])
+product = Product.objects.first()
+urls = {'index': '/', 'filtered index': '/?category=OFFICE&sort_by=price', 'product detail': f'/product/{product.pk}/'}
+
+for enabled in (False, True):
+    print('page cache on' if enabled else 'page cache off')
+    with override_settings(ANONYMOUS_PAGE_CACHE=enabled):
+        client = Client()
+        for label, url in urls.items():
+            client.get(url)
+            print(f'  {label:16} {summary(timed(lambda: client.get(url), args.requests))}')
@@ -0,0 +1,40 @@
+"""
+Repricing every cart line for a product that sits in many carts
+(furniture_app.repricing) at several chunk sizes: total time, and how long
+each chunk's transaction holds the cart database's write lock on average.
+
+    python benchmarks/repricing.py [--carts 100000] [--chunks 1000 5000 20000]
+"""
+
+import argparse
+import math
+import time
+from decimal import Decimal
+
+from common import setup_django
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--carts', type=int, default=100000)
+parser.add_argument('--chunks', type=int, nargs='+', default=[1000, 5000, 20000])
+args = parser.parse_args()
+setup_django()
+
+from furniture_app.cart import reconcile_cart_totals  # noqa: E402
+from furniture_app.models import Cart, CartItem, Product  # noqa: E402
+from furniture_app.repricing import reprice_product  # noqa: E402
+
+product = Product.objects.create(name='Oak Chair', price=Decimal('19.99'))
+Cart.objects.bulk_create([Cart() for _ in range(args.carts)], batch_size=5000)
+CartItem.objects.bulk_create(
+    (CartItem(cart_id=pk, product=product, quantity=2, price=product.price) for pk in Cart.objects.values_list('pk', flat=True)),
+    batch_size=5000,
+)
+reconcile_cart_totals()
+
+for i, chunk_size in enumerate(args.chunks):
+    Product.objects.filter(pk=product.pk).update(price=Decimal('15.99') + i)
+    start = time.perf_counter()
+    changed = reprice_product(product.pk, chunk_size=chunk_size)
+    seconds = time.perf_counter() - start
+    per_chunk = seconds * 1000 / math.ceil(changed / chunk_size)
+    print(f'chunk {chunk_size:6}: {changed} lines in {seconds:4.1f}s ({changed / seconds:6.0f}/s), {per_chunk:5.0f} ms per transaction')
@@ -0,0 +1,53 @@
+"""
+Time to first byte and total time of the admin orders dashboard, gzipped,
+streamed (STREAM_LIST_PAGES) and rendered whole.
+
+    python benchmarks/ttfb.py [--orders 5000] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from common import setup_django
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--orders', type=int, default=5000)
+parser.add_argument('--repeat', type=int, default=5)
+args = parser.parse_args()
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+from furniture_app.models import Order  # noqa: E402
+from furniture_app.order_summary import suspend_summary_updates  # noqa: E402
+
+users = User.objects.bulk_create([User(username=f'user{i}') for i in range(20)])
+with suspend_summary_updates():
+    Order.objects.bulk_create([
+        Order(user=users[i % len(users)], total_price=10, payment_method='COD') for i in range(args.orders)
+    ])
+client = Client()
+client.force_login(User.objects.create_user('staff', is_staff=True))
+
+
+def fetch():
+    start = time.perf_counter()
+    response = client.get('/admin-dashboard/orders/', HTTP_ACCEPT_ENCODING='gzip')
+    if response.streaming:
+        chunks = iter(response.streaming_content)
+        first = next(chunks)
+        ttfb = time.perf_counter() - start
+        size = len(first) + sum(map(len, chunks))
+    else:
+        ttfb = time.perf_counter() - start
+        size = len(response.content)
+    return ttfb * 1000, (time.perf_counter() - start) * 1000, size
+
+
+for streamed in (False, True):
+    with override_settings(STREAM_LIST_PAGES=streamed):
+        fetch()
+        runs = sorted(fetch() for _ in range(args.repeat))
+        ttfb, total, size = runs[len(runs) // 2]
+        print(f'{"streamed" if streamed else "whole page":10}  ttfb {ttfb:7.1f} ms   total {total:7.1f} ms   {size} bytes gzipped')
@@ -1,22 +1,86 @@
-from django.contrib import admin
-from .models import Product, SaleBanner
+from django.contrib import admin, messages
+from .models import Product, SaleBanner, Order
+from .admin_performance import (
+    EstimatedCountPaginator, KeysetChangeList, admin_performance_mode, cached_facet_filter,
+)
+from .order_states import bulk_transition
+from .product_search import search_available, search_products
 
 class ProductAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'price', 'on_sale', 'discount_percentage', 'is_available', 'requires_assembly', 'created_at')
     list_filter = ('category', 'on_sale', 'is_available', 'requires_assembly', 'material')
     search_fields = ('name', 'description')
-    date_hierarchy = 'created_at'
     fields = ('name', 'description', 'price', 'category', 'material', 'image', 'is_available', 'requires_assembly', 'on_sale', 'discount_percentage')
 
+    # ADMIN_PERFORMANCE_MODE swaps the parts of the changelist that scan the
+    # whole table (exact counts, OFFSET pages, distinct dates, facet and
+    # icontains queries) for the ones in furniture_app.admin_performance.
+    @property
+    def date_hierarchy(self):
+        return None if admin_performance_mode() else 'created_at'
+
+    @property
+    def show_full_result_count(self):
+        return not admin_performance_mode()
+
+    @property
+    def show_facets(self):
+        return admin.ShowFacets.NEVER if admin_performance_mode() else admin.ShowFacets.ALLOW
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList if admin_performance_mode() else super().get_changelist(request, **kwargs)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        if admin_performance_mode():
+            return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_list_filter(self, request):
+        if admin_performance_mode():
+            return [cached_facet_filter(field) for field in self.list_filter]
+        return self.list_filter
+
+    def get_sortable_by(self, request):
+        # Keyset pages always run newest first.
+        return () if admin_performance_mode() else super().get_sortable_by(request)
+
+    def get_search_results(self, request, queryset, search_term):
+        if search_term and admin_performance_mode() and search_available(queryset.db):
+            return search_products(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
     class Media:
         css = {
             'all': ('admin.css',)
         }
 
 class SaleBannerAdmin(admin.ModelAdmin):
-    list_display = ('featured_product', 'custom_message', 'is_active', 'updated_at')
+    list_display = ('featured_product', 'custom_message', 'sale_start_date', 'sale_end_date', 'is_active', 'updated_at')
     list_filter = ('is_active',)
     search_fields = ('featured_product__name', 'custom_message')
 
+def make_status_action(status, label):
+    def action(modeladmin, request, queryset):
+        results = bulk_transition(list(queryset.values_list('pk', flat=True)), status)
+        updated = sum(1 for result in results if result['success'])
+        skipped = len(results) - updated
+        modeladmin.message_user(request, f"{updated} orders marked {label.lower()}.", messages.SUCCESS)
+        if skipped:
+            modeladmin.message_user(
+                request, f"{skipped} orders could not move to {label.lower()} from their current status.", messages.WARNING
+            )
+    action.__name__ = f'mark_{status.lower()}'
+    action.short_description = f"Mark selected orders as {label.lower()}"
+    return action
+
+class OrderAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'order_date', 'total_price', 'payment_method', 'status')
+    list_filter = ('status',)
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
+    readonly_fields = ('status',)
+    actions = [make_status_action(status, label) for status, label in Order.STATUS_CHOICES if status != 'PENDING']
+
 admin.site.register(Product, ProductAdmin)
 admin.site.register(SaleBanner, SaleBannerAdmin)
+admin.site.register(Order, OrderAdmin)
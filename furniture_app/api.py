@@ -0,0 +1,195 @@
+"""
+Read-only JSON product API (v1).
+
+Rows are read with .values() and serialized straight from the dicts, never
+as Product instances. Lists use the storefront filters and sort options and
+are paginated with an opaque keyset cursor, so deep pages cost the same as
+the first. Every response carries an ETag derived from the catalog version
+and the query, which lets clients revalidate without touching the database.
+"""
+
+import base64
+import hashlib
+import json
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import HttpResponseNotModified, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from .caching import get_catalog_version, get_or_compute
+from .catalog import TRENDING, filter_products, get_sort_by
+from .models import Product
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+API_CACHE_TIMEOUT = 300
+
+# Public field name -> columns it is built from.
+FIELDS = {
+    'id': ('id',),
+    'name': ('name',),
+    'description': ('description',),
+    'price': ('price',),
+    'sale_price': ('price', 'on_sale', 'discount_percentage'),
+    'on_sale': ('on_sale',),
+    'discount_percentage': ('discount_percentage',),
+    'category': ('category',),
+    'material': ('material',),
+    'requires_assembly': ('requires_assembly',),
+    'is_available': ('is_available',),
+    'image': ('image',),
+    'url': ('id',),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+}
+DEFAULT_FIELDS = ('id', 'name', 'price', 'sale_price', 'category', 'material', 'image', 'url')
+
+
+class ApiError(Exception):
+    pass
+
+
+def _sale_price(row):
+    if row['on_sale'] and row['discount_percentage'] > 0:
+        price = row['price'] - row['price'] * (row['discount_percentage'] / 100)
+        return price.quantize(Decimal('0.01'))
+    return row['price']
+
+
+COMPUTED = {
+    'sale_price': _sale_price,
+    'image': lambda row: default_storage.url(row['image']) if row['image'] else None,
+    'url': lambda row: reverse('furniture_app:product_detail', args=[row['id']]),
+}
+
+
+def parse_fields(params):
+    if not params.get('fields'):
+        return DEFAULT_FIELDS
+    fields = tuple(dict.fromkeys(name.strip() for name in params['fields'].split(',') if name.strip()))
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(FIELDS)}.")
+    return fields
+
+
+def parse_limit(params):
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError("limit must be an integer.")
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def columns_for(fields, *extra):
+    return list(dict.fromkeys([*extra, *(column for name in fields for column in FIELDS[name])]))
+
+
+def serialize(row, fields):
+    return {name: COMPUTED[name](row) if name in COMPUTED else row[name] for name in fields}
+
+
+def encode_cursor(sort_by, value, pk):
+    return base64.urlsafe_b64encode(json.dumps([sort_by, value, pk], default=str).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort_by):
+    """
+    The ``(value, pk)`` a cursor continues from, with ``value`` converted to
+    the sort field's type. A cursor only works with the sort it came from.
+    """
+    try:
+        cursor_sort, value, pk = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ApiError("Invalid cursor.")
+    if cursor_sort != sort_by:
+        raise ApiError("The cursor belongs to a different sort_by; start again without it.")
+    try:
+        value = Product._meta.get_field(sort_by.lstrip('-')).to_python(value)
+        pk = int(pk)
+    except (ValueError, TypeError, ValidationError):
+        raise ApiError("Invalid cursor.")
+    if value is None:
+        raise ApiError("Invalid cursor.")
+    return value, pk
+
+
+def _etag(*parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def _cached_json(request, key_parts, build):
+    """Answer from If-None-Match or the catalog cache, building the payload on a miss."""
+    etag = _etag(get_catalog_version(), *key_parts)
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        payload = get_or_compute(f'api:{etag}', build, API_CACHE_TIMEOUT, namespace='catalog')
+        if payload is None:
+            return JsonResponse({'error': 'Not found.'}, status=404)
+        response = JsonResponse(payload)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
+
+
+def _page(request, fields, limit, cursor):
+    params = request.GET
+    sort_by = get_sort_by(params)
+    descending = sort_by.startswith('-')
+    sort_field = sort_by.lstrip('-')
+    pk_order = '-pk' if descending else 'pk'
+
+    rows = filter_products(params).order_by(sort_by, pk_order)
+    if cursor:
+        value, pk = cursor
+        after = 'lt' if descending else 'gt'
+        rows = rows.filter(Q(**{f'{sort_field}__{after}': value}) | Q(**{sort_field: value, f'pk__{after}': pk}))
+
+    rows = list(rows.values(*columns_for(fields, 'id', sort_field))[:limit + 1])
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    next_url = None
+    if has_next:
+        next_params = params.copy()
+        next_params['cursor'] = encode_cursor(sort_by, rows[-1][sort_field], rows[-1]['id'])
+        next_url = f'{request.path}?{next_params.urlencode()}'
+    return {
+        'results': [serialize(row, fields) for row in rows],
+        'next': next_url,
+    }
+
+
+@require_GET
+def product_list(request):
+    try:
+        fields = parse_fields(request.GET)
+        limit = parse_limit(request.GET)
+        sort_by = get_sort_by(request.GET)
+        if sort_by == TRENDING:
+            raise ApiError("sort_by=trending is not available in the API.")
+        cursor = decode_cursor(request.GET['cursor'], sort_by) if request.GET.get('cursor') else None
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    query = sorted(request.GET.lists())
+    return _cached_json(request, ('list', fields, limit, query), lambda: _page(request, fields, limit, cursor))
+
+
+@require_GET
+def product_detail(request, pk):
+    try:
+        fields = parse_fields(request.GET)
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    def build():
+        row = Product.objects.filter(pk=pk).values(*columns_for(fields, 'id')).first()
+        return serialize(row, fields) if row else None
+
+    return _cached_json(request, ('detail', pk, fields), build)
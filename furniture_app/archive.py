@@ -0,0 +1,104 @@
+"""
+Archival of finished orders.
+
+Delivered and cancelled orders older than ORDER_ARCHIVE_AFTER_DAYS are moved
+from Order/OrderItem into ArchivedOrder/ArchivedOrderItem, keeping their ids,
+so the tables the storefront and dashboard read every request stay small.
+Each batch is copied and deleted in one transaction, which makes the job safe
+to stop and re-run: whatever has not been moved yet is simply picked up again.
+
+Order summaries already count archived orders, so moving them is done with
+summary updates suspended.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+from .order_summary import apply_summary_delta, counted_spend, suspend_summary_updates
+
+ARCHIVE_STATUSES = ('DELIVERED', 'CANCELLED')
+ORDER_FIELDS = ('id', 'user_id', 'order_date', 'total_price', 'shipping_address_id', 'payment_method', 'status')
+ITEM_FIELDS = (
+    'id', 'order_id', 'product_id', 'quantity', 'price', 'product_name', 'product_image', 'product_category',
+)
+
+
+def default_cutoff():
+    return timezone.now() - timedelta(days=getattr(settings, 'ORDER_ARCHIVE_AFTER_DAYS', 365))
+
+
+def archivable_orders(cutoff):
+    return Order.objects.filter(status__in=ARCHIVE_STATUSES, order_date__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size=500):
+    """Move up to ``batch_size`` archivable orders. Returns how many moved."""
+    with transaction.atomic():
+        orders = list(
+            archivable_orders(cutoff).select_for_update().order_by('pk').values_list(*ORDER_FIELDS)[:batch_size]
+        )
+        if not orders:
+            return 0
+        order_ids = [row[0] for row in orders]
+        items = OrderItem.objects.filter(order_id__in=order_ids).values_list(*ITEM_FIELDS)
+
+        # ignore_conflicts lets a batch that was copied but, for whatever
+        # reason, not deleted go through again.
+        ArchivedOrder.objects.bulk_create(
+            [ArchivedOrder(**dict(zip(ORDER_FIELDS, row))) for row in orders],
+            ignore_conflicts=True,
+        )
+        ArchivedOrderItem.objects.bulk_create(
+            [ArchivedOrderItem(**dict(zip(ITEM_FIELDS, row))) for row in items],
+            ignore_conflicts=True,
+        )
+        with suspend_summary_updates():
+            Order.objects.filter(pk__in=order_ids).delete()
+    return len(order_ids)
+
+
+def find_order(pk, queryset=None, archived_queryset=None):
+    """The live order ``pk``, falling back to the archive. None if neither has it."""
+    queryset = Order.objects.all() if queryset is None else queryset
+    order = queryset.filter(pk=pk).first()
+    if order is None:
+        archived_queryset = ArchivedOrder.objects.all() if archived_queryset is None else archived_queryset
+        order = archived_queryset.filter(pk=pk).first()
+    return order
+
+
+def delete_archived_order(order):
+    quantity = sum(order.items.values_list('quantity', flat=True))
+    order.delete()
+    apply_summary_delta(
+        order.user_id,
+        orders=-1,
+        items=-quantity,
+        spend=-counted_spend(order.status, order.total_price),
+        statuses={order.status: -1},
+        refresh_last_order_date=True,
+    )
+
+
+def order_history(user, offset, limit):
+    """
+    ``limit`` orders of ``user``'s history starting at ``offset``: live
+    orders newest first, then archived ones. The archive is only queried
+    once the live orders run out.
+    """
+    orders = list(
+        user.orders.select_related('shipping_address').order_by('-order_date')[offset:offset + limit]
+    )
+    if len(orders) < limit:
+        live_count = offset + len(orders) if orders else user.orders.count()
+        archive_offset = max(offset - live_count, 0)
+        orders += list(
+            user.archived_orders.select_related('shipping_address').order_by('-order_date')[
+                archive_offset:archive_offset + limit - len(orders)
+            ]
+        )
+    return orders
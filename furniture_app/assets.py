@@ -0,0 +1,113 @@
+"""
+Per-page CSS and JavaScript bundles.
+
+Each page links one stylesheet bundle instead of style.css plus its page
+stylesheet, and one script bundle instead of inline scripts: site.js (the
+nav and shared helpers) plus its page's script. Values a script needs from
+the template are passed in data- attributes. `manage.py build_assets`
+concatenates and minifies the sources into static/bundles/, then collects
+everything through CompressedManifestStaticFilesStorage, which adds content
+hashes to the file names and writes .gz/.br copies next to them. With
+ASSET_BUNDLES off (the default in development) the {% bundle_css %} and
+{% bundle_js %} tags link the source files.
+"""
+
+import re
+from pathlib import Path
+
+from django.conf import settings
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+BUNDLE_DIR = STATIC_DIR / 'bundles'
+
+BUNDLES = {
+    'base': ['style.css'],
+    'index': ['style.css', 'carousel.css'],
+    'product': ['style.css', 'product.css'],
+    'cart': ['style.css', 'cart.css'],
+    'payment': ['style.css', 'payment.css'],
+    'profile': ['style.css', 'userprofile.css'],
+    'order_detail': ['style.css', 'order_detail.css'],
+    'dashboard': ['style.css', 'admin_dashboard.css'],
+}
+
+JS_BUNDLES = {
+    'base': ['site.js'],
+    'index': ['site.js', 'shop.js', 'index.js'],
+    'product': ['site.js', 'shop.js'],
+    'cart': ['site.js', 'cart.js'],
+    'profile': ['site.js', 'userprofile.js'],
+    'dashboard': ['site.js', 'admin_dashboard.js'],
+}
+
+_CSS_STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+_CSS_COMMENTS = re.compile(rf'({_CSS_STRING})|/\*.*?\*/', re.S)
+_CSS_STRINGS = re.compile(_CSS_STRING)
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+
+def _compact(css):
+    css = _CSS_PUNCTUATION.sub(r'\1', re.sub(r'\s+', ' ', css))
+    return css.replace(';}', '}')
+
+
+def minify_css(css):
+    # Drop comments, then squeeze whitespace everywhere except inside strings.
+    css = _CSS_COMMENTS.sub(lambda m: m.group(1) or '', css)
+    out, pos = [], 0
+    for match in _CSS_STRINGS.finditer(css):
+        out.append(_compact(css[pos:match.start()]))
+        out.append(match.group())
+        pos = match.end()
+    out.append(_compact(css[pos:]))
+    return ''.join(out).strip()
+
+
+_JS_STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`'
+_JS_COMMENTS = re.compile(rf'({_JS_STRING})|/\*.*?\*/|//[^\n]*', re.S)
+_JS_STRINGS = re.compile(_JS_STRING)
+_JS_PUNCTUATION = re.compile(r'[ \t]*([{}()\[\];,:=<>&|?!])[ \t]*')
+
+
+def _compact_js(js):
+    js = re.sub(r'\s*\n\s*', '\n', re.sub(r'[ \t]+', ' ', js))
+    return _JS_PUNCTUATION.sub(r'\1', js)
+
+
+def minify_js(js):
+    """
+    Drop comments, indentation and blank lines, and the spaces around
+    punctuation that never needs them. Line breaks stay, so automatic
+    semicolon insertion works as in the source. The sources must not use
+    regex literals, which would be read as comments or division.
+    """
+    js = _JS_COMMENTS.sub(lambda m: m.group(1) or '', js)
+    out, pos = [], 0
+    for match in _JS_STRINGS.finditer(js):
+        out.append(_compact_js(js[pos:match.start()]))
+        out.append(match.group())
+        pos = match.end()
+    out.append(_compact_js(js[pos:]))
+    return ''.join(out).strip()
+
+
+def _build(bundles, extension, minify, sizes, separator='\n'):
+    for name, sources in bundles.items():
+        text = separator.join((STATIC_DIR / source).read_text(encoding='utf-8') for source in sources)
+        minified = minify(text)
+        (BUNDLE_DIR / f'{name}.{extension}').write_text(minified, encoding='utf-8')
+        sizes[f'{name}.{extension}'] = len(minified.encode('utf-8'))
+
+
+def build_bundles():
+    """Write every bundle to static/bundles/. Returns {file name: size in bytes}."""
+    BUNDLE_DIR.mkdir(exist_ok=True)
+    sizes = {}
+    _build(BUNDLES, 'css', minify_css, sizes)
+    # A file that ends without a semicolon must not run into the next one.
+    _build(JS_BUNDLES, 'js', minify_js, sizes, separator=';\n')
+    return sizes
+
+
+def bundles_enabled():
+    return getattr(settings, 'ASSET_BUNDLES', False)
@@ -0,0 +1,108 @@
+"""
+Async versions of the cart and order JSON endpoints.
+
+Same behaviour and responses as their counterparts in views.py, written
+against the async ORM and session API so that under ASGI a request waiting
+on the database does not hold a worker. The logic is not repeated here:
+cart writes go through the async wrappers in cart.py, and request parsing
+and responses through the helpers the sync views use. urls.py routes to
+these when ASYNC_VIEWS is on.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import aget_object_or_404, redirect
+
+from .archive import find_order
+from .cart import aadd_item, acart_for_session, aremove_item, arefresh_totals, aset_item_quantity
+from .models import CartItem, Order, Product
+from .product_stats import arecord_add_to_cart
+from .views import (
+    added_to_cart, cart_price, change_order_status, quantity_conflict, quantity_update, quantity_updated,
+    remove_order, removed_from_cart, requested_quantity,
+)
+
+afind_order = sync_to_async(find_order)
+achange_order_status = sync_to_async(change_order_status)
+aremove_order = sync_to_async(remove_order)
+
+
+async def aget_or_create_cart(request):
+    """Async counterpart of views.get_or_create_cart."""
+    user = await request.auser()
+    cart, notice = await acart_for_session(user, await request.session.aget('cart_id'))
+    if notice:
+        messages.info(request, notice)
+    await request.session.aset('cart_id', cart.id)
+    await request.session.aset('cart_item_count', cart.item_count)
+    return cart, cart.item_count
+
+
+async def add_to_cart(request, product_pk):
+    user = await request.auser()
+    if not user.is_authenticated:
+        messages.warning(request, "Please log in or create an account to add items to your cart.")
+        return redirect('furniture_app:login')
+
+    if request.method == 'POST':
+        product = await aget_object_or_404(Product, pk=product_pk)
+        cart, _ = await aget_or_create_cart(request)
+
+        await aadd_item(cart, product, requested_quantity(request), cart_price(product))
+        await arecord_add_to_cart(product.pk)
+
+        cart_item_count, _ = await arefresh_totals(cart)
+        await request.session.aset('cart_item_count', cart_item_count)
+        return added_to_cart(request, product, cart_item_count)
+    return JsonResponse({'success': False, 'message': 'Invalid request.'})
+
+
+async def remove_from_cart(request, item_pk):
+    if request.method == 'POST':
+        cart, _ = await aget_or_create_cart(request)
+        if not await aremove_item(cart, item_pk):
+            return JsonResponse({'success': False, 'message': 'Item not found in your cart.'}, status=404)
+
+        cart_item_count, cart_total_price = await arefresh_totals(cart)
+        await request.session.aset('cart_item_count', cart_item_count)
+        return removed_from_cart(request, cart_item_count, cart_total_price)
+    return JsonResponse({'success': False, 'message': 'Invalid request.'})
+
+
+@login_required
+async def update_cart_item_quantity(request, item_pk):
+    if request.method == 'POST':
+        cart_item = await aget_object_or_404(CartItem.objects.prefetch_related('product'), pk=item_pk)
+        cart, _ = await aget_or_create_cart(request)
+
+        update = quantity_update(request, cart_item, cart)
+        if isinstance(update, JsonResponse):
+            return update
+        new_quantity, expected_version = update
+
+        applied, current_quantity, version = await aset_item_quantity(cart_item, new_quantity, expected_version)
+        if not applied:
+            return quantity_conflict(current_quantity, version)
+
+        cart_item_count, cart_total_price = await arefresh_totals(cart)
+        await request.session.aset('cart_item_count', cart_item_count)
+        return quantity_updated(cart_item, new_quantity, current_quantity, version, cart_item_count, cart_total_price)
+    return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
+
+
+@login_required
+async def update_order_status(request, order_pk):
+    order = await aget_object_or_404(Order, pk=order_pk)
+    return await achange_order_status(request, await request.auser(), order)
+
+
+@login_required
+async def delete_order(request, order_pk):
+    if request.method == 'POST':
+        order = await afind_order(order_pk)
+        if order is None:
+            raise Http404("No order matches the given query.")
+        return await aremove_order(await request.auser(), order)
+    return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
@@ -0,0 +1,63 @@
+"""
+Active sale banners for the index carousel.
+
+The active set (with featured products loaded) is computed once and cached
+until the next schedule boundary: the earliest end of a running sale or start
+of a scheduled one. The key carries the catalog version, so saving a banner
+or product in the admin starts a fresh set immediately.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import count_stat, get_catalog_version
+from .models import SaleBanner
+
+# Recheck at least this often even if nothing is scheduled.
+MAX_BANNER_CACHE_SECONDS = 24 * 60 * 60
+
+
+def compute_banner_schedule(now):
+    """Return ``(active banners, time the set next changes)``."""
+    banners = list(
+        SaleBanner.objects.filter(is_active=True, featured_product__isnull=False)
+        .filter(Q(sale_end_date__isnull=True) | Q(sale_end_date__gte=now))
+        .select_related('featured_product')
+        .order_by('-updated_at')
+    )
+    active = [b for b in banners if b.sale_start_date is None or b.sale_start_date <= now]
+
+    boundaries = [b.sale_start_date for b in banners if b.sale_start_date and b.sale_start_date > now]
+    # A sale is live up to and including its end time.
+    boundaries += [b.sale_end_date + timedelta(microseconds=1) for b in active if b.sale_end_date]
+    valid_until = min(boundaries, default=now + timedelta(seconds=MAX_BANNER_CACHE_SECONDS))
+    return active, valid_until
+
+
+def get_banner_schedule():
+    cache = caches['catalog']
+    key = f'banners:{get_catalog_version()}'
+    now = timezone.now()
+
+    cached = cache.get(key)
+    if cached is not None and now < cached[1]:
+        count_stat(cache, 'hits')
+        return cached
+
+    count_stat(cache, 'misses')
+    schedule = compute_banner_schedule(now)
+    timeout = max(1, min(MAX_BANNER_CACHE_SECONDS, int((schedule[1] - now).total_seconds()) + 1))
+    cache.set(key, schedule, timeout)
+    return schedule
+
+
+def get_active_banners():
+    return get_banner_schedule()[0]
+
+
+def banner_schedule_version():
+    # Changes whenever the active set does; used in the index page cache key.
+    return int(get_banner_schedule()[1].timestamp())
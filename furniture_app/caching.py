@@ -0,0 +1,171 @@
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.http import urlencode
+
+from myfurniture_app.cache_settings import CACHE_NAMESPACES
+
+CATALOG_VERSION_KEY = 'catalog_version'
+STAT_NAMES = ('hits', 'misses', 'recomputes', 'lock_waits')
+
+# How long a recompute may hold its lock, and how long other requests wait
+# for it before computing the value themselves.
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+# Query parameters that change what a cached page looks like. Anything else
+# (tracking params, typos) maps onto the same cache entry.
+PAGE_CACHE_PARAMS = {
+    'index': ('category', 'material', 'min_price', 'max_price', 'requires_assembly', 'is_available', 'sort_by'),
+    'product_detail': (),
+    'catalog_fragment': ('category', 'material', 'min_price', 'max_price', 'requires_assembly', 'sort_by', 'format'),
+}
+PAGE_CACHE_NAMESPACES = {
+    'index': 'catalog',
+    'catalog_fragment': 'catalog',
+    'product_detail': 'product',
+}
+
+_MISSING = object()
+
+
+def count_stat(cache, stat):
+    if not getattr(settings, 'CACHE_STATS', False):
+        return
+    key = f'stats:{stat}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def cache_stats():
+    stats = {}
+    for namespace in ('default',) + CACHE_NAMESPACES:
+        values = caches[namespace].get_many([f'stats:{stat}' for stat in STAT_NAMES])
+        stats[namespace] = {stat: values.get(f'stats:{stat}', 0) for stat in STAT_NAMES}
+    return stats
+
+
+def _acquire_lock(cache, key):
+    return cache.add(f'{key}:lock', 1, LOCK_TIMEOUT)
+
+
+def _release_lock(cache, key):
+    cache.delete(f'{key}:lock')
+
+
+def _wait_for_value(cache, key):
+    count_stat(cache, 'lock_waits')
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return _MISSING
+
+
+def get_or_compute(key, compute, timeout=None, namespace='default'):
+    """
+    Return ``key`` from the cache, computing and storing it on a miss.
+
+    Only one process recomputes a missing key at a time; the others wait
+    briefly for its result instead of all hitting the database at once.
+    """
+    cache = caches[namespace]
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        count_stat(cache, 'hits')
+        return value
+
+    count_stat(cache, 'misses')
+    if not _acquire_lock(cache, key):
+        value = _wait_for_value(cache, key)
+        if value is not _MISSING:
+            return value
+        return compute()
+
+    try:
+        count_stat(cache, 'recomputes')
+        value = compute()
+        cache.set(key, value, timeout)
+    finally:
+        _release_lock(cache, key)
+    return value
+
+
+def get_catalog_version():
+    return caches['catalog'].get_or_set(CATALOG_VERSION_KEY, 1, None)
+
+
+def bump_catalog_version():
+    cache = caches['catalog']
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, 2, None)
+        return 2
+
+
+def page_cache_key(request, view_name):
+    # Every value of every parameter the view reads, in request order:
+    # a repeated or empty parameter can change the page.
+    query = urlencode(sorted(
+        (name, values) for name, values in request.GET.lists() if name in PAGE_CACHE_PARAMS.get(view_name, ())
+    ), doseq=True)
+    version = get_catalog_version()
+    if view_name == 'index':
+        # The carousel changes on sale start/end times as well as on edits.
+        from .banners import banner_schedule_version
+        version = f'{version}.{banner_schedule_version()}'
+    return f'page:{version}:{view_name}:{request.path}?{query}'
+
+
+def anonymous_page_cache(view_name):
+    """
+    Serve rendered HTML from the cache for logged-out visitors.
+
+    The view is told it is rendering a shared page through
+    ``request.cacheable_page`` so it leaves out the cart badge, flash messages
+    and CSRF tokens; the page fetches those from ``cart_summary`` instead.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            request.cacheable_page = False
+            if (not getattr(settings, 'ANONYMOUS_PAGE_CACHE', True)
+                    or request.method != 'GET'
+                    or request.user.is_authenticated):
+                return view_func(request, *args, **kwargs)
+
+            cache = caches[PAGE_CACHE_NAMESPACES.get(view_name, 'default')]
+            key = page_cache_key(request, view_name)
+            cached = cache.get(key)
+            if cached is not None:
+                count_stat(cache, 'hits')
+                return HttpResponse(cached[1], content_type=cached[0])
+
+            count_stat(cache, 'misses')
+            locked = _acquire_lock(cache, key)
+            if not locked:
+                cached = _wait_for_value(cache, key)
+                if cached is not _MISSING:
+                    return HttpResponse(cached[1], content_type=cached[0])
+
+            request.cacheable_page = True
+            try:
+                response = view_func(request, *args, **kwargs)
+                if locked and response.status_code == 200 and not response.cookies:
+                    count_stat(cache, 'recomputes')
+                    cache.set(key, (response['Content-Type'], response.content), getattr(settings, 'ANONYMOUS_PAGE_CACHE_TIMEOUT', 300))
+            finally:
+                if locked:
+                    _release_lock(cache, key)
+            return response
+        return _wrapped
+    return decorator
@@ -0,0 +1,248 @@
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Cart, CartItem
+from .routers import cart_db
+
+# Cart.item_count and Cart.total_price are denormalized; every change to a
+# cart's lines goes through this module so the totals move in the same
+# transaction. reconcile_cart_totals() repairs any drift.
+#
+# Carts may be in their own database (see routers.CartsRouter), so
+# transactions here are opened on cart_db() and nothing joins to products.
+
+
+def _adjust_totals(cart_id, quantity, amount):
+    if quantity or amount:
+        Cart.objects.filter(pk=cart_id).update(
+            item_count=F('item_count') + quantity,
+            total_price=F('total_price') + amount,
+        )
+
+
+def create_user_cart(user):
+    """
+    Create ``user``'s cart. Two first requests (say, quick add-to-cart
+    clicks) can race to do this; the loser gets the winner's cart.
+    """
+    try:
+        with transaction.atomic(using=cart_db()):
+            return Cart.objects.create(user=user)
+    except IntegrityError:
+        return Cart.objects.get(user=user)
+
+
+def merge_carts(anon_cart_id, cart):
+    """
+    Fold the anonymous cart ``anon_cart_id`` into ``cart``.
+
+    Quantities are added up for products present in both carts; lines that
+    only exist in the anonymous cart keep the price they were added at.
+    Returns True if an anonymous cart was found and merged.
+
+    The query count does not depend on the number of lines, except that the
+    upsert is split into batches at the database's parameter limit (about
+    160 lines per INSERT on SQLite).
+    """
+    with transaction.atomic(using=cart_db()):
+        rows = CartItem.objects.filter(
+            Q(cart=cart) | Q(cart_id=anon_cart_id, cart__user__isnull=True)
+        ).values_list('cart_id', 'product_id', 'quantity', 'price')
+
+        existing = {}
+        incoming = []
+        for cart_id, product_id, quantity, price in rows:
+            if cart_id == cart.id:
+                existing[product_id] = (quantity, price)
+            else:
+                incoming.append((product_id, quantity, price))
+
+        if incoming:
+            lines = []
+            added_quantity, added_amount = 0, 0
+            for product_id, quantity, price in incoming:
+                existing_quantity, existing_price = existing.get(product_id, (0, price))
+                lines.append(CartItem(
+                    cart=cart,
+                    product_id=product_id,
+                    quantity=existing_quantity + quantity,
+                    price=existing_price,
+                ))
+                added_quantity += quantity
+                added_amount += quantity * existing_price
+
+            CartItem.objects.bulk_create(
+                lines,
+                update_conflicts=True,
+                unique_fields=['cart', 'product'],
+                update_fields=['quantity'],
+            )
+            _adjust_totals(cart.id, added_quantity, added_amount)
+
+        deleted, _ = Cart.objects.filter(id=anon_cart_id, user__isnull=True).delete()
+    return deleted > 0
+
+
+def cart_for_session(user, cart_id):
+    """
+    The cart for a request by ``user`` whose session holds ``cart_id``, and a
+    notice for the user when an anonymous cart was merged into or became
+    their account's cart (None otherwise).
+    """
+    anonymous_cart = Cart.objects.filter(id=cart_id, user__isnull=True) if cart_id else Cart.objects.none()
+    if not user.is_authenticated:
+        return anonymous_cart.first() or Cart.objects.create(user=None), None
+
+    cart = Cart.objects.filter(user=user).first()
+    if cart is not None:
+        if cart_id and str(cart.id) != str(cart_id) and merge_carts(cart_id, cart):
+            refresh_totals(cart)
+            return cart, "Your previous cart items have been merged with your account cart."
+        return cart, None
+
+    cart = anonymous_cart.first()
+    if cart is None:
+        return create_user_cart(user), None
+    cart.user = user
+    cart.save()
+    return cart, "Your previous cart has been associated with your account."
+
+
+def add_item(cart, product, quantity, price):
+    """
+    Add ``quantity`` of ``product`` to ``cart`` and return the line's new
+    quantity. Concurrent adds to the same line all count.
+    """
+    lines = CartItem.objects.filter(cart=cart, product=product)
+    with transaction.atomic(using=cart_db()):
+        updated = lines.update(quantity=F('quantity') + quantity, version=F('version') + 1)
+        if not updated:
+            try:
+                with transaction.atomic(using=cart_db()):
+                    CartItem.objects.create(cart=cart, product=product, quantity=quantity, price=price)
+                _adjust_totals(cart.id, quantity, quantity * price)
+                return quantity
+            except IntegrityError:
+                # Another request created the line first; add on top of it.
+                lines.update(quantity=F('quantity') + quantity, version=F('version') + 1)
+        new_quantity, line_price = lines.values_list('quantity', 'price').get()
+        _adjust_totals(cart.id, quantity, quantity * line_price)
+    return new_quantity
+
+
+def set_item_quantity(item, quantity, expected_version=None, retries=3):
+    """
+    Set a cart line to ``quantity``, deleting it at 0.
+
+    The write only lands if the line is still at ``expected_version`` (the
+    version the client last saw). Without one, the version on ``item`` is
+    used and the write is retried if someone else got in first.
+
+    Returns ``(applied, quantity, version)`` with the line's authoritative
+    state after the call; a deleted line reports ``(applied, 0, None)``.
+    """
+    if expected_version is not None and expected_version != item.version:
+        return False, item.quantity, item.version
+
+    quantity_before, version = item.quantity, item.version
+    for _ in range(retries):
+        with transaction.atomic(using=cart_db()):
+            line = CartItem.objects.filter(pk=item.pk, version=version)
+            if quantity == 0:
+                applied = line.delete()[0] > 0
+            else:
+                applied = line.update(quantity=quantity, version=F('version') + 1) > 0
+            if applied:
+                change = quantity - quantity_before
+                _adjust_totals(item.cart_id, change, change * item.price)
+
+        current = CartItem.objects.filter(pk=item.pk).values_list('quantity', 'version', 'price').first()
+        if applied or expected_version is not None or current is None:
+            break
+        # The line may also have been repriced in the meantime.
+        quantity_before, version, item.price = current
+
+    if current is None:
+        return applied, 0, None
+    return applied, current[0], current[1]
+
+
+def remove_item(cart, item_pk, retries=3):
+    for _ in range(retries):
+        row = CartItem.objects.filter(pk=item_pk, cart=cart).values_list('quantity', 'price', 'version').first()
+        if row is None:
+            return False
+        quantity, price, version = row
+        with transaction.atomic(using=cart_db()):
+            if CartItem.objects.filter(pk=item_pk, version=version).delete()[0]:
+                _adjust_totals(cart.id, -quantity, -quantity * price)
+                return True
+    return False
+
+
+def clear_cart(cart):
+    with transaction.atomic(using=cart_db()):
+        cart.items.all().delete()
+        Cart.objects.filter(pk=cart.pk).update(item_count=0, total_price=0)
+    cart.item_count, cart.total_price = 0, 0
+
+
+def remove_product_lines(product_id):
+    """Take a deleted product out of every cart."""
+    with transaction.atomic(using=cart_db()):
+        lines = CartItem.objects.filter(product_id=product_id)
+        cart_ids = list(lines.values_list('cart_id', flat=True))
+        if cart_ids:
+            lines.delete()
+            reconcile_cart_totals(Cart.objects.filter(pk__in=cart_ids))
+
+
+def delete_user_cart(user_id):
+    Cart.objects.filter(user_id=user_id).delete()
+
+
+def refresh_totals(cart):
+    cart.refresh_from_db(fields=['item_count', 'total_price'])
+    return cart.item_count, cart.total_price
+
+
+def reconcile_cart_totals(carts=None):
+    """
+    Recompute stored totals from the cart lines for ``carts`` (a queryset,
+    all carts by default), touching only the carts that drifted. Returns the
+    number of carts fixed.
+    """
+    money = DecimalField(max_digits=12, decimal_places=2)
+    lines = CartItem.objects.filter(cart=OuterRef('pk')).values('cart')
+    actual_count = Coalesce(Subquery(lines.annotate(n=Sum('quantity')).values('n')), 0)
+    actual_total = Coalesce(
+        Subquery(lines.annotate(t=Sum(F('quantity') * F('price'), output_field=money)).values('t')),
+        0,
+        output_field=money,
+    )
+
+    carts = (Cart.objects.all() if carts is None else carts).annotate(
+        actual_count=actual_count,
+        actual_total=actual_total,
+    )
+    drifted = carts.exclude(item_count=F('actual_count'), total_price=F('actual_total'))
+    return Cart.objects.filter(pk__in=drifted.values('pk')).update(
+        item_count=actual_count,
+        total_price=actual_total,
+    )
+
+
+# Async entry points for the ASGI views. Each write needs a transaction,
+# which Django only runs in sync code, so these run the helpers above as
+# one unit on the request's database thread.
+acart_for_session = sync_to_async(cart_for_session)
+aadd_item = sync_to_async(add_item)
+aset_item_quantity = sync_to_async(set_item_quantity)
+aremove_item = sync_to_async(remove_item)
+
+
+async def arefresh_totals(cart):
+    await cart.arefresh_from_db(fields=['item_count', 'total_price'])
+    return cart.item_count, cart.total_price
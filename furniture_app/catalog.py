@@ -0,0 +1,89 @@
+import math
+
+from django.conf import settings
+from django.db.models import F
+
+from .models import Product
+
+SORT_OPTIONS = [
+    {'value': '-created_at', 'label': 'Newest Arrivals'},
+    {'value': 'price', 'label': 'Price: Low to High'},
+    {'value': '-price', 'label': 'Price: High to Low'},
+    {'value': 'name', 'label': 'Name: A-Z'},
+    {'value': 'trending', 'label': 'Trending'},
+]
+TRENDING = 'trending'
+DEFAULT_SORT = '-created_at'
+
+
+def get_sort_by(params):
+    sort_by = params.get('sort_by', DEFAULT_SORT)
+    if sort_by in [opt['value'] for opt in SORT_OPTIONS]:
+        return sort_by
+    return DEFAULT_SORT
+
+
+def parse_price(value):
+    if not value:
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        return None
+    # float() also accepts 'nan' and 'inf', which no price column can compare with.
+    return price if math.isfinite(price) else None
+
+
+def parse_filters(params):
+    return {
+        'category': params.get('category') or None,
+        'material': params.get('material') or None,
+        'min_price': parse_price(params.get('min_price')),
+        'max_price': parse_price(params.get('max_price')),
+        'requires_assembly': {'true': True, 'false': False}.get(params.get('requires_assembly')),
+        'sort_by': get_sort_by(params),
+    }
+
+
+def filter_products(params):
+    """Available products matching the storefront filter parameters."""
+    filters = parse_filters(params)
+    products = Product.objects.filter(is_available=True)
+
+    if filters['category']:
+        products = products.filter(category=filters['category'])
+
+    if filters['material']:
+        products = products.filter(material=filters['material'])
+
+    if filters['min_price'] is not None:
+        products = products.filter(price__gte=filters['min_price'])
+
+    if filters['max_price'] is not None:
+        products = products.filter(price__lte=filters['max_price'])
+
+    if filters['requires_assembly'] is not None:
+        products = products.filter(requires_assembly=filters['requires_assembly'])
+
+    if filters['sort_by'] == TRENDING:
+        # Products saved through bulk_create or raw SQL have no stats row
+        # until their first view or add, so they go last instead of missing.
+        return products.order_by(F('stats__trending_score').desc(nulls_last=True), '-pk')
+    return products.order_by(filters['sort_by'])
+
+
+def get_products(params):
+    """
+    Like filter_products, but answered from the in-memory catalog snapshot
+    when CATALOG_ENGINE is on. Returns a list in that case.
+    """
+    # The snapshot is only rebuilt on catalog changes, so it cannot follow
+    # trending scores; that sort always goes to the database.
+    if not getattr(settings, 'CATALOG_ENGINE', False) or get_sort_by(params) == TRENDING:
+        return filter_products(params)
+
+    from .catalog_engine import get_snapshot
+
+    ids = get_snapshot().query(**parse_filters(params))
+    products = Product.objects.in_bulk(ids)
+    return [products[pk] for pk in ids if pk in products]
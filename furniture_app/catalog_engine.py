@@ -0,0 +1,111 @@
+"""
+In-process catalog snapshot for the storefront filters.
+
+Available products are held as compact column arrays plus one bitmap per
+category, material and assembly flag (Python ints, so combining filters is a
+handful of big-int ANDs). Each sort option has a presorted position array;
+a query walks that array and keeps the positions whose bit is set in the
+combined mask. Price ranges are cut out of the price-sorted array with bisect.
+
+The snapshot is rebuilt when the catalog version (bumped on every Product
+change) moves, and swapped in whole so readers never see a partial build.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .caching import get_catalog_version
+from .models import Product
+
+
+def _bitmap(positions, size):
+    buf = bytearray((size + 7) // 8)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, 'little')
+
+
+class CatalogSnapshot:
+    def __init__(self, version, rows):
+        self.version = version
+        self.size = size = len(rows)
+        self.ids = array('q', (row[0] for row in rows))
+        self.prices = array('d', (float(row[1]) for row in rows))
+        self.created = array('d', (row[5].timestamp() for row in rows))
+        names = [row[6] for row in rows]
+
+        self.all_bits = (1 << size) - 1
+        self.category_bits = self._group_bits(rows, 2)
+        self.material_bits = self._group_bits(rows, 3)
+        self.assembly_bits = _bitmap((i for i, row in enumerate(rows) if row[4]), size)
+
+        positions = range(size)
+        ids, prices, created = self.ids, self.prices, self.created
+        self.by_price = array('l', sorted(positions, key=lambda i: (prices[i], ids[i])))
+        self.sorted_prices = array('d', (prices[i] for i in self.by_price))
+        self.by_created = array('l', sorted(positions, key=lambda i: (created[i], ids[i])))
+        self.by_name = array('l', sorted(positions, key=lambda i: (names[i], ids[i])))
+
+    def _group_bits(self, rows, column):
+        groups = {}
+        for i, row in enumerate(rows):
+            groups.setdefault(row[column], []).append(i)
+        return {value: _bitmap(positions, self.size) for value, positions in groups.items()}
+
+    def query(self, category=None, material=None, min_price=None, max_price=None,
+              requires_assembly=None, sort_by='-created_at'):
+        mask = self.all_bits
+        if category:
+            mask &= self.category_bits.get(category, 0)
+        if material:
+            mask &= self.material_bits.get(material, 0)
+        if requires_assembly is True:
+            mask &= self.assembly_bits
+        elif requires_assembly is False:
+            mask &= ~self.assembly_bits
+        if not mask:
+            return []
+
+        lo = 0 if min_price is None else bisect_left(self.sorted_prices, min_price)
+        hi = self.size if max_price is None else bisect_right(self.sorted_prices, max_price)
+        if lo >= hi:
+            return []
+
+        if sort_by in ('price', '-price'):
+            order = self.by_price[lo:hi]
+        else:
+            if lo > 0 or hi < self.size:
+                mask &= _bitmap(self.by_price[lo:hi], self.size)
+            order = self.by_name if sort_by == 'name' else self.by_created
+        if sort_by in ('-price', '-created_at'):
+            order = reversed(order)
+
+        bits = mask.to_bytes((self.size + 7) // 8, 'little')
+        ids = self.ids
+        return [ids[i] for i in order if bits[i >> 3] >> (i & 7) & 1]
+
+
+_snapshot = None
+_build_lock = threading.Lock()
+
+
+def build_snapshot(version):
+    rows = list(
+        Product.objects.filter(is_available=True).order_by('pk').values_list(
+            'pk', 'price', 'category', 'material', 'requires_assembly', 'created_at', 'name'
+        ).iterator(chunk_size=10000)
+    )
+    return CatalogSnapshot(version, rows)
+
+
+def get_snapshot():
+    global _snapshot
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _build_lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = build_snapshot(version)
+            snapshot = _snapshot
+    return snapshot
@@ -0,0 +1,174 @@
+"""
+Response compression.
+
+Negotiates brotli (when the brotli package is installed) or gzip from
+Accept-Encoding. Regular responses below COMPRESSION_MIN_SIZE are left alone;
+streaming responses are compressed chunk by chunk with a flush after each
+one, so whatever the view has produced so far still reaches the client
+straight away.
+
+Against BREACH, every gzip body carries a random-length filename in its
+header (as django.middleware.gzip does), so its compressed length no longer
+tracks the page's secrets. Brotli has no such field, so it is only used for
+responses that do not vary on Cookie, i.e. ones that are the same for every
+visitor; per-visitor pages always get padded gzip.
+"""
+
+import re
+import secrets
+import struct
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import has_vary_header, patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(r'^(text/|application/(json|javascript|xml)|image/svg\+xml)')
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Same bound as Django's GZipMiddleware.
+GZIP_RANDOM_BYTES = 100
+
+
+def accepted_encoding(accept_encoding, available=None):
+    """
+    The first of ``available`` (by default, the encodings we can produce, best
+    first) that an Accept-Encoding header allows, or None. Codings listed with
+    q=0 are refused.
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        match = re.search(r'q=([0-9.]+)', params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    if available is None:
+        available = ('br', 'gzip') if brotli is not None else ('gzip',)
+    candidates = [coding for coding in available if accepted.get(coding, accepted.get('*', 0)) > 0]
+    return candidates[0] if candidates else None
+
+
+def _gzip_header():
+    # Magic, deflate, FNAME flag, no mtime, no extra flags, unknown OS, then
+    # the random-length filename.
+    return b'\x1f\x8b\x08\x08\x00\x00\x00\x00\x00\xff' + b'a' * secrets.randbelow(GZIP_RANDOM_BYTES) + b'\x00'
+
+
+class _Compressor:
+    def __init__(self, encoding):
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # Raw deflate with the gzip framing written here, since zlib's own
+            # gzip mode cannot write a filename.
+            self._brotli = None
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self._header = _gzip_header()
+            self._crc = 0
+            self._size = 0
+
+    def chunk(self, data):
+        # Compress and flush, so each chunk can be decoded as it arrives.
+        if self._brotli:
+            return self._brotli.process(data) + self._brotli.flush()
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        return self._take_header() + self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self._brotli:
+            return self._brotli.finish()
+        trailer = struct.pack('<II', self._crc, self._size & 0xffffffff)
+        return self._take_header() + self._zlib.flush(zlib.Z_FINISH) + trailer
+
+    def _take_header(self):
+        header, self._header = self._header, b''
+        return header
+
+
+def compress_bytes(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return compress_string(data, max_random_bytes=GZIP_RANDOM_BYTES)
+
+
+def compress_stream(chunks, encoding):
+    compressor = _Compressor(encoding)
+    for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    compressor = _Compressor(encoding)
+    async for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if (response.has_header('Content-Encoding')
+                or not COMPRESSIBLE_TYPES.match(response.get('Content-Type', ''))
+                or response.status_code in (204, 304)):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        available = ('gzip',) if has_vary_header(response, 'Cookie') else None
+        encoding = accepted_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), available)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            compressed = compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The compressed body is a different representation, so a strong
+        # ETag for it would be wrong.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
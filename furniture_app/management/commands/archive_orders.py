@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from furniture_app.archive import archivable_orders, archive_batch, default_cutoff
+
+
+class Command(BaseCommand):
+    help = "Move delivered and cancelled orders older than the cutoff into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Archive orders older than this many days (default: ORDER_ARCHIVE_AFTER_DAYS).")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--max-batches', type=int, help="Stop after this many batches; run again to continue.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many orders would be archived.")
+
+    def handle(self, *args, **options):
+        cutoff = default_cutoff() if options['days'] is None else timezone.now() - timedelta(days=options['days'])
+
+        if options['dry_run']:
+            count = archivable_orders(cutoff).count()
+            self.stdout.write(f"{count} orders placed before {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        total = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            moved = archive_batch(cutoff, options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            self.stdout.write(f"Batch {batches}: archived {moved} orders ({total} so far).")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} orders placed before {cutoff:%Y-%m-%d}."))
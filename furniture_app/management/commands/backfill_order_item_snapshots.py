@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from furniture_app.models import ArchivedOrderItem, OrderItem, Product
+
+# Snapshot column -> Product column it is copied from.
+SNAPSHOT_FIELDS = {
+    'product_name': 'name',
+    'product_image': 'image',
+    'product_category': 'category',
+}
+
+
+class Command(BaseCommand):
+    help = "Copy product name, image and category onto order items placed before those columns existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        product = Product.objects.filter(pk=OuterRef('product_id'))
+        # Products from before 0002 have a NULL image; the snapshot columns are NOT NULL.
+        updates = {
+            field: Coalesce(Subquery(product.values(column)[:1]), Value(''))
+            for field, column in SNAPSHOT_FIELDS.items()
+        }
+
+        for model in (OrderItem, ArchivedOrderItem):
+            pending = model.objects.filter(product_name='', product__isnull=False).order_by('pk')
+            total = 0
+            # Each pass only looks at rows still missing a snapshot, so the
+            # command can be interrupted and re-run.
+            while True:
+                batch = list(pending.values_list('pk', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                total += model.objects.filter(pk__in=batch).update(**updates)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: filled {total} rows.")
+
+        self.stdout.write(self.style.SUCCESS("Order item snapshots are up to date."))
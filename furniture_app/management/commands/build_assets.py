@@ -0,0 +1,27 @@
+from django.contrib.staticfiles.management.commands import collectstatic
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from furniture_app.assets import build_bundles
+from furniture_app.storage import CompressedManifestStaticFilesStorage, brotli
+
+
+class Command(BaseCommand):
+    help = "Build the per-page CSS and JavaScript bundles and collect hashed, pre-compressed static files into STATIC_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help="Empty STATIC_ROOT before collecting.")
+
+    def handle(self, *args, **options):
+        for name, size in build_bundles().items():
+            self.stdout.write(f"bundles/{name}: {size / 1024:.1f} KB")
+
+        # Always collect through the hashing storage, whatever STORAGES says,
+        # so a build can be prepared before ASSET_BUNDLES is switched on.
+        collect = collectstatic.Command(stdout=self.stdout, stderr=self.stderr)
+        collect.storage = CompressedManifestStaticFilesStorage()
+        call_command(collect, interactive=False, clear=options['clear'], verbosity=options['verbosity'] - 1)
+
+        if brotli is None:
+            self.stdout.write(self.style.WARNING("brotli is not installed; only gzip copies were written."))
+        self.stdout.write(self.style.SUCCESS("Static assets built."))
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from furniture_app.caching import STAT_NAMES, cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters for each cache namespace."
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'CACHE_STATS', False):
+            self.stdout.write(self.style.WARNING("CACHE_STATS is off; counters only move while it is on."))
+        self.stdout.write(f"{'namespace':<12}" + ''.join(f'{stat:>12}' for stat in STAT_NAMES))
+        for namespace, stats in cache_stats().items():
+            self.stdout.write(f'{namespace:<12}' + ''.join(f'{stats[stat]:>12}' for stat in STAT_NAMES))
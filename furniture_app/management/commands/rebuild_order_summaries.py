@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from furniture_app.models import ArchivedOrder, Order
+from furniture_app.order_summary import rebuild_order_summary
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's order summary from their orders."
+
+    def handle(self, *args, **options):
+        user_ids = Order.objects.values_list('user_id', flat=True).union(
+            ArchivedOrder.objects.values_list('user_id', flat=True)
+        ).order_by('user_id')
+        count = 0
+        for user_id in user_ids:
+            rebuild_order_summary(user_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt order summaries for {count} users."))
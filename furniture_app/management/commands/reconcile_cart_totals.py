@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from furniture_app.cart import reconcile_cart_totals
+
+
+class Command(BaseCommand):
+    help = "Recompute stored cart totals from cart items, fixing any drift."
+
+    def handle(self, *args, **options):
+        fixed = reconcile_cart_totals()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} carts."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from furniture_app.models import CartItem, Product
+from furniture_app.repricing import reprice_product
+
+
+class Command(BaseCommand):
+    help = "Move cart lines to their products' current prices (after bulk price edits that bypass save())."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--product', type=int, action='append', help="Only this product id (repeatable).")
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        # Cart lines may be in another database, so no subquery here.
+        product_ids = options['product'] or Product.objects.filter(
+            pk__in=list(CartItem.objects.values_list('product_id', flat=True).distinct())
+        ).values_list('pk', flat=True)
+
+        total = 0
+        for product_id in product_ids:
+            total += reprice_product(product_id, options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Repriced {total} cart lines."))
@@ -0,0 +1,33 @@
+import os
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from furniture_app.routers import REPLICA_ALIAS, mark_replica_synced
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto the read replica."
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise CommandError("No replica database is configured (set DB_REPLICA_PATH).")
+
+        source_path = str(settings.DATABASES['default']['NAME'])
+        replica_path = str(settings.DATABASES[REPLICA_ALIAS]['NAME'])
+        tmp_path = f'{replica_path}.tmp'
+
+        # Copy into a temporary file and swap it in, so readers never see a
+        # half-written replica.
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, replica_path)
+
+        mark_replica_synced()
+        self.stdout.write(self.style.SUCCESS(f"Replica synced to {replica_path}."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from furniture_app.warmup import STAGES, warm_up
+
+
+class Command(BaseCommand):
+    help = "Import code, compile templates, read the hot tables and prime the catalog caches, timing each stage."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', choices=STAGES, action='append', help="Only this stage (repeatable).")
+
+    def handle(self, *args, **options):
+        total = 0
+        for stage, seconds, summary in warm_up(options['stage'] or tuple(STAGES)):
+            total += seconds
+            self.stdout.write(f"{stage:<10} {seconds * 1000:8.0f} ms  {summary}")
+        self.stdout.write(self.style.SUCCESS(f"Warmed up in {total:.2f}s."))
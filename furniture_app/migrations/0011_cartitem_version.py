@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0010_ordersummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cartitem',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
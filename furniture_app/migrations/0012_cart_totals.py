@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:19
+
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_cart_totals(apps, schema_editor):
+    Cart = apps.get_model('furniture_app', 'Cart')
+    CartItem = apps.get_model('furniture_app', 'CartItem')
+    lines = CartItem.objects.filter(cart=OuterRef('pk')).values('cart')
+    Cart.objects.update(
+        item_count=Coalesce(Subquery(lines.annotate(n=Sum('quantity')).values('n')), 0),
+        total_price=Coalesce(
+            Subquery(lines.annotate(
+                t=Sum(F('quantity') * F('price'), output_field=DecimalField(max_digits=12, decimal_places=2))
+            ).values('t')),
+            0,
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0011_cartitem_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='item_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(fill_cart_totals, migrations.RunPython.noop),
+    ]
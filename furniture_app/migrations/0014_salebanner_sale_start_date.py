@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0013_archived_orders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salebanner',
+            name='sale_start_date',
+            field=models.DateTimeField(blank=True, help_text='Leave blank to start immediately.', null=True),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0014_salebanner_sale_start_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedorderitem',
+            name='product_category',
+            field=models.CharField(blank=True, choices=[('LIVING_ROOM', 'Living Room'), ('BEDROOM', 'Bedroom'), ('DINING_ROOM', 'Dining Room'), ('OFFICE', 'Office'), ('OUTDOOR', 'Outdoor'), ('KITCHEN', 'Kitchen')], default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='archivedorderitem',
+            name='product_image',
+            field=models.ImageField(blank=True, default='', upload_to='product_images/'),
+        ),
+        migrations.AddField(
+            model_name='archivedorderitem',
+            name='product_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='product_category',
+            field=models.CharField(blank=True, choices=[('LIVING_ROOM', 'Living Room'), ('BEDROOM', 'Bedroom'), ('DINING_ROOM', 'Dining Room'), ('OFFICE', 'Office'), ('OUTDOOR', 'Outdoor'), ('KITCHEN', 'Kitchen')], default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='product_image',
+            field=models.ImageField(blank=True, default='', upload_to='product_images/'),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='product_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='archivedorderitem',
+            name='product',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='furniture_app.product'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='product',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='furniture_app.product'),
+        ),
+    ]
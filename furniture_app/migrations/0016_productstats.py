@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_stats_rows(apps, schema_editor):
+    Product = apps.get_model('furniture_app', 'Product')
+    ProductStats = apps.get_model('furniture_app', 'ProductStats')
+    ProductStats.objects.bulk_create(
+        [ProductStats(product_id=pk) for pk in Product.objects.values_list('pk', flat=True)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0015_order_item_product_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductStats',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='furniture_app.product')),
+                ('view_count', models.PositiveIntegerField(default=0)),
+                ('add_to_cart_count', models.PositiveIntegerField(default=0)),
+                ('trending_score', models.FloatField(db_index=True, default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Product stats',
+            },
+        ),
+        migrations.RunPython(create_stats_rows, migrations.RunPython.noop),
+    ]
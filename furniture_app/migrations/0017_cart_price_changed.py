@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0016_productstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='price_changed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
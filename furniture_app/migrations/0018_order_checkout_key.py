@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0017_cart_price_changed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='checkout_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='order',
+            unique_together={('user', 'checkout_key')},
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def refill_cart_totals(apps, schema_editor):
+    # 0012 filled the totals before carts could live in their own database;
+    # recompute them on each database that holds carts.
+    Cart = apps.get_model('furniture_app', 'Cart')
+    CartItem = apps.get_model('furniture_app', 'CartItem')
+    db = schema_editor.connection.alias
+    lines = CartItem.objects.using(db).filter(cart=OuterRef('pk')).values('cart')
+    Cart.objects.using(db).update(
+        item_count=Coalesce(Subquery(lines.annotate(n=Sum('quantity')).values('n')), 0),
+        total_price=Coalesce(
+            Subquery(lines.annotate(
+                t=Sum(F('quantity') * F('price'), output_field=DecimalField(max_digits=12, decimal_places=2))
+            ).values('t')),
+            0,
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('furniture_app', '0019_cart_cross_database_links'),
+    ]
+
+    operations = [
+        # The hint lets the carts database run it too.
+        migrations.RunPython(refill_cart_totals, migrations.RunPython.noop, hints={'model_name': 'cart'}),
+    ]
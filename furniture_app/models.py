@@ -45,7 +45,16 @@ class Product(models.Model):
         return self.price
 
 class Cart(models.Model):
-    user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
+    # Carts may live in their own database (furniture_app.routers.CartsRouter),
+    # so links to users and products carry no constraint and deletes are
+    # propagated by signals instead.
+    user = models.OneToOneField(User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True)
+    # Kept in step with the cart's items by furniture_app.cart.
+    item_count = models.IntegerField(default=0)
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Set when furniture_app.repricing changes a line's price; cleared once
+    # the cart page has shown the notice.
+    price_changed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -53,13 +62,14 @@ class Cart(models.Model):
         return f"Cart for {self.user.username if self.user else 'Anonymous'}"
 
     def get_total_price(self):
-        return sum(item.get_total() for item in self.items.all())
+        return self.total_price
 
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='items')
-    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, db_constraint=False)
     quantity = models.PositiveIntegerField(default=1)
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    version = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ('cart', 'product')
@@ -102,26 +112,118 @@ class Order(models.Model):
     shipping_address = models.ForeignKey(Address, on_delete=models.SET_NULL, null=True, related_name='orders_shipped_to')
     payment_method = models.CharField(max_length=50)
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='PENDING')
+    # Idempotency key issued with the checkout page; a resubmitted form
+    # finds the order it already placed instead of placing another.
+    checkout_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-order_date'], name='order_user_date_idx'),
+        ]
+        unique_together = ('user', 'checkout_key')
 
     def __str__(self):
         return f"Order {self.id} by {self.user.username}"
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
-    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, blank=True)
     quantity = models.PositiveIntegerField(default=1)
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    # Copied from the product when the order is placed, so order pages never
+    # need the product and survive it being edited or deleted.
+    product_name = models.CharField(max_length=255, blank=True, default='')
+    product_image = models.ImageField(upload_to='product_images/', blank=True, default='')
+    product_category = models.CharField(max_length=50, choices=Product.CATEGORY_CHOICES, blank=True, default='')
 
     def __str__(self):
-        return f"{self.quantity} x {self.product.name} for Order {self.order.id}"
+        return f"{self.quantity} x {self.product_name} for Order {self.order_id}"
 
     def get_total(self):
         return self.quantity * self.price
 
+class ArchivedOrder(models.Model):
+    # Finished orders moved out of Order by furniture_app.archive. The id is
+    # the original Order id, so order links keep working.
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_orders')
+    order_date = models.DateTimeField()
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    shipping_address = models.ForeignKey(Address, on_delete=models.SET_NULL, null=True, related_name='archived_orders_shipped_to')
+    payment_method = models.CharField(max_length=50)
+    status = models.CharField(max_length=50, choices=Order.STATUS_CHOICES)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-order_date'], name='archived_order_user_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived order {self.id} by {self.user.username}"
+
+class ArchivedOrderItem(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name='items')
+    product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, blank=True)
+    quantity = models.PositiveIntegerField(default=1)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    product_name = models.CharField(max_length=255, blank=True, default='')
+    product_image = models.ImageField(upload_to='product_images/', blank=True, default='')
+    product_category = models.CharField(max_length=50, choices=Product.CATEGORY_CHOICES, blank=True, default='')
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_name} for archived Order {self.order_id}"
+
+    def get_total(self):
+        return self.quantity * self.price
+
+class OrderSummary(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='order_summary')
+    order_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    processing_count = models.IntegerField(default=0)
+    shipped_count = models.IntegerField(default=0)
+    delivered_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+    items_purchased = models.IntegerField(default=0)
+    lifetime_spend = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_order_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "Order summaries"
+
+    def __str__(self):
+        return f"Order summary for {self.user.username}"
+
+    def status_counts(self):
+        return [
+            (label, getattr(self, f'{value.lower()}_count'))
+            for value, label in Order.STATUS_CHOICES
+        ]
+
+class ProductStats(models.Model):
+    # Written in bulk by furniture_app.product_stats, never per request.
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    view_count = models.PositiveIntegerField(default=0)
+    add_to_cart_count = models.PositiveIntegerField(default=0)
+    # Log of the decayed popularity, shifted so scores stay comparable over
+    # time without being rewritten; higher is more popular right now.
+    trending_score = models.FloatField(default=0, db_index=True)
+
+    class Meta:
+        verbose_name_plural = "Product stats"
+
+    def __str__(self):
+        return f"Stats for {self.product_id}"
+
 class SaleBanner(models.Model):
     title = models.CharField(max_length=255)
     featured_product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, blank=True)
     custom_message = models.TextField(blank=True, null=True, help_text="Overrides default message if provided.")
+    sale_start_date = models.DateTimeField(null=True, blank=True, help_text="Leave blank to start immediately.")
     sale_end_date = models.DateTimeField(null=True, blank=True, help_text="Leave blank for ongoing sale.")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,103 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import Order
+from .order_summary import apply_summary_delta, counted_spend
+
+# Allowed moves between Order.STATUS_CHOICES. DELIVERED and CANCELLED are final.
+TRANSITIONS = {
+    'PENDING': {'PROCESSING', 'CANCELLED'},
+    'PROCESSING': {'SHIPPED', 'CANCELLED'},
+    'SHIPPED': {'DELIVERED'},
+    'DELIVERED': set(),
+    'CANCELLED': set(),
+}
+
+STATUS_LABELS = dict(Order.STATUS_CHOICES)
+
+
+def can_transition(old_status, new_status):
+    return new_status in TRANSITIONS.get(old_status, ())
+
+
+def sources_for(new_status):
+    return [status for status, targets in TRANSITIONS.items() if new_status in targets]
+
+
+def _update_summaries(changes, new_status):
+    # changes: (user_id, old_status, total_price) for every order that moved
+    deltas = defaultdict(lambda: {'statuses': defaultdict(int), 'spend': 0})
+    for user_id, old_status, total_price in changes:
+        delta = deltas[user_id]
+        delta['statuses'][old_status] -= 1
+        delta['statuses'][new_status] += 1
+        delta['spend'] += counted_spend(new_status, total_price) - counted_spend(old_status, total_price)
+    for user_id, delta in deltas.items():
+        apply_summary_delta(user_id, spend=delta['spend'], statuses=delta['statuses'])
+
+
+def transition_order(order, new_status):
+    """
+    Move one order to ``new_status`` if the state machine allows it and the
+    order has not changed status since it was loaded. Returns True on success.
+    """
+    if not can_transition(order.status, new_status):
+        return False
+    with transaction.atomic():
+        if not Order.objects.filter(pk=order.pk, status=order.status).update(status=new_status):
+            return False
+        _update_summaries([(order.user_id, order.status, order.total_price)], new_status)
+    order.status = new_status
+    order._summary_state = (new_status, order.total_price)
+    return True
+
+
+def bulk_transition(order_ids, new_status):
+    """
+    Apply ``new_status`` to every order in ``order_ids`` that may move there,
+    with a single conditional UPDATE. Returns one result dict per order id.
+    """
+    if new_status not in STATUS_LABELS:
+        raise ValueError(f"Unknown order status: {new_status}")
+
+    sources = sources_for(new_status)
+    with transaction.atomic():
+        orders = {
+            pk: (status, user_id, total_price)
+            for pk, status, user_id, total_price in Order.objects.select_for_update().filter(
+                pk__in=order_ids
+            ).values_list('pk', 'status', 'user_id', 'total_price')
+        }
+        movable = [pk for pk, (status, _, _) in orders.items() if status in sources]
+        if movable:
+            Order.objects.filter(pk__in=movable, status__in=sources).update(status=new_status)
+            _update_summaries(
+                [(orders[pk][1], orders[pk][0], orders[pk][2]) for pk in movable],
+                new_status,
+            )
+
+    results = []
+    moved = set(movable)
+    for pk in order_ids:
+        if pk not in orders:
+            results.append({'order_id': pk, 'success': False, 'message': 'Order not found.'})
+            continue
+        old_status = orders[pk][0]
+        if pk in moved:
+            results.append({
+                'order_id': pk,
+                'success': True,
+                'status': new_status,
+                'status_display': STATUS_LABELS[new_status],
+                'message': f"Order #{pk} moved to {STATUS_LABELS[new_status]}.",
+            })
+        else:
+            results.append({
+                'order_id': pk,
+                'success': False,
+                'status': old_status,
+                'status_display': STATUS_LABELS[old_status],
+                'message': f"Order #{pk} cannot go from {STATUS_LABELS[old_status]} to {STATUS_LABELS[new_status]}.",
+            })
+    return results
@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, OrderSummary
+
+_suspended = ContextVar('order_summary_suspended', default=False)
+
+
+@contextmanager
+def suspend_summary_updates():
+    # For bulk jobs that move orders around without changing a user's history.
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def summary_updates_suspended():
+    return _suspended.get()
+
+
+def status_field(status):
+    return f'{status.lower()}_count'
+
+
+def counted_spend(status, total_price):
+    # Cancelled orders stay in the counts but are not money spent.
+    return Decimal('0') if status == 'CANCELLED' else total_price
+
+
+def apply_summary_delta(user_id, orders=0, items=0, spend=0, statuses=None, last_order_date=None,
+                        refresh_last_order_date=False):
+    if _suspended.get():
+        return
+
+    updates = {}
+    if orders:
+        updates['order_count'] = F('order_count') + orders
+    if items:
+        updates['items_purchased'] = F('items_purchased') + items
+    if spend:
+        updates['lifetime_spend'] = F('lifetime_spend') + spend
+    for status, delta in (statuses or {}).items():
+        if delta:
+            updates[status_field(status)] = F(status_field(status)) + delta
+    if last_order_date:
+        updates['last_order_date'] = last_order_date
+    elif refresh_last_order_date:
+        updates['last_order_date'] = Coalesce(
+            Subquery(Order.objects.filter(user_id=OuterRef('user_id')).order_by('-order_date').values('order_date')[:1]),
+            Subquery(ArchivedOrder.objects.filter(user_id=OuterRef('user_id')).order_by('-order_date').values('order_date')[:1]),
+        )
+    if not updates:
+        return
+
+    # A user without a summary row yet gets one built from scratch, which
+    # already includes the change being applied.
+    if not OrderSummary.objects.filter(user_id=user_id).update(**updates):
+        rebuild_order_summary(user_id)
+
+
+def _aggregate_orders(orders, items):
+    status_counts = {
+        status_field(value): Count('id', filter=Q(status=value))
+        for value, _ in Order.STATUS_CHOICES
+    }
+    values = orders.aggregate(
+        order_count=Count('id'),
+        lifetime_spend=Sum('total_price', filter=~Q(status='CANCELLED')),
+        last_order_date=Max('order_date'),
+        **status_counts,
+    )
+    values['lifetime_spend'] = values['lifetime_spend'] or 0
+    values['items_purchased'] = items.aggregate(total=Sum('quantity'))['total'] or 0
+    return values
+
+
+def rebuild_order_summary(user_id):
+    # Archived orders are still part of a user's history.
+    values = _aggregate_orders(
+        Order.objects.filter(user_id=user_id),
+        OrderItem.objects.filter(order__user_id=user_id),
+    )
+    if ArchivedOrder.objects.filter(user_id=user_id).exists():
+        archived = _aggregate_orders(
+            ArchivedOrder.objects.filter(user_id=user_id),
+            ArchivedOrderItem.objects.filter(order__user_id=user_id),
+        )
+        for field, value in archived.items():
+            if field == 'last_order_date':
+                values[field] = max(filter(None, (values[field], value)), default=None)
+            else:
+                values[field] += value
+
+    summary, _ = OrderSummary.objects.update_or_create(user_id=user_id, defaults=values)
+    return summary
+
+
+def get_order_summary(user):
+    try:
+        return user.order_summary
+    except OrderSummary.DoesNotExist:
+        return rebuild_order_summary(user.pk)
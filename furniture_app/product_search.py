@@ -0,0 +1,89 @@
+"""
+Full-text index over product names and descriptions.
+
+On SQLite the index is an FTS5 table that reads its text from the product
+table (external content) and is kept current by triggers, so every way of
+writing products, bulk ones included, updates it. The table and triggers
+are (re)created after each migrate: SQLite migrations rebuild altered
+tables, which drops their triggers.
+
+Other databases, or SQLite builds without FTS5, fall back to the admin's
+normal icontains search.
+"""
+
+import re
+
+from django.db import DatabaseError, connections
+from django.db.models.expressions import RawSQL
+
+from .models import Product
+
+FTS_TABLE = 'furniture_app_product_fts'
+_TRIGGERS = {
+    f'{FTS_TABLE}_insert': """
+        AFTER INSERT ON {product} BEGIN
+            INSERT INTO {fts} (rowid, name, description) VALUES (new.id, new.name, new.description);
+        END""",
+    f'{FTS_TABLE}_delete': """
+        AFTER DELETE ON {product} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        END""",
+    f'{FTS_TABLE}_update': """
+        AFTER UPDATE OF name, description ON {product} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {fts} (rowid, name, description) VALUES (new.id, new.name, new.description);
+        END""",
+}
+
+_available = {}
+
+
+def ensure_search_index(using):
+    """Create the index and its triggers if missing, rebuilding it when anything was missing."""
+    connection = connections[using]
+    product_table = Product._meta.db_table
+    if connection.vendor != 'sqlite' or product_table not in connection.introspection.table_names():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                       [f'{FTS_TABLE}%'])
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = ({FTS_TABLE} | set(_TRIGGERS)) - existing
+        if not missing:
+            return False
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"name, description, content='{product_table}', content_rowid='id')"
+            )
+        except DatabaseError:
+            # SQLite built without FTS5.
+            return False
+        for name, body in _TRIGGERS.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} " + body.format(product=product_table, fts=FTS_TABLE))
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+    _available.pop(using, None)
+    return True
+
+
+def search_available(using):
+    if using not in _available:
+        connection = connections[using]
+        _available[using] = connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+    return _available[using]
+
+
+def match_expression(term):
+    # Every word must appear, matched as a prefix; quoting keeps user input
+    # from being read as FTS5 query syntax.
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', term))
+
+
+def search_products(queryset, term):
+    """Products in ``queryset`` whose name or description contain every word of ``term``."""
+    expression = match_expression(term)
+    if not expression:
+        return queryset.none()
+    return queryset.filter(pk__in=RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+    ))
@@ -0,0 +1,123 @@
+"""
+Write-behind popularity counters.
+
+Product views and add-to-cart events are counted in a per-process buffer and
+written to ProductStats in one upsert every PRODUCT_STATS_FLUSH_INTERVAL
+seconds (or once PRODUCT_STATS_MAX_PENDING products are waiting), instead of
+one write per request.
+
+The trending score is an exponentially decayed event count kept in log
+form relative to a fixed epoch: score = ln(sum(weight * e^(t / tau))). A
+product's current popularity is e^(score - now / tau), so ordering by the
+stored score is ordering by current popularity and old rows never need to
+be decayed in place. Each flush folds new events in with a log-sum-exp.
+"""
+
+import atexit
+import math
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from .models import Product, ProductStats
+
+VIEW_WEIGHT = 1
+ADD_TO_CART_WEIGHT = 5
+# Beyond this gap the older score adds nothing measurable.
+MAX_SCORE_GAP = 30
+
+_lock = threading.Lock()
+_pending = defaultdict(lambda: [0, 0])
+_last_flush = time.monotonic()
+
+
+def _tau():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24) * 3600 / math.log(2)
+
+
+def record_view(product_id):
+    _record(product_id, 0)
+
+
+def record_add_to_cart(product_id):
+    _record(product_id, 1)
+
+
+async def arecord_add_to_cart(product_id):
+    # Counting is in memory; only a due flush has to leave the event loop.
+    if _count(product_id, 1):
+        await sync_to_async(flush)()
+
+
+def _record(product_id, column):
+    if _count(product_id, column):
+        flush()
+
+
+def _count(product_id, column):
+    """Buffer one event. Returns True when the buffer is due to be flushed."""
+    with _lock:
+        _pending[product_id][column] += 1
+        return (
+            len(_pending) >= getattr(settings, 'PRODUCT_STATS_MAX_PENDING', 500)
+            or time.monotonic() - _last_flush >= getattr(settings, 'PRODUCT_STATS_FLUSH_INTERVAL', 30)
+        )
+
+
+def flush():
+    """Write the buffered counts. Returns the number of products updated."""
+    global _pending, _last_flush
+    with _lock:
+        pending, _pending = _pending, defaultdict(lambda: [0, 0])
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    # Events for products deleted since they were counted are dropped.
+    existing = set(Product.objects.filter(pk__in=list(pending)).values_list('pk', flat=True))
+    now = time.time() / _tau()
+    rows = [
+        (product_id, views, adds, math.log(views * VIEW_WEIGHT + adds * ADD_TO_CART_WEIGHT) + now)
+        for product_id, (views, adds) in pending.items()
+        if product_id in existing
+    ]
+    if not rows:
+        return 0
+
+    table = connection.ops.quote_name(ProductStats._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"""
+            INSERT INTO {table} (product_id, view_count, add_to_cart_count, trending_score)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (product_id) DO UPDATE SET
+                view_count = {table}.view_count + excluded.view_count,
+                add_to_cart_count = {table}.add_to_cart_count + excluded.add_to_cart_count,
+                trending_score = CASE
+                    WHEN excluded.trending_score - {table}.trending_score > {MAX_SCORE_GAP} THEN excluded.trending_score
+                    WHEN {table}.trending_score - excluded.trending_score > {MAX_SCORE_GAP} THEN {table}.trending_score
+                    ELSE {table}.trending_score + LN(1 + EXP(excluded.trending_score - {table}.trending_score))
+                END
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def count_product_views(view_func):
+    """Count successful GETs of a product page, including ones served from the page cache."""
+    @wraps(view_func)
+    def _wrapped(request, pk, *args, **kwargs):
+        response = view_func(request, pk, *args, **kwargs)
+        if request.method == 'GET' and response.status_code == 200:
+            record_view(pk)
+        return response
+    return _wrapped
+
+
+atexit.register(flush)
@@ -0,0 +1,187 @@
+"""
+On-demand request profiling.
+
+With PROFILE_REQUESTS on, ProfilingMiddleware profiles a request when it
+carries a valid X-Profile header (a signed, expiring token a staff member
+copies from the profiles page) or, with PROFILE_SAMPLE_RATE = N, one request
+in N. Each profile is written to PROFILE_DIR as collapsed stacks (the input
+format of flamegraph.pl and speedscope) plus a JSON file of request
+metadata; the oldest are pruned beyond PROFILE_KEEP.
+
+Profiles come from a sampler thread that records the request thread's stack
+every PROFILE_INTERVAL seconds. cProfile only keeps caller/callee pairs,
+which cannot be put back together into stacks through Django's middleware
+chain (every layer is the same ``inner`` function), and it slows Python
+code down several times over, while the sampler leaves it alone.
+
+With PROFILE_REQUESTS off the middleware removes itself at startup, so it
+costs nothing. The middleware is sync-only: it samples one thread, so under
+ASGI Django runs the stack in a thread while profiling is on.
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+TOKEN_SALT = 'furniture_app.profiling'
+PROFILE_ID = re.compile(r'\d+-\d+')
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PROFILE_DIR', settings.BASE_DIR / '.profiles'))
+
+
+def make_profile_token(user):
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def token_user_id(token):
+    """The staff user id in a valid, unexpired token, else None."""
+    max_age = getattr(settings, 'PROFILE_TOKEN_MAX_AGE', 3600)
+    try:
+        return int(signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=max_age))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def _label(code):
+    return f'{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class StackSampler:
+    """Counts the calling thread's stacks, below the caller's frame, every ``interval`` seconds."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.counts = Counter()
+        self._thread_id = threading.get_ident()
+        self._base = sys._getframe(1)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None and frame is not self._base:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            if stack and frame is self._base:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.counts.most_common())
+
+
+def _count_queries(stats):
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats['queries'] += 1
+            stats['query_ms'] += (time.perf_counter() - start) * 1000
+    return wrapper
+
+
+def save_profile(sampler, metadata):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f'{time.time_ns()}-{random.randrange(10 ** 6)}'
+    (directory / f'{profile_id}.collapsed').write_text(sampler.collapsed())
+    # The metadata goes last: list_profiles only shows complete profiles.
+    (directory / f'{profile_id}.json').write_text(json.dumps({
+        'id': profile_id, 'samples': sum(sampler.counts.values()), **metadata,
+    }))
+
+    keep = getattr(settings, 'PROFILE_KEEP', 200)
+    for old in sorted(directory.glob('*.json'), key=lambda path: int(path.stem.split('-')[0]))[:-keep]:
+        old.with_suffix('.collapsed').unlink(missing_ok=True)
+        old.unlink(missing_ok=True)
+    return profile_id
+
+
+def list_profiles():
+    profiles = []
+    for path in profile_dir().glob('*.json'):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    for profile in profiles:
+        profile['created_at'] = datetime.fromtimestamp(int(profile['id'].split('-')[0]) / 1e9)
+    return sorted(profiles, key=lambda profile: profile['created_at'], reverse=True)
+
+
+def profile_path(profile_id):
+    """Path of a stored profile's collapsed stacks, or None if ``profile_id`` is not one."""
+    if not PROFILE_ID.fullmatch(profile_id):
+        return None
+    path = profile_dir() / f'{profile_id}.collapsed'
+    return path if path.exists() else None
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILE_REQUESTS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILE_SAMPLE_RATE', 0)
+        self.interval = getattr(settings, 'PROFILE_INTERVAL', 0.001)
+
+    def __call__(self, request):
+        trigger = None
+        user_id = None
+        token = request.META.get(PROFILE_HEADER)
+        if token:
+            user_id = token_user_id(token)
+            if user_id is not None:
+                trigger = 'header'
+        if trigger is None and self.sample_rate and random.randrange(self.sample_rate) == 0:
+            trigger = 'sample'
+        if trigger is None:
+            return self.get_response(request)
+
+        db = {'queries': 0, 'query_ms': 0.0}
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_count_queries(db)))
+            sampler = stack.enter_context(StackSampler(self.interval))
+            response = self.get_response(request)
+        duration = (time.perf_counter() - start) * 1000
+
+        match = request.resolver_match
+        save_profile(sampler, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': match.view_name if match else '',
+            'status': response.status_code,
+            'duration_ms': round(duration, 1),
+            'queries': db['queries'],
+            'query_ms': round(db['query_ms'], 1),
+            'trigger': trigger,
+            'user_id': user_id,
+        })
+        return response
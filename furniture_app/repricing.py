@@ -0,0 +1,86 @@
+"""
+Keep cart lines at the product's current price.
+
+When a product's price, sale flag or discount changes, every cart line for
+it is moved to the new price with set-based UPDATEs, CART_REPRICING_CHUNK_SIZE
+lines per transaction so a product sitting in thousands of carts never holds
+a long write lock. Only lines still at a different price are touched, which
+makes a run safe to repeat or resume. The affected carts get their stored
+totals recomputed and their price_changed flag set.
+
+The work starts after the product change commits, on a background thread
+unless CART_REPRICING_BACKGROUND is off.
+"""
+
+import logging
+import threading
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+
+from .cart import reconcile_cart_totals
+from .models import Cart, CartItem, Product
+from .routers import cart_db
+
+logger = logging.getLogger(__name__)
+
+PRICING_FIELDS = ('price', 'on_sale', 'discount_percentage')
+
+
+def cart_price(product):
+    # What add_to_cart would store for the product now, rounded the way the
+    # column stores it.
+    price = product.get_discounted_price() if product.on_sale else product.price
+    return Decimal(price).quantize(Decimal('0.01'))
+
+
+def reprice_product(product_id, chunk_size=None):
+    """Move all cart lines for ``product_id`` to its current price. Returns lines changed."""
+    chunk_size = chunk_size or getattr(settings, 'CART_REPRICING_CHUNK_SIZE', 5000)
+    # Read from the primary: this runs just after the change commits, when
+    # the replica may still have the old price.
+    product = Product.objects.using(router.db_for_write(Product)).filter(pk=product_id).only(*PRICING_FIELDS).first()
+    if product is None:
+        return 0
+    new_price = cart_price(product)
+
+    stale = CartItem.objects.filter(product_id=product_id).exclude(price=new_price).order_by('pk')
+    total = 0
+    while True:
+        with transaction.atomic(using=cart_db()):
+            rows = list(stale.values_list('pk', 'cart_id')[:chunk_size])
+            if not rows:
+                break
+            line_ids = [pk for pk, _ in rows]
+            cart_ids = {cart_id for _, cart_id in rows}
+            changed = CartItem.objects.filter(pk__in=line_ids).exclude(price=new_price).update(
+                price=new_price, version=F('version') + 1,
+            )
+            carts = Cart.objects.filter(pk__in=cart_ids)
+            carts.update(price_changed=True)
+            reconcile_cart_totals(carts)
+        if not changed:
+            break
+        total += changed
+    return total
+
+
+def _reprice_in_background(product_id):
+    try:
+        reprice_product(product_id)
+    except Exception:
+        logger.exception("Repricing carts for product %s failed", product_id)
+    finally:
+        connections.close_all()
+
+
+def schedule_reprice(product_id):
+    """Reprice carts for ``product_id`` once the current transaction commits."""
+    def start():
+        if getattr(settings, 'CART_REPRICING_BACKGROUND', True):
+            threading.Thread(target=_reprice_in_background, args=(product_id,), daemon=True).start()
+        else:
+            reprice_product(product_id)
+    transaction.on_commit(start)
@@ -0,0 +1,195 @@
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = 'replica'
+CARTS_ALIAS = 'carts'
+REPLICA_SYNCED_AT_KEY = 'replica_synced_at'
+STICKY_COOKIE = 'pin_primary'
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# Set for the rest of a request once it has written anything, so it reads
+# its own writes back from the primary.
+_pinned = ContextVar('pin_primary', default=False)
+_wrote = ContextVar('wrote_primary', default=False)
+
+_freshness = {'checked_at': 0.0, 'fresh': False}
+
+
+def replica_is_fresh():
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return False
+    # The sync marker lives in the shared cache; only look at it once a second.
+    now = time.monotonic()
+    if now - _freshness['checked_at'] > 1:
+        synced_at = caches['default'].get(REPLICA_SYNCED_AT_KEY)
+        max_lag = getattr(settings, 'REPLICA_MAX_LAG', 60)
+        _freshness['fresh'] = synced_at is not None and time.time() - synced_at <= max_lag
+        _freshness['checked_at'] = now
+    return _freshness['fresh']
+
+
+def mark_replica_synced():
+    caches['default'].set(REPLICA_SYNCED_AT_KEY, time.time(), None)
+    _freshness['checked_at'] = 0.0
+
+
+def use_replica():
+    return not _pinned.get() and replica_is_fresh()
+
+
+def _bookkeeping_tables():
+    # Session saves and database cache writes happen on nearly every request
+    # and never change what the catalog shows.
+    return ['django_session'] + [
+        cache['LOCATION'] for cache in settings.CACHES.values() if cache['BACKEND'].endswith('.DatabaseCache')
+    ]
+
+
+def pin_on_write(execute, sql, params, many, context):
+    """
+    Database execute wrapper: once a request has written (other than to the
+    bookkeeping tables), it reads from the primary for the rest of the
+    request and the browser becomes sticky.
+    """
+    result = execute(sql, params, many, context)
+    if sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS) and not any(
+        f'"{table}"' in sql for table in _bookkeeping_tables()
+    ):
+        _pinned.set(True)
+        _wrote.set(True)
+    return result
+
+
+def reporting_db():
+    """Database alias for staff reporting queries."""
+    return REPLICA_ALIAS if use_replica() else DEFAULT_DB_ALIAS
+
+
+def is_cart_model(model):
+    meta = model._meta
+    return meta.app_label == 'sessions' or (
+        meta.app_label == 'furniture_app' and meta.model_name in CartsRouter.cart_models
+    )
+
+
+def cart_db():
+    """Database alias holding carts, cart lines and sessions."""
+    return CARTS_ALIAS if CARTS_ALIAS in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+class CartsRouter:
+    """
+    Keep carts, cart lines and sessions in the ``carts`` database when one
+    is configured, so their constant writes don't queue behind (or hold up)
+    orders and admin edits on the primary's write lock.
+
+    Their foreign keys to User and Product have no database constraint and
+    nothing may join across the two; furniture_app.cart and the signals
+    module handle the cross-database steps.
+    """
+    cart_models = {'cart', 'cartitem'}
+
+    def db_for_read(self, model, **hints):
+        # Migrations' historical models (module __fake__) stay on the
+        # database being migrated; their RunPython steps choose it themselves.
+        if model.__module__ == '__fake__':
+            return None
+        if is_cart_model(model) and CARTS_ALIAS in settings.DATABASES:
+            return CARTS_ALIAS
+        return None
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, CARTS_ALIAS, REPLICA_ALIAS}
+        if CARTS_ALIAS in (obj1._state.db, obj2._state.db) and {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db != CARTS_ALIAS:
+            return None
+        if app_label == 'sessions':
+            return True
+        return app_label == 'furniture_app' and model_name in self.cart_models
+
+
+class ReplicaRouter:
+    """
+    Send catalog reads to the replica, everything else to the primary.
+
+    Falls back to the primary when the replica has not been synced within
+    REPLICA_MAX_LAG seconds, or once the request has written something
+    (pin_on_write, installed on each connection by furniture_app.signals).
+    """
+    replica_models = {'product', 'salebanner'}
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != 'furniture_app' or model._meta.model_name not in self.replica_models:
+            return None
+        return REPLICA_ALIAS if use_replica() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes across requests: after a request writes, the same
+    browser keeps reading from the primary for REPLICA_STICKY_SECONDS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tokens = self._start(request)
+        try:
+            response = self.get_response(request)
+            self._finish(response)
+        finally:
+            self._reset(tokens)
+        return response
+
+    async def __acall__(self, request):
+        tokens = self._start(request)
+        try:
+            response = await self.get_response(request)
+            self._finish(response)
+        finally:
+            self._reset(tokens)
+        return response
+
+    def _start(self, request):
+        pinned = request.method not in ('GET', 'HEAD', 'OPTIONS') or STICKY_COOKIE in request.COOKIES
+        return _pinned.set(pinned), _wrote.set(False)
+
+    def _finish(self, response):
+        if _wrote.get():
+            response.set_cookie(
+                STICKY_COOKIE, '1',
+                max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 10),
+                httponly=True, samesite='Lax',
+            )
+
+    def _reset(self, tokens):
+        _pinned.reset(tokens[0])
+        _wrote.reset(tokens[1])
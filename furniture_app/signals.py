@@ -0,0 +1,140 @@
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save
+from django.dispatch import receiver
+
+from .caching import bump_catalog_version
+from .cart import delete_user_cart, remove_product_lines
+from .models import Product, ProductStats, SaleBanner, Order, OrderItem, OrderSummary
+from .order_summary import apply_summary_delta, counted_spend, summary_updates_suspended
+from .product_search import ensure_search_index
+from .repricing import PRICING_FIELDS, schedule_reprice
+from .routers import REPLICA_ALIAS, pin_on_write
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=SaleBanner)
+@receiver(post_delete, sender=SaleBanner)
+def invalidate_catalog(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(connection_created)
+def pin_reads_after_writes(sender, connection, **kwargs):
+    # Fires again on every reconnect of the same connection object.
+    if connection.alias != REPLICA_ALIAS and pin_on_write not in connection.execute_wrappers:
+        connection.execute_wrappers.append(pin_on_write)
+
+
+# Carts don't cascade from users and products (they may be in another
+# database); clean them up once the delete has committed.
+@receiver(post_delete, sender=Product)
+def remove_deleted_product_from_carts(sender, instance, using, **kwargs):
+    transaction.on_commit(partial(remove_product_lines, instance.pk), using=using)
+
+
+@receiver(post_delete, sender=User)
+def delete_cart_of_deleted_user(sender, instance, using, **kwargs):
+    transaction.on_commit(partial(delete_user_cart, instance.pk), using=using)
+
+
+@receiver(post_delete, sender=User)
+def delete_summary_of_deleted_user(sender, instance, **kwargs):
+    # Deleting the user's orders rebuilt the summary row the cascade had
+    # already removed.
+    OrderSummary.objects.filter(user_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Product)
+def create_product_stats(sender, instance, created, **kwargs):
+    if created:
+        ProductStats.objects.get_or_create(product=instance)
+
+
+def _pricing_state(product):
+    # Read from __dict__ so deferred fields are not loaded just for this.
+    return tuple(product.__dict__.get(field) for field in PRICING_FIELDS)
+
+
+@receiver(post_init, sender=Product)
+def remember_product_pricing(sender, instance, **kwargs):
+    instance._pricing_state = _pricing_state(instance)
+
+
+@receiver(post_save, sender=Product)
+def reprice_carts_for_product(sender, instance, created, **kwargs):
+    state = _pricing_state(instance)
+    if not created and state != instance._pricing_state:
+        schedule_reprice(instance.pk)
+    instance._pricing_state = state
+
+
+@receiver(post_init, sender=Order)
+def remember_order_state(sender, instance, **kwargs):
+    instance._summary_state = (instance.status, instance.total_price)
+
+
+@receiver(post_save, sender=Order)
+def update_summary_for_order(sender, instance, created, **kwargs):
+    status, total_price = instance.status, instance.total_price
+    if created:
+        apply_summary_delta(
+            instance.user_id,
+            orders=1,
+            spend=counted_spend(status, total_price),
+            statuses={status: 1},
+            last_order_date=instance.order_date,
+        )
+    else:
+        old_status, old_total_price = instance._summary_state
+        if (old_status, old_total_price) != (status, total_price):
+            apply_summary_delta(
+                instance.user_id,
+                spend=counted_spend(status, total_price) - counted_spend(old_status, old_total_price),
+                statuses={old_status: -1, status: 1} if old_status != status else None,
+            )
+    instance._summary_state = (status, total_price)
+
+
+@receiver(post_delete, sender=Order)
+def update_summary_for_deleted_order(sender, instance, **kwargs):
+    old_status, old_total_price = instance._summary_state
+    apply_summary_delta(
+        instance.user_id,
+        orders=-1,
+        spend=-counted_spend(old_status, old_total_price),
+        statuses={old_status: -1},
+        refresh_last_order_date=True,
+    )
+
+
+@receiver(post_init, sender=OrderItem)
+def remember_order_item_quantity(sender, instance, **kwargs):
+    instance._summary_quantity = instance.quantity
+
+
+@receiver(post_save, sender=OrderItem)
+def update_summary_for_order_item(sender, instance, created, **kwargs):
+    delta = instance.quantity if created else instance.quantity - instance._summary_quantity
+    if delta:
+        apply_summary_delta(instance.order.user_id, items=delta)
+    instance._summary_quantity = instance.quantity
+
+
+@receiver(post_delete, sender=OrderItem)
+def update_summary_for_deleted_order_item(sender, instance, **kwargs):
+    if summary_updates_suspended():
+        return
+    user_id = Order.objects.filter(pk=instance.order_id).values_list('user_id', flat=True).first()
+    if user_id:
+        apply_summary_delta(user_id, items=-instance._summary_quantity)
+
+
+@receiver(post_migrate)
+def create_product_search_index(sender, using, **kwargs):
+    if sender.name == 'furniture_app':
+        ensure_search_index(using)
@@ -0,0 +1,55 @@
+(function () {
+    const bulkForm = document.getElementById('bulkStatusForm');
+    const selectAll = document.getElementById('selectAllOrders');
+    const selectedCount = document.getElementById('bulkSelectedCount');
+
+    function selected() {
+        return Array.from(document.querySelectorAll('.order-select:checked'));
+    }
+
+    function updateCount() {
+        if (selectedCount) selectedCount.textContent = selected().length + ' selected';
+    }
+
+    document.querySelectorAll('.order-select').forEach(box => box.addEventListener('change', updateCount));
+    if (selectAll) {
+        selectAll.addEventListener('change', () => {
+            document.querySelectorAll('.order-select').forEach(box => { box.checked = selectAll.checked; });
+            updateCount();
+        });
+    }
+
+    if (bulkForm) {
+        bulkForm.addEventListener('submit', e => {
+            e.preventDefault();
+            const boxes = selected();
+            if (!boxes.length) { showToast('Select at least one order.', 'error'); return; }
+            const data = new FormData(bulkForm);
+            boxes.forEach(box => data.append('order_ids', box.value));
+            fetch(bulkForm.action, {
+                method: 'POST',
+                body: data,
+                headers: { 'X-CSRFToken': data.get('csrfmiddlewaretoken'), 'X-Requested-With': 'XMLHttpRequest' },
+            })
+                .then(r => r.json())
+                .then(result => {
+                    if (!result.success) { showToast(result.message, 'error'); return; }
+                    result.results.forEach(order => {
+                        const row = document.getElementById('order-row-' + order.order_id);
+                        if (!row || !order.success) return;
+                        const status = row.querySelector('.order-status');
+                        if (status) {
+                            status.textContent = order.status_display;
+                            status.className = 'order-status ' + order.status.toLowerCase();
+                        }
+                        const select = row.querySelector('.status-select');
+                        if (select) select.value = order.status;
+                        row.querySelector('.order-select').checked = false;
+                    });
+                    updateCount();
+                    showToast(result.message, result.updated === result.results.length ? 'success' : 'warning');
+                })
+                .catch(() => showToast('Error updating orders.', 'error'));
+        });
+    }
+})();
@@ -0,0 +1,103 @@
+(function () {
+    const totalItems = document.getElementById('cart-total-items');
+    const grandTotal = document.getElementById('cart-grand-total');
+    const cartContainer = document.querySelector('.cart-container');
+    const csrfToken = getCookie('csrftoken');
+
+    function quantityInput(pk) {
+        return document.querySelector('.quantity-input[data-item-pk="' + pk + '"]');
+    }
+
+    function updateSummary(count, total) {
+        if (totalItems) totalItems.textContent = count;
+        if (grandTotal) grandTotal.textContent = '₹' + parseFloat(total).toFixed(2);
+        setCartBadge(count);
+        if (count === 0 && cartContainer) {
+            cartContainer.style.display = 'none';
+            const message = document.createElement('p');
+            message.className = 'empty-cart-message';
+            message.textContent = 'Your cart is empty.';
+            cartContainer.after(message);
+            const link = document.createElement('a');
+            link.href = cartContainer.dataset.shopUrl;
+            link.className = 'back-to-products-btn';
+            link.textContent = 'Continue Shopping';
+            message.after(link);
+        }
+    }
+
+    function post(url, body) {
+        return fetch(url, {
+            method: 'POST',
+            headers: { 'X-CSRFToken': csrfToken, 'Content-Type': 'application/json' },
+            body: JSON.stringify(body),
+        }).then(r => r.json());
+    }
+
+    async function updateQuantity(pk, quantity) {
+        const input = quantityInput(pk);
+        const original = parseInt(input.value);
+        try {
+            const result = await post(input.dataset.updateUrl, { quantity: quantity, version: input.dataset.version });
+            if (result.success) {
+                showToast(result.message, 'success');
+                const row = document.getElementById('cart-item-' + pk);
+                if (row) {
+                    if (result.new_quantity === 0) {
+                        row.remove();
+                    } else {
+                        input.value = result.new_quantity;
+                        input.dataset.version = result.version;
+                        row.querySelector('.item-total').textContent = '₹' + parseFloat(result.item_total).toFixed(2);
+                    }
+                }
+                updateSummary(result.cart_item_count, result.cart_total_price);
+            } else {
+                showToast(result.message, 'error');
+                if (result.version !== undefined && result.version !== null) input.dataset.version = result.version;
+                input.value = result.current_quantity || original;
+            }
+        } catch (e) {
+            showToast('Network error. Please try again.', 'error');
+            input.value = original;
+        }
+    }
+
+    document.querySelectorAll('.quantity-btn').forEach(button => {
+        button.addEventListener('click', () => {
+            const pk = button.dataset.itemPk;
+            const quantity = parseInt(quantityInput(pk).value) + parseInt(button.dataset.change);
+            updateQuantity(pk, Math.max(quantity, 0));
+        });
+    });
+
+    document.querySelectorAll('.quantity-input').forEach(input => {
+        input.addEventListener('change', () => {
+            let quantity = parseInt(input.value);
+            if (isNaN(quantity) || quantity < 0) {
+                quantity = 1;
+                input.value = quantity;
+            }
+            updateQuantity(input.dataset.itemPk, quantity);
+        });
+    });
+
+    document.querySelectorAll('.remove-item-form').forEach(form => {
+        form.addEventListener('submit', async e => {
+            e.preventDefault();
+            const row = form.closest('tr');
+            try {
+                const result = await post(form.action, {});
+                if (result.success) {
+                    showToast(result.message, 'success');
+                    if (row) row.remove();
+                    updateSummary(result.cart_item_count, result.cart_total_price);
+                } else {
+                    showToast(result.message, 'error');
+                }
+            } catch (e) {
+                showToast('Network error.', 'error');
+            }
+        });
+    });
+})();
@@ -0,0 +1,80 @@
+(function () {
+    // Filters swap in just the product grid instead of reloading the page
+    const filterForm = document.getElementById('filterForm');
+    const productGrid = document.getElementById('productGrid');
+    if (filterForm) {
+        filterForm.querySelectorAll('select, input[type="checkbox"]').forEach(el => {
+            el.addEventListener('change', () => {
+                const query = new URLSearchParams(new FormData(filterForm)).toString();
+                fetch(productGrid.dataset.fragmentUrl + '?' + query)
+                    .then(r => {
+                        if (!r.ok) throw new Error(r.status);
+                        return r.text();
+                    })
+                    .then(html => {
+                        productGrid.innerHTML = html;
+                        bindAddToCart(productGrid);
+                        history.replaceState(null, '', query ? '?' + query : window.location.pathname);
+                    })
+                    .catch(() => filterForm.submit());
+            });
+        });
+    }
+
+    // Carousel
+    const carouselContainer = document.querySelector('.carousel-container');
+    if (carouselContainer) {
+        const slides = document.querySelectorAll('.carousel-slide');
+        const dots = document.querySelectorAll('.dot');
+        let currentSlideIndex = 0;
+        let slideInterval;
+
+        function showSlide(index) {
+            slides.forEach((slide, i) => {
+                slide.classList.remove('is-active');
+                dots[i].classList.remove('active');
+            });
+            slides[index].classList.add('is-active');
+            dots[index].classList.add('active');
+            currentSlideIndex = index;
+        }
+
+        function resetInterval() {
+            clearInterval(slideInterval);
+            slideInterval = setInterval(() => showSlide((currentSlideIndex + 1) % slides.length), 6000);
+        }
+
+        dots.forEach((dot, i) => dot.addEventListener('click', () => { showSlide(i); resetInterval(); }));
+        showSlide(0);
+        resetInterval();
+
+        // Countdown timers
+        function updateCountdowns() {
+            document.querySelectorAll('.sale-countdown[data-sale-end-timestamp]').forEach(el => {
+                const display = el.querySelector('.countdown-display');
+                if (!display) return;
+                const end = parseInt(el.dataset.saleEndTimestamp);
+                if (isNaN(end)) { display.textContent = ''; return; }
+                const left = end - Math.floor(Date.now() / 1000);
+                if (left <= 0) { display.textContent = 'Sale ended'; return; }
+                const d = Math.floor(left / 86400);
+                const h = Math.floor((left % 86400) / 3600);
+                const m = Math.floor((left % 3600) / 60);
+                const s = left % 60;
+                display.textContent = `${d}d ${String(h).padStart(2, '0')}h ${String(m).padStart(2, '0')}m ${String(s).padStart(2, '0')}s`;
+            });
+        }
+        updateCountdowns();
+        setInterval(updateCountdowns, 1000);
+    }
+
+    // Auto-hide Django messages
+    const djangoMessages = document.getElementById('django-messages');
+    if (djangoMessages) {
+        setTimeout(() => {
+            djangoMessages.style.opacity = '0';
+            djangoMessages.style.transition = 'opacity 0.5s';
+            setTimeout(() => djangoMessages.remove(), 500);
+        }, 5000);
+    }
+})();
@@ -0,0 +1,45 @@
+// Storefront pages: the cart badge and add-to-cart forms, posted in the background.
+
+function bindAddToCart(root) {
+    root.querySelectorAll('.add-to-cart-form, .add-to-cart-detail-form').forEach(form => {
+        form.addEventListener('submit', e => {
+            e.preventDefault();
+            const data = new FormData(form);
+            fetch(form.action, {
+                method: 'POST',
+                body: data,
+                headers: { 'X-CSRFToken': data.get('csrfmiddlewaretoken') || getCookie('csrftoken') },
+            })
+                .then(r => {
+                    // Logged-out visitors are redirected to the login page
+                    if (r.redirected) { window.location = r.url; return null; }
+                    return r.json();
+                })
+                .then(result => {
+                    if (!result) return;
+                    if (result.success) setCartBadge(result.cart_item_count);
+                    showToast(result.message, result.success ? 'success' : 'error');
+                })
+                .catch(() => showToast('Something went wrong. Please try again.', 'error'));
+        });
+    });
+}
+
+(function () {
+    bindAddToCart(document);
+
+    // Cached pages are shared between visitors, so the badge and messages are filled in here
+    const cartSummaryUrl = document.body.dataset.cartSummaryUrl;
+    if (cartSummaryUrl) {
+        fetch(cartSummaryUrl)
+            .then(r => r.json())
+            .then(summary => {
+                setCartBadge(summary.cart_item_count);
+                if (summary.messages.length) {
+                    const last = summary.messages[summary.messages.length - 1];
+                    showToast(last.message, last.tags);
+                }
+            })
+            .catch(() => {});
+    }
+})();
@@ -0,0 +1,45 @@
+// Shared by every page: the mobile nav and the helpers the page scripts use.
+
+function getCookie(name) {
+    const match = document.cookie.split(';').map(c => c.trim()).find(c => c.startsWith(name + '='));
+    return match ? decodeURIComponent(match.substring(name.length + 1)) : null;
+}
+
+function showToast(message, type) {
+    const container = document.getElementById('ajax-message-container');
+    const li = document.createElement('li');
+    li.className = type;
+    li.textContent = message;
+    container.innerHTML = '';
+    container.appendChild(li);
+    container.style.display = 'block';
+    setTimeout(() => { container.style.display = 'none'; container.innerHTML = ''; }, 4000);
+}
+
+function setCartBadge(count) {
+    const badge = document.querySelector('.cart-badge');
+    if (badge) {
+        badge.textContent = count;
+        badge.classList.toggle('hidden', count === 0);
+    }
+}
+
+(function () {
+    const navToggle = document.getElementById('navToggle');
+    const mainNav = document.getElementById('mainNav');
+    const navOverlay = document.getElementById('navOverlay');
+    if (!navToggle) return;
+
+    navToggle.addEventListener('click', () => {
+        navToggle.classList.toggle('active');
+        mainNav.classList.toggle('open');
+        navOverlay.classList.toggle('active');
+        document.body.style.overflow = mainNav.classList.contains('open') ? 'hidden' : '';
+    });
+    navOverlay.addEventListener('click', () => {
+        navToggle.classList.remove('active');
+        mainNav.classList.remove('open');
+        navOverlay.classList.remove('active');
+        document.body.style.overflow = '';
+    });
+})();
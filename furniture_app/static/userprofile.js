@@ -0,0 +1,96 @@
+(function () {
+    function csrfToken(form) {
+        return form.querySelector('input[name="csrfmiddlewaretoken"]').value;
+    }
+
+    function bindCancel(form) {
+        form.addEventListener('submit', e => {
+            e.preventDefault();
+            const order = form.closest('.order-item');
+            fetch(form.action, {
+                method: 'POST',
+                headers: {
+                    'X-CSRFToken': csrfToken(form),
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                    'X-Requested-With': 'XMLHttpRequest',
+                },
+                body: 'status=CANCELLED',
+            })
+                .then(r => r.json())
+                .then(result => {
+                    if (!result.success) { showToast(result.message, 'error'); return; }
+                    showToast(result.message, 'success');
+                    if (!order) return;
+                    const status = order.querySelector('.order-status');
+                    if (status) {
+                        status.textContent = result.new_status_display;
+                        status.className = 'order-status ' + result.new_status_value.toLowerCase();
+                    }
+                    // A cancelled order can be removed from the list instead.
+                    const removeForm = document.createElement('form');
+                    removeForm.action = form.dataset.deleteUrl;
+                    removeForm.method = 'post';
+                    removeForm.className = 'remove-order-form';
+                    const token = form.querySelector('input[name="csrfmiddlewaretoken"]').cloneNode();
+                    const button = document.createElement('button');
+                    button.type = 'submit';
+                    button.className = 'remove-order-btn';
+                    button.textContent = 'Remove from List';
+                    removeForm.append(token, button);
+                    form.replaceWith(removeForm);
+                    bindRemove(removeForm);
+                })
+                .catch(() => showToast('Error cancelling order.', 'error'));
+        });
+    }
+
+    function bindRemove(form) {
+        form.addEventListener('submit', e => {
+            e.preventDefault();
+            const order = form.closest('.order-item');
+            fetch(form.action, {
+                method: 'POST',
+                headers: { 'X-CSRFToken': csrfToken(form), 'Content-Type': 'application/json' },
+                body: JSON.stringify({}),
+            })
+                .then(r => r.json())
+                .then(result => {
+                    showToast(result.message, result.success ? 'success' : 'error');
+                    if (result.success && order) order.remove();
+                })
+                .catch(() => showToast('Error removing order.', 'error'));
+        });
+    }
+
+    function bindOrderForms(root) {
+        root.querySelectorAll('.cancel-order-form').forEach(bindCancel);
+        root.querySelectorAll('.remove-order-form').forEach(bindRemove);
+    }
+    bindOrderForms(document);
+
+    const loadMore = document.getElementById('load-more-orders');
+    const orderList = document.getElementById('order-list');
+    if (loadMore) {
+        loadMore.addEventListener('click', () => {
+            loadMore.disabled = true;
+            fetch(loadMore.dataset.url + '?page=' + loadMore.dataset.nextPage, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+                .then(r => r.json())
+                .then(page => {
+                    const holder = document.createElement('div');
+                    holder.innerHTML = page.html;
+                    bindOrderForms(holder);
+                    orderList.append(...holder.childNodes);
+                    if (page.has_next) {
+                        loadMore.dataset.nextPage = page.next_page;
+                        loadMore.disabled = false;
+                    } else {
+                        loadMore.remove();
+                    }
+                })
+                .catch(() => {
+                    loadMore.disabled = false;
+                    showToast('Error loading orders.', 'error');
+                });
+        });
+    }
+})();
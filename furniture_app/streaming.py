@@ -0,0 +1,41 @@
+"""
+Streaming rendering for long list pages.
+
+The page template is rendered once with ROWS_MARKER where the rows go and
+split there. The head goes out as the first chunk, then the rows follow a
+chunk at a time as they are read from the database, then the tail.
+"""
+
+from itertools import islice
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+ROWS_MARKER = mark_safe('<!--streamed-rows-->')
+
+
+def stream_list_template(request, template_name, rows_template_name, context, items, item_name,
+                         chunk_size=200):
+    """
+    Render ``template_name`` with the rows for the queryset ``items`` rendered
+    from ``rows_template_name`` (which loops over ``item_name``) in chunks.
+    """
+    # The CSRF cookie has to be settled before the headers are sent; rows
+    # rendered later would otherwise mint a token nobody stores.
+    get_token(request)
+    page = render_to_string(template_name, {**context, 'rows_marker': ROWS_MARKER}, request)
+    if ROWS_MARKER not in page:
+        return HttpResponse(page)
+    head, tail = page.split(ROWS_MARKER, 1)
+    rows_template = get_template(rows_template_name)
+
+    def render():
+        yield head
+        iterator = items.iterator(chunk_size=chunk_size)
+        while chunk := list(islice(iterator, chunk_size)):
+            yield rows_template.render({**context, item_name: chunk}, request)
+        yield tail
+
+    return StreamingHttpResponse(render(), content_type='text/html; charset=utf-8')
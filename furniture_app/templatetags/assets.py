@@ -0,0 +1,23 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from ..assets import BUNDLES, JS_BUNDLES, bundles_enabled
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle_css(name):
+    """Stylesheet links for a bundle: the built bundle, or its sources in development."""
+    if bundles_enabled():
+        return format_html('<link rel="stylesheet" href="{}">', static(f'bundles/{name}.css'))
+    return format_html_join('\n    ', '<link rel="stylesheet" href="{}">', ((static(source),) for source in BUNDLES[name]))
+
+
+@register.simple_tag
+def bundle_js(name):
+    """Script tags for a bundle: the built bundle, or its sources in development."""
+    if bundles_enabled():
+        return format_html('<script src="{}"></script>', static(f'bundles/{name}.js'))
+    return format_html_join('\n    ', '<script src="{}"></script>', ((static(source),) for source in JS_BUNDLES[name]))
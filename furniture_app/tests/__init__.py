@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from furniture_app import product_stats
+from myfurniture_app.cache_settings import CACHE_NAMESPACES
+
+SCRIPTS = Path(__file__).parent / 'scripts'
+
+# Per-process caches, so tests never read or write the cache directory (or
+# Redis) of a running server.
+TEST_CACHES = {
+    alias: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': f'tests-{alias}',
+        'KEY_PREFIX': alias,
+    }
+    for alias in ('default',) + CACHE_NAMESPACES
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class FurnitureTestCase(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.addCleanup(product_stats._pending.clear)
+
+
+class MultiProcessTestCase(SimpleTestCase):
+    """
+    Runs the programs in tests/scripts as separate processes sharing a
+    temporary SQLite file and cache, the way gunicorn workers share them.
+    ``extra_env`` adds environment variables; ``{tmp}`` in a value is the
+    temporary directory. ``migrate_databases`` lists the aliases to migrate.
+    """
+    cache_backend = 'file'
+    extra_env = {}
+    migrate_databases = ('default',)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp = Path(tempfile.mkdtemp(prefix='furniture-tests-'))
+        cls.env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'myfurniture_app.settings',
+            'DB_PATH': str(cls.tmp / 'db.sqlite3'),
+            'CACHE_BACKEND': cls.cache_backend,
+            'CACHE_DIR': str(cls.tmp / 'cache'),
+            **{name: value.format(tmp=cls.tmp) for name, value in cls.extra_env.items()},
+        }
+        for alias in cls.migrate_databases:
+            cls.manage('migrate', '--database', alias)
+        if cls.cache_backend == 'db':
+            cls.manage('createcachetable')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def manage(cls, *args):
+        subprocess.run(
+            [sys.executable, 'manage.py', *args, '--verbosity', '0'],
+            cwd=settings.BASE_DIR, env=cls.env, check=True, capture_output=True, timeout=120,
+        )
+
+    def start(self, script, *args):
+        return subprocess.Popen(
+            [sys.executable, str(SCRIPTS / f'{script}.py'), *map(str, args)],
+            cwd=settings.BASE_DIR, env=self.env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+
+    def result(self, process):
+        """The JSON a started script printed on its last line."""
+        stdout, stderr = process.communicate(timeout=120)
+        if process.returncode:
+            self.fail(stderr)
+        return json.loads(stdout.strip().splitlines()[-1])
+
+    def run_script(self, script, *args):
+        return self.result(self.start(script, *args))
@@ -0,0 +1,16 @@
+"""The project URLs with ASYNC_VIEWS on, as myfurniture_app.asgi serves them."""
+
+from django.contrib import admin
+from django.urls import include, path
+
+from furniture_app import async_views, urls
+
+app_patterns = [
+    path(str(pattern.pattern), getattr(async_views, pattern.callback.__name__, pattern.callback), name=pattern.name)
+    for pattern in urls.urlpatterns
+]
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', include((app_patterns, urls.app_name))),
+]
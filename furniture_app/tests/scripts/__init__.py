@@ -0,0 +1,14 @@
+"""
+Programs that MultiProcessTestCase runs in their own interpreters.
+
+Each is run by path, so it sets up Django itself before importing anything
+from the project (importing this package loads the test helpers, which need
+the app registry), works against the DB_PATH database and the shared cache,
+and reports through done(), which prints one JSON line.
+"""
+
+import json
+
+
+def done(result):
+    print(json.dumps(result))
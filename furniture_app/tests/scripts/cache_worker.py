@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from furniture_app.caching import bump_catalog_version, get_catalog_version, get_or_compute  # noqa: E402
+from furniture_app.models import Product  # noqa: E402
+from furniture_app.tests.scripts import done  # noqa: E402
+
+command, *args = sys.argv[1:]
+
+if command == 'version':
+    done(get_catalog_version())
+
+elif command == 'bump':
+    done(bump_catalog_version())
+
+elif command == 'compute':
+    key, seconds = args
+
+    def compute():
+        time.sleep(float(seconds))
+        return os.getpid()
+    done(get_or_compute(key, compute, timeout=60, namespace='catalog'))
+
+elif command == 'set':
+    from django.core.cache import caches
+    namespace, key, value = args
+    caches[namespace].set(key, value)
+    done(True)
+
+elif command == 'get':
+    from django.core.cache import caches
+    namespace, key = args
+    done(caches[namespace].get(key))
+
+elif command == 'page':
+    with CaptureQueriesContext(connection) as queries:
+        response = Client().get(args[0])
+    done({'status': response.status_code, 'queries': len(queries), 'html': response.content.decode()})
+
+elif command == 'add-product':
+    done(Product.objects.create(name=args[0], price=10).pk)
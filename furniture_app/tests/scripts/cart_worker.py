@@ -0,0 +1,55 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from furniture_app.cart import add_item  # noqa: E402
+from furniture_app.models import Cart, CartItem, Product  # noqa: E402
+from furniture_app.tests.scripts import done  # noqa: E402
+
+command, *args = sys.argv[1:]
+
+if command == 'setup':
+    products = [Product.objects.create(name=f'Chair {i}', price=25) for i in range(2)]
+    done({'cart': Cart.objects.create().pk, 'products': [product.pk for product in products]})
+
+elif command == 'add':
+    cart_id, product_id, threads, times = map(int, args)
+    cart = Cart.objects.get(pk=cart_id)
+    product = Product.objects.get(pk=product_id)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(times):
+                add_item(cart, product, 1, product.price)
+        except Exception as exc:
+            errors.append(repr(exc))
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    done({'seconds': time.perf_counter() - start, 'errors': errors})
+
+elif command == 'state':
+    cart = Cart.objects.get(pk=args[0])
+    lines = CartItem.objects.filter(cart=cart)
+    done({
+        'quantities': {str(product_id): quantity for product_id, quantity in lines.values_list('product_id', 'quantity')},
+        'line_total': str(sum(line.quantity * line.price for line in lines)),
+        'item_count': cart.item_count,
+        'total_price': str(cart.total_price),
+    })
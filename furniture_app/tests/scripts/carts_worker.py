@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.contrib.sessions.models import Session  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from furniture_app.models import Address, Cart, CartItem, Order, Product  # noqa: E402
+from furniture_app.tests.scripts import done  # noqa: E402
+
+
+def rows(model):
+    """Row counts of ``model``'s table in each database; None where it has no such table."""
+    counts = {}
+    for alias in ('default', 'carts'):
+        table = model._meta.db_table
+        if table not in connections[alias].introspection.table_names():
+            counts[alias] = None
+            continue
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {table}')
+            counts[alias] = cursor.fetchone()[0]
+    return counts
+
+
+command, *args = sys.argv[1:]
+
+if command == 'shop':
+    # A shopper's whole visit, then the product and the user are deleted.
+    result = {}
+    user = User.objects.create_user('buyer', password='pw')
+    address = Address.objects.create(
+        user=user, street_address='1 Main St', city='Pune', state='MH', zip_code='411001', country='India',
+    )
+    chair, table = Product.objects.create(name='Oak Chair', price=40), Product.objects.create(name='Teak Table', price=90)
+
+    client = Client()
+    client.get('/cart/')
+    client.login(username='buyer', password='pw')
+    client.post(f'/add_to_cart/{chair.pk}/', {'quantity': 2})
+    client.post(f'/add_to_cart/{table.pk}/', {'quantity': 1})
+    result['cart_page'] = client.get('/cart/').status_code
+    result['carts'], result['lines'], result['sessions'] = rows(Cart), rows(CartItem), rows(Session)
+
+    response = client.post('/place_order/', {'shipping_address': address.pk, 'checkout_key': 'key'})
+    order = Order.objects.get(user=user)
+    result['order'] = [response.status_code, sorted(order.items.values_list('product_name', 'quantity'))]
+    result['orders'] = rows(Order)
+    result['lines_after_checkout'] = rows(CartItem)
+
+    client.post(f'/add_to_cart/{chair.pk}/', {'quantity': 1})
+    chair.delete()
+    result['lines_after_product_delete'] = rows(CartItem)
+    user.delete()
+    result['carts_after_user_delete'] = rows(Cart)
+    done(result)
@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from furniture_app.cart import add_item  # noqa: E402
+from furniture_app.models import Address, Cart, Order, OrderItem, OrderSummary, Product  # noqa: E402
+from furniture_app.tests.scripts import done  # noqa: E402
+
+command, *args = sys.argv[1:]
+
+if command == 'setup':
+    user = User.objects.create_user('buyer')
+    address = Address.objects.create(
+        user=user, street_address='1 Main St', city='Pune', state='MH', zip_code='411001', country='India',
+    )
+    product = Product.objects.create(name='Oak Chair', price=40)
+    add_item(Cart.objects.create(user=user), product, 2, product.price)
+    done({'user': user.pk, 'address': address.pk})
+
+elif command == 'place':
+    # Every thread submits the same checkout form at START_AT, like a
+    # double-click or a retried request.
+    user_id, address_id, key, threads, start_at = args
+    user = User.objects.get(pk=user_id)
+    results = []
+
+    def submit():
+        try:
+            client = Client()
+            client.force_login(user)
+            time.sleep(max(0, float(start_at) - time.time()))
+            response = client.post('/place_order/', {'shipping_address': address_id, 'checkout_key': key})
+            results.append([response.status_code, response.get('Location')])
+        except Exception as exc:
+            results.append([repr(exc), None])
+        finally:
+            connections.close_all()
+
+    workers = [threading.Thread(target=submit) for _ in range(int(threads))]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    done(results)
+
+elif command == 'state':
+    user_id = args[0]
+    summary = OrderSummary.objects.get(user_id=user_id)
+    done({
+        'orders': list(Order.objects.filter(user_id=user_id).values_list('pk', flat=True)),
+        'items': list(OrderItem.objects.filter(order__user_id=user_id).values_list('quantity', flat=True)),
+        'cart_item_count': Cart.objects.get(user_id=user_id).item_count,
+        'summary': [summary.order_count, summary.items_purchased],
+    })
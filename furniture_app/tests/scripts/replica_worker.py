@@ -0,0 +1,82 @@
+import sys
+import time
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import django  # noqa: E402
+
+django.setup()
+
+from contextvars import copy_context  # noqa: E402
+
+from django.contrib.sessions.backends.db import SessionStore  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import router  # noqa: E402
+
+from furniture_app.cart import add_item  # noqa: E402
+from furniture_app.models import Cart, CartItem, Product  # noqa: E402
+from furniture_app import routers  # noqa: E402
+from furniture_app.routers import REPLICA_ALIAS, REPLICA_SYNCED_AT_KEY  # noqa: E402
+from furniture_app.tests.scripts import done  # noqa: E402
+
+command, *args = sys.argv[1:]
+
+if command == 'reprice':
+    # A price change right after a replica sync, repriced on the background
+    # thread as in production.
+    product = Product.objects.create(name='Oak Chair', price=100)
+    cart = Cart.objects.create()
+    add_item(cart, product, 2, product.price)
+    call_command('sync_replica', stdout=StringIO())
+
+    product.price = 80
+    product.save()
+    line = CartItem.objects.filter(cart=cart)
+    deadline = time.monotonic() + float(args[0])
+    while line.get().price == 100 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    cart.refresh_from_db()
+    done({
+        'line_price': str(line.get().price),
+        'cart_total': str(cart.total_price),
+        'replica_price': str(Product.objects.using(REPLICA_ALIAS).get(pk=product.pk).price),
+    })
+
+if command == 'routing':
+    # Each step runs in its own context, like a request through
+    # ReplicaStickinessMiddleware; it reports which database served the
+    # read and what it saw.
+    product = Product.objects.create(name='Oak Chair', price=100)
+    call_command('sync_replica', stdout=StringIO())
+
+    def request(*steps):
+        def run():
+            routers._pinned.set(False)
+            for step in steps:
+                step()
+            products = Product.objects.filter(pk=product.pk)
+            return [products.db, products.get().name]
+        return copy_context().run(run)
+
+    def rename(name):
+        def step():
+            primary_copy = Product.objects.using('default').get(pk=product.pk)
+            primary_copy.name = name
+            primary_copy.save()
+        return step
+
+    def make_stale():
+        caches['default'].set(REPLICA_SYNCED_AT_KEY, time.time() - 3600, None)
+        routers._freshness['checked_at'] = 0.0
+
+    result = {'fresh': request()}
+    result['asked_for_write_db'] = request(lambda: router.db_for_write(Product))
+    result['saved_session'] = request(lambda: SessionStore().save())
+    result['after_save'] = request(rename('Teak Chair'))
+    result['next_request'] = request()
+    make_stale()
+    result['stale'] = request()
+    done(result)
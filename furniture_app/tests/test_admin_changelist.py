@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from furniture_app import admin_performance
+from furniture_app.models import Product
+
+from . import FurnitureTestCase
+
+CHANGELIST = '/admin/furniture_app/product/'
+
+
+class ChangelistTestCase(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'pw'))
+        self.products = Product.objects.bulk_create([
+            Product(name=f'Walnut Desk {i}' if i % 5 == 0 else f'Oak Chair {i}', description='Rustic finish',
+                    price=10, category='OFFICE' if i % 3 == 0 else 'BEDROOM', on_sale=i % 2 == 0)
+            for i in range(25)
+        ])
+        patcher = mock.patch.object(admin.site._registry[Product], 'list_per_page', 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def changelist(self, query=''):
+        response = self.client.get(CHANGELIST + query)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    def names(self, cl):
+        return [product.name for product in cl.result_list]
+
+
+class StockChangelistTests(ChangelistTestCase):
+    def test_offset_pages_exact_counts_and_icontains_search(self):
+        cl = self.changelist('?p=3')
+        self.assertNotIsInstance(cl, admin_performance.KeysetChangeList)
+        self.assertEqual(cl.result_count, 25)
+        self.assertEqual(len(cl.result_list), 5)
+        self.assertEqual(self.changelist('?q=walnut').result_count, 5)
+
+
+@override_settings(ADMIN_PERFORMANCE_MODE=True)
+class PerformanceModeTests(ChangelistTestCase):
+    def test_keyset_pages_walk_the_whole_list_newest_first(self):
+        seen, query = [], ''
+        for _ in range(3):
+            cl = self.changelist(query)
+            self.assertIsInstance(cl, admin_performance.KeysetChangeList)
+            seen += [product.pk for product in cl.result_list]
+            if not cl.next_page_url:
+                break
+            query = cl.next_page_url
+        self.assertIsNone(cl.next_page_url)
+        self.assertEqual(seen, sorted((product.pk for product in self.products), reverse=True))
+
+    def test_deep_pages_cost_the_same_queries_as_the_first(self):
+        self.changelist()  # fills the facet cache
+        with CaptureQueriesContext(connection) as first:
+            self.changelist()
+        with CaptureQueriesContext(connection) as deep:
+            cl = self.changelist(f'?after={self.products[5].pk}')
+        self.assertEqual(len(deep), len(first))
+        self.assertEqual([product.pk for product in cl.result_list], [p.pk for p in reversed(self.products[:5])])
+        self.assertFalse(any('OFFSET' in query['sql'] for query in deep.captured_queries))
+
+    def test_counts_are_estimated_or_capped(self):
+        cl = self.changelist()
+        self.assertTrue(cl.result_count_is_estimate)
+        self.assertEqual(cl.result_count, self.products[-1].pk)
+
+        with mock.patch.object(admin_performance, 'COUNT_CAP', 5):
+            cl = self.changelist('?category=BEDROOM')
+        self.assertTrue(cl.result_count_is_capped)
+        self.assertEqual(cl.result_count, 5)
+        cl = self.changelist('?category=OFFICE')
+        self.assertEqual((cl.result_count, cl.result_count_is_capped), (9, False))
+
+    def test_filters_combine_and_show_cached_counts(self):
+        cl = self.changelist('?category=OFFICE&on_sale=True')
+        self.assertEqual(cl.result_count, 5)
+        self.assertTrue(all(product.category == 'OFFICE' and product.on_sale for product in cl.result_list))
+
+        choices = dict(cl.filter_specs[0].lookup_choices)
+        self.assertEqual((choices['OFFICE'], choices['BEDROOM']), ('Office (9)', 'Bedroom (16)'))
+        Product.objects.create(name='New Desk', price=10, category='OFFICE')
+        choices = dict(self.changelist().filter_specs[0].lookup_choices)
+        self.assertEqual(choices['OFFICE'], 'Office (9)')
+
+    def test_filter_and_search_links_drop_the_page_position(self):
+        cl = self.changelist(f'?after={self.products[10].pk}&category=BEDROOM')
+        self.assertEqual(cl.first_page_url, '?category=BEDROOM')
+        self.assertNotIn('after', cl.get_query_string({'on_sale': 'True'}))
+
+    def test_search_matches_every_word_as_a_prefix(self):
+        self.assertEqual(self.changelist('?q=walnut+rust').result_count, 5)
+        self.assertEqual(self.changelist('?q=walnut+chair').result_count, 0)
+        self.assertEqual(self.changelist('?q=%22+OR+*').result_count, 0)
+
+        # Triggers keep the index current through any write.
+        Product.objects.filter(pk=self.products[1].pk).update(name='Walnut Bench')
+        self.assertEqual(self.names(self.changelist('?q=bench')), ['Walnut Bench'])
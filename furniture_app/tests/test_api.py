@@ -0,0 +1,68 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.utils import timezone
+
+from furniture_app.catalog import parse_price
+from furniture_app.models import Product
+
+from . import FurnitureTestCase
+
+URL = '/api/v1/products/'
+
+
+def raw_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+class ProductApiTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        Product.objects.bulk_create([
+            Product(name=f'Chair {i % 4}', price=10 + i % 5, category='OFFICE') for i in range(23)
+        ])
+        now = timezone.now()
+        for i, product in enumerate(Product.objects.order_by('pk')):
+            Product.objects.filter(pk=product.pk).update(created_at=now - timedelta(minutes=i // 3))
+
+    def walk(self, params):
+        ids, url, query = [], URL, {**params, 'limit': 5, 'fields': 'id'}
+        while url:
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.json()['results']]
+            url, query = response.json()['next'], None
+        return ids
+
+    def test_cursor_pages_match_the_full_listing(self):
+        for sort_by in ('-created_at', 'price', '-price', 'name'):
+            expected = list(Product.objects.order_by(sort_by, '-pk' if sort_by[0] == '-' else 'pk').values_list('pk', flat=True))
+            self.assertEqual(self.walk({'sort_by': sort_by}), expected, sort_by)
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        next_url = self.client.get(URL, {'limit': 5}).json()['next']
+        response = self.client.get(next_url + '&sort_by=price')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('sort_by', response.json()['error'])
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in (
+            'not-a-cursor',
+            raw_cursor(['price', 'abc', 1]),
+            raw_cursor(['price', 'NaN', 1]),
+            raw_cursor(['price', {'nested': 1}, 1]),
+            raw_cursor(['price', None, 1]),
+            raw_cursor(['price', '10', 'x']),
+            raw_cursor(['10', 1]),
+            raw_cursor(['price', '10', 1, 'extra']),
+        ):
+            response = self.client.get(URL, {'sort_by': 'price', 'cursor': cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+
+    def test_non_finite_prices_are_ignored(self):
+        for value in ('nan', 'inf', '-Infinity'):
+            self.assertIsNone(parse_price(value))
+            self.assertEqual(self.client.get(URL, {'min_price': value}).status_code, 200)
+            self.assertEqual(self.client.get('/', {'max_price': value}).status_code, 200)
+        self.assertEqual(parse_price('12.5'), 12.5)
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from furniture_app.archive import archive_batch, default_cutoff, order_history
+from furniture_app.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, Product
+from furniture_app.order_summary import get_order_summary, rebuild_order_summary
+
+from . import FurnitureTestCase
+
+
+class ArchiveTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('buyer', password='pw')
+        self.product = Product.objects.create(name='Oak Chair', price=40)
+        old = timezone.now() - timedelta(days=800)
+        self.archivable = set()
+        for i, (status, date) in enumerate([
+            ('DELIVERED', old), ('CANCELLED', old), ('PENDING', old), ('DELIVERED', timezone.now()),
+        ]):
+            order = Order.objects.create(user=self.user, total_price=40, payment_method='COD', status=status)
+            Order.objects.filter(pk=order.pk).update(order_date=date - timedelta(minutes=i))
+            OrderItem.objects.create(order=order, product=self.product, quantity=2, price=20, product_name='Oak Chair')
+            if date == old and status != 'PENDING':
+                self.archivable.add(order.pk)
+
+    def test_moves_only_old_finished_orders(self):
+        summary_before = get_order_summary(self.user)
+        self.assertEqual(archive_batch(default_cutoff()), 2)
+
+        self.assertEqual(set(ArchivedOrder.objects.values_list('pk', flat=True)), self.archivable)
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(ArchivedOrderItem.objects.filter(order_id__in=self.archivable).count(), 2)
+        self.assertFalse(OrderItem.objects.filter(order_id__in=self.archivable).exists())
+
+        # The summary already counted them and must not move.
+        summary_after = rebuild_order_summary(self.user.pk)
+        self.assertEqual(
+            (summary_after.order_count, summary_after.items_purchased, summary_after.lifetime_spend),
+            (summary_before.order_count, summary_before.items_purchased, summary_before.lifetime_spend),
+        )
+
+    def test_rerun_is_a_no_op(self):
+        while archive_batch(default_cutoff(), batch_size=1):
+            pass
+        self.assertEqual(archive_batch(default_cutoff()), 0)
+        self.assertEqual(ArchivedOrder.objects.count(), 2)
+
+    def test_history_pages_through_live_then_archived_orders(self):
+        archive_batch(default_cutoff())
+        everything = [order.pk for order in order_history(self.user, 0, 10)]
+        self.assertEqual(len(everything), 4)
+        self.assertEqual(everything[:2], list(self.user.orders.order_by('-order_date').values_list('pk', flat=True)))
+        pages = [order.pk for offset in range(0, 4, 3) for order in order_history(self.user, offset, 3)]
+        self.assertEqual(pages, everything)
+
+    def test_archived_order_detail_still_opens(self):
+        archive_batch(default_cutoff())
+        self.client.force_login(self.user)
+        pk = ArchivedOrder.objects.first().pk
+        response = self.client.get(f'/order/{pk}/')
+        self.assertContains(response, 'Oak Chair')
@@ -0,0 +1,52 @@
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from furniture_app.assets import JS_BUNDLES, STATIC_DIR, minify_js
+
+from . import FurnitureTestCase
+
+
+class MinifyJsTests(SimpleTestCase):
+    def test_drops_comments_and_indentation_but_not_strings(self):
+        source = """
+            // Load the grid
+            const url = '/catalog/?a=1'; /* first page */
+            fetch(url + "//not-a-comment")
+                .then(r => r.text());
+        """
+        self.assertEqual(
+            minify_js(source),
+            "const url='/catalog/?a=1';\nfetch(url + \"//not-a-comment\")\n.then(r=>r.text());",
+        )
+
+    def test_template_literals_are_kept_whole(self):
+        source = 'el.textContent = `${d}d  ${String(h).padStart(2, \'0\')}h`;'
+        self.assertEqual(minify_js(source), 'el.textContent=`${d}d  ${String(h).padStart(2, \'0\')}h`;')
+
+    def test_sources_have_no_regex_literals(self):
+        # minify_js cannot tell a regex literal from division or a comment.
+        for source in {source for sources in JS_BUNDLES.values() for source in sources}:
+            minified = minify_js((STATIC_DIR / source).read_text())
+            self.assertNotIn('/*', minified, source)
+            self.assertNotRegex(minified, r'(^|[=(,:])\s*/[^/*]', source)
+
+
+class BundleTagTests(SimpleTestCase):
+    template = Template("{% load assets %}{% bundle_js 'cart' %}")
+
+    def test_development_links_the_sources(self):
+        html = self.template.render(Context())
+        self.assertEqual(html, '<script src="/static/site.js"></script>\n    <script src="/static/cart.js"></script>')
+
+    @override_settings(ASSET_BUNDLES=True, STORAGES={'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})
+    def test_bundles_link_one_file(self):
+        self.assertEqual(self.template.render(Context()), '<script src="/static/bundles/cart.js"></script>')
+
+
+class PageScriptTests(FurnitureTestCase):
+    def test_pages_have_no_inline_scripts(self):
+        for url in ('/', '/login/', '/signup/', '/cart/'):
+            html = self.client.get(url).content.decode()
+            self.assertNotIn('<script>', html, url)
+            self.assertIn('<script src="/static/site.js"></script>', html, url)
@@ -0,0 +1,78 @@
+import asyncio
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import resolve
+
+from furniture_app.cart import add_item
+from furniture_app.models import Cart, CartItem, Order, Product
+
+from . import FurnitureTestCase
+
+AJAX = {'x-requested-with': 'XMLHttpRequest'}
+
+
+@override_settings(ROOT_URLCONF='furniture_app.tests.async_urls')
+class AsyncViewTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('buyer', password='pw')
+        self.product = Product.objects.create(name='Oak Chair', price=40)
+
+    def test_json_endpoints_resolve_to_async_views(self):
+        for url in ('/add_to_cart/1/', '/remove_from_cart/1/', '/cart/update_quantity/1/', '/order/1/update_status/', '/order/1/delete/'):
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+
+    async def test_add_update_and_remove(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(f'/add_to_cart/{self.product.pk}/', {'quantity': 3})
+        self.assertEqual(response.json(), {'success': True, 'message': 'Oak Chair added to cart!', 'cart_item_count': 3})
+
+        item = await CartItem.objects.aget()
+        stale = await self.async_client.post(
+            f'/cart/update_quantity/{item.pk}/', {'quantity': 1, 'version': item.version + 1}, content_type='application/json',
+        )
+        self.assertEqual(stale.status_code, 409)
+        updated = await self.async_client.post(
+            f'/cart/update_quantity/{item.pk}/', {'quantity': 5, 'version': item.version}, content_type='application/json',
+        )
+        self.assertEqual((updated.json()['new_quantity'], updated.json()['cart_total_price']), (5, 200.0))
+
+        removed = await self.async_client.post(f'/remove_from_cart/{item.pk}/')
+        self.assertEqual((removed.json()['cart_item_count'], removed.json()['cart_total_price']), (0, 0.0))
+        self.assertEqual((await self.async_client.post(f'/remove_from_cart/{item.pk}/')).status_code, 404)
+
+    async def test_concurrent_adds_all_count(self):
+        await self.async_client.aforce_login(self.user)
+        await asyncio.gather(*[
+            self.async_client.post(f'/add_to_cart/{self.product.pk}/', {'quantity': 1}) for _ in range(10)
+        ])
+        cart = await Cart.objects.aget(user=self.user)
+        self.assertEqual(cart.item_count, 10)
+        self.assertEqual((await CartItem.objects.aget()).quantity, 10)
+
+    async def test_order_status_and_delete(self):
+        order = await Order.objects.acreate(user=self.user, total_price=40, payment_method='COD')
+        await self.async_client.aforce_login(self.user)
+        url = f'/order/{order.pk}/'
+
+        refused = await self.async_client.post(url + 'delete/')
+        self.assertEqual(refused.status_code, 400)
+        cancelled = await self.async_client.post(url + 'update_status/', {'status': 'CANCELLED'}, headers=AJAX)
+        self.assertEqual(cancelled.json()['new_status_value'], 'CANCELLED')
+        again = await self.async_client.post(url + 'update_status/', {'status': 'PENDING'}, headers=AJAX)
+        self.assertEqual(again.status_code, 400)
+        deleted = await self.async_client.post(url + 'delete/')
+        self.assertTrue(deleted.json()['success'])
+        self.assertFalse(await Order.objects.filter(pk=order.pk).aexists())
+
+    async def test_other_users_lines_are_refused(self):
+        other_cart = await Cart.objects.acreate()
+        await sync_to_async(add_item)(other_cart, self.product, 1, self.product.price)
+        item = await CartItem.objects.aget()
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(
+            f'/cart/update_quantity/{item.pk}/', {'quantity': 9}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+
+from furniture_app.caching import cache_stats, get_or_compute
+
+from . import FurnitureTestCase, MultiProcessTestCase
+
+
+class SharedCacheTests(MultiProcessTestCase):
+    """Several processes on the default file backend."""
+
+    def test_cached_page_is_shared_and_invalidated_across_processes(self):
+        first = self.run_script('cache_worker', 'page', '/')
+        self.assertEqual(first['status'], 200)
+        self.assertGreater(first['queries'], 0)
+
+        # A different process is served the page the first one rendered.
+        second = self.run_script('cache_worker', 'page', '/')
+        self.assertEqual(second['queries'], 0)
+        self.assertEqual(second['html'], first['html'])
+
+        # Saving a product in a third process invalidates it for everyone.
+        self.run_script('cache_worker', 'add-product', 'Walnut Sideboard')
+        third = self.run_script('cache_worker', 'page', '/')
+        self.assertGreater(third['queries'], 0)
+        self.assertIn('Walnut Sideboard', third['html'])
+
+    def test_catalog_version_bump_is_seen_by_other_processes(self):
+        before = self.run_script('cache_worker', 'version')
+        self.run_script('cache_worker', 'bump')
+        self.assertEqual(self.run_script('cache_worker', 'version'), before + 1)
+
+    def test_namespaces_do_not_collide(self):
+        self.run_script('cache_worker', 'set', 'cart', 'shared-key', 'cart value')
+        self.run_script('cache_worker', 'set', 'product', 'shared-key', 'product value')
+        self.assertEqual(self.run_script('cache_worker', 'get', 'cart', 'shared-key'), 'cart value')
+        self.assertEqual(self.run_script('cache_worker', 'get', 'product', 'shared-key'), 'product value')
+        self.assertIsNone(self.run_script('cache_worker', 'get', 'catalog', 'shared-key'))
+
+
+class StampedeTests(MultiProcessTestCase):
+    """The database backend, whose add() gives a real cross-process lock."""
+    cache_backend = 'db'
+
+    def test_one_process_recomputes_while_the_others_wait(self):
+        processes = [self.start('cache_worker', 'compute', 'slow-key', 0.5) for _ in range(6)]
+        results = [self.result(process) for process in processes]
+        # Every process got the value computed by a single one of them.
+        self.assertEqual(len(set(results)), 1)
+        self.assertIn(results[0], [process.pid for process in processes])
+
+
+class CacheStatsTests(FurnitureTestCase):
+    def test_counters_are_off_by_default(self):
+        get_or_compute('key', lambda: 1)
+        get_or_compute('key', lambda: 1)
+        self.assertEqual(cache_stats()['default']['hits'], 0)
+
+    @override_settings(CACHE_STATS=True)
+    def test_counters_when_enabled(self):
+        compute = mock.Mock(return_value=1)
+        get_or_compute('key', compute)
+        get_or_compute('key', compute)
+        compute.assert_called_once()
+        stats = cache_stats()['default']
+        self.assertEqual((stats['hits'], stats['misses'], stats['recomputes']), (1, 1, 1))
+        self.assertIsNone(caches['catalog'].get('key'))
@@ -0,0 +1,75 @@
+import math
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from furniture_app.cart import merge_carts, reconcile_cart_totals
+from furniture_app.models import Cart, CartItem, Product
+
+from . import FurnitureTestCase
+
+
+class MergeCartsTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('buyer', password='pw')
+        self.products = Product.objects.bulk_create([Product(name=f'p{i}', price=10) for i in range(300)])
+
+    def make_carts(self, anonymous_lines, shared=0):
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.bulk_create([CartItem(cart=cart, product=p, quantity=1, price=10) for p in self.products[:shared]])
+        anon = Cart.objects.create()
+        CartItem.objects.bulk_create([
+            CartItem(cart=anon, product=p, quantity=2, price=9)
+            for p in self.products[:anonymous_lines]
+        ])
+        reconcile_cart_totals()
+        return anon, cart
+
+    def queries_to_merge(self, lines):
+        anon, cart = self.make_carts(lines)
+        with CaptureQueriesContext(connection) as context:
+            merge_carts(anon.id, cart)
+        Cart.objects.all().delete()
+        return len(context)
+
+    def test_merge_adds_quantities_and_keeps_prices(self):
+        anon, cart = self.make_carts(anonymous_lines=150, shared=100)
+        self.assertTrue(merge_carts(anon.id, cart))
+
+        self.assertFalse(Cart.objects.filter(pk=anon.pk).exists())
+        self.assertEqual(cart.items.count(), 150)
+        shared = cart.items.get(product=self.products[0])
+        self.assertEqual((shared.quantity, shared.price), (3, 10))
+        moved = cart.items.get(product=self.products[120])
+        self.assertEqual((moved.quantity, moved.price), (2, 9))
+        cart.refresh_from_db()
+        self.assertEqual(cart.item_count, 100 + 300)
+
+    def test_200_line_merge_query_count(self):
+        small = self.queries_to_merge(5)
+        anon, cart = self.make_carts(anonymous_lines=200)
+        fields = [f for f in CartItem._meta.concrete_fields if not f.primary_key]
+        batch_size = connection.ops.bulk_batch_size(fields, list(anon.items.all()))
+        # Only the upsert grows, by one INSERT per extra parameter-limit batch.
+        with self.assertNumQueries(small + math.ceil(200 / batch_size) - 1):
+            merge_carts(anon.id, cart)
+        self.assertEqual(cart.items.count(), 200)
+
+    def test_missing_or_claimed_anonymous_cart_is_not_merged(self):
+        anon, cart = self.make_carts(anonymous_lines=3)
+        anon.user = User.objects.create_user('other')
+        anon.save()
+        self.assertFalse(merge_carts(anon.id, cart))
+        self.assertFalse(merge_carts(999999, cart))
+        self.assertEqual(cart.items.count(), 0)
+
+    def test_login_merges_the_session_cart(self):
+        anon, cart = self.make_carts(anonymous_lines=4)
+        session = self.client.session
+        session['cart_id'] = anon.id
+        session.save()
+        self.client.login(username='buyer', password='pw')
+        self.client.get('/cart/')
+        self.assertEqual(cart.items.count(), 4)
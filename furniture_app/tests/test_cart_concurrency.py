@@ -0,0 +1,58 @@
+from django.contrib.auth.models import User
+
+from furniture_app.cart import add_item, set_item_quantity
+from furniture_app.models import Cart, CartItem, Product
+
+from . import FurnitureTestCase, MultiProcessTestCase
+
+
+class ConcurrentAddItemTests(MultiProcessTestCase):
+    def test_every_concurrent_add_counts(self):
+        ids = self.run_script('cart_worker', 'setup')
+        cart, (first, second) = ids['cart'], ids['products']
+        # Three processes of four threads race on one line (including its
+        # creation); a fourth adds to another line of the same cart.
+        processes = [self.start('cart_worker', 'add', cart, first, 4, 25) for _ in range(3)]
+        processes.append(self.start('cart_worker', 'add', cart, second, 4, 25))
+        for process in processes:
+            self.assertEqual(self.result(process)['errors'], [])
+
+        state = self.run_script('cart_worker', 'state', cart)
+        self.assertEqual(state['quantities'], {str(first): 300, str(second): 100})
+        self.assertEqual(state['item_count'], 400)
+        self.assertEqual(state['total_price'], state['line_total'])
+
+
+class ItemVersionTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cart = Cart.objects.create()
+        self.product = Product.objects.create(name='Oak Chair', price=40)
+        add_item(self.cart, self.product, 2, self.product.price)
+        self.item = CartItem.objects.get()
+
+    def test_stale_version_is_rejected_with_current_state(self):
+        add_item(self.cart, self.product, 1, self.product.price)
+        self.assertEqual(set_item_quantity(self.item, 5, expected_version=self.item.version), (False, 3, 1))
+        self.assertEqual(CartItem.objects.get().quantity, 3)
+
+    def test_unversioned_write_retries_past_a_concurrent_add(self):
+        add_item(self.cart, self.product, 1, self.product.price)
+        self.assertEqual(set_item_quantity(self.item, 5), (True, 5, 2))
+        self.cart.refresh_from_db()
+        self.assertEqual((self.cart.item_count, self.cart.total_price), (5, 200))
+
+    def test_update_quantity_view_reports_a_conflict(self):
+        user = User.objects.create_user('buyer', password='pw')
+        Cart.objects.filter(pk=self.cart.pk).update(user=user)
+        self.client.force_login(user)
+        add_item(self.cart, self.product, 1, self.product.price)
+        url = f'/cart/update_quantity/{self.item.pk}/'
+
+        stale = self.client.post(url, {'quantity': 5, 'version': 0}, content_type='application/json')
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual((stale.json()['current_quantity'], stale.json()['version']), (3, 1))
+
+        fresh = self.client.post(url, {'quantity': 5, 'version': 1}, content_type='application/json')
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual((fresh.json()['new_quantity'], fresh.json()['cart_item_count']), (5, 5))
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.db.migrations.loader import MigrationLoader
+from django.test import SimpleTestCase
+
+from furniture_app.models import Cart, CartItem, Order, Product
+from furniture_app.routers import CartsRouter
+
+from . import MultiProcessTestCase
+
+
+class CartsRouterTests(SimpleTestCase):
+    router = CartsRouter()
+
+    def test_cart_models_go_to_the_carts_database(self):
+        with mock.patch.dict(settings.DATABASES, carts={}):
+            self.check_routes('carts')
+
+    def test_no_carts_database_leaves_routing_alone(self):
+        with mock.patch.dict(settings.DATABASES, {'default': settings.DATABASES['default']}, clear=True):
+            self.check_routes(None)
+
+    def check_routes(self, cart_db):
+        for model in (Cart, CartItem, Session):
+            self.assertEqual(self.router.db_for_read(model), cart_db)
+            self.assertEqual(self.router.db_for_write(model), cart_db)
+        for model in (Product, Order, User):
+            self.assertIsNone(self.router.db_for_read(model))
+            self.assertIsNone(self.router.db_for_write(model))
+
+    def test_migrations_stay_on_the_database_being_migrated(self):
+        historical_cart = MigrationLoader(None, ignore_no_migrations=True).project_state().apps.get_model('furniture_app', 'Cart')
+        with mock.patch.dict(settings.DATABASES, carts={}):
+            self.assertIsNone(self.router.db_for_write(historical_cart))
+            self.assertEqual(self.router.db_for_write(Cart), 'carts')
+
+    def test_only_cart_tables_migrate_to_the_carts_database(self):
+        allow = self.router.allow_migrate
+        self.assertTrue(allow('carts', 'furniture_app', 'cart'))
+        self.assertTrue(allow('carts', 'furniture_app', 'cartitem'))
+        self.assertTrue(allow('carts', 'sessions', 'session'))
+        self.assertFalse(allow('carts', 'furniture_app', 'order'))
+        self.assertFalse(allow('carts', 'auth', 'user'))
+        self.assertIsNone(allow('default', 'furniture_app', 'cart'))
+
+    def test_relations_across_primary_and_carts_are_allowed(self):
+        cart, product = Cart(), Product()
+        cart._state.db, product._state.db = 'carts', 'default'
+        self.assertTrue(self.router.allow_relation(cart, product))
+        product._state.db = 'other'
+        self.assertIsNone(self.router.allow_relation(cart, product))
+
+
+
+class CartsDatabaseTests(MultiProcessTestCase):
+    """Carts, cart lines and sessions in their own file (DB_CARTS_PATH)."""
+    extra_env = {'DB_CARTS_PATH': '{tmp}/carts.sqlite3'}
+    migrate_databases = ('default', 'carts')
+
+    def test_shopping_visit(self):
+        visit = self.run_script('carts_worker', 'shop')
+        self.assertEqual(visit['cart_page'], 200)
+
+        # Everything cart-related is in the carts file; the anonymous cart
+        # was handed to the user at login.
+        self.assertEqual(visit['carts'], {'default': 0, 'carts': 1})
+        self.assertEqual(visit['lines'], {'default': 0, 'carts': 2})
+        self.assertEqual(visit['sessions']['default'], 0)
+        self.assertGreater(visit['sessions']['carts'], 0)
+
+        # Checkout writes the order to the primary, then clears the cart.
+        self.assertEqual(visit['order'], [302, [['Oak Chair', 2], ['Teak Table', 1]]])
+        self.assertEqual(visit['orders'], {'default': 1, 'carts': None})
+        self.assertEqual(visit['lines_after_checkout'], {'default': 0, 'carts': 0})
+
+        # Deleting a product or user on the primary cleans up the carts file.
+        self.assertEqual(visit['lines_after_product_delete'], {'default': 0, 'carts': 0})
+        self.assertEqual(visit['carts_after_user_delete'], {'default': 0, 'carts': 0})
@@ -0,0 +1,23 @@
+from furniture_app.catalog import filter_products
+from furniture_app.models import Product, ProductStats
+
+from . import FurnitureTestCase
+
+
+class TrendingSortTests(FurnitureTestCase):
+    def test_products_without_stats_rows_are_listed_last(self):
+        popular = Product.objects.create(name='Popular Sofa', price=100)
+        quiet = Product.objects.create(name='Quiet Stool', price=20)
+        ProductStats.objects.filter(product=popular).update(trending_score=5)
+        # bulk_create skips the signal that creates stats rows.
+        imported = Product.objects.bulk_create([Product(name=f'Imported {i}', price=10) for i in range(3)])
+        self.assertFalse(ProductStats.objects.filter(product__in=imported).exists())
+
+        ids = list(filter_products({'sort_by': 'trending'}).values_list('pk', flat=True))
+        self.assertEqual(ids, [popular.pk, quiet.pk] + sorted((p.pk for p in imported), reverse=True))
+
+    def test_trending_keeps_the_other_filters(self):
+        Product.objects.create(name='Office Chair', price=100, category='OFFICE')
+        Product.objects.bulk_create([Product(name='Office Desk', price=300, category='OFFICE'), Product(name='Bed', price=50)])
+        names = filter_products({'sort_by': 'trending', 'category': 'OFFICE', 'max_price': '200'}).values_list('name', flat=True)
+        self.assertEqual(list(names), ['Office Chair'])
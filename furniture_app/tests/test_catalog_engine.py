@@ -0,0 +1,65 @@
+import itertools
+import random
+
+from django.test import override_settings
+
+from furniture_app import catalog_engine
+from furniture_app.catalog import filter_products, get_products, parse_filters
+from furniture_app.catalog_engine import get_snapshot
+from furniture_app.models import Product
+
+from . import FurnitureTestCase
+
+CATEGORIES = [value for value, _ in Product.CATEGORY_CHOICES]
+MATERIALS = [value for value, _ in Product.MATERIAL_CHOICES]
+SORT_KEYS = {'price': 'price', '-price': 'price', 'name': 'name', '-created_at': 'created_at'}
+
+
+class CatalogEngineTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        # The snapshot outlives the test database; the catalog version in
+        # the freshly cleared cache may repeat an earlier test's.
+        catalog_engine._snapshot = None
+        self.addCleanup(setattr, catalog_engine, '_snapshot', None)
+        rnd = random.Random(7)
+        Product.objects.bulk_create([
+            Product(
+                name=f'Product {rnd.randrange(40)}', price=rnd.randint(1, 60) * 5,
+                category=rnd.choice(CATEGORIES), material=rnd.choice(MATERIALS),
+                requires_assembly=rnd.random() < 0.5, is_available=rnd.random() < 0.9,
+            )
+            for _ in range(300)
+        ])
+
+    def assertSameAsOrm(self, params):
+        ids = get_snapshot().query(**parse_filters(params))
+        expected = list(filter_products(params))
+        self.assertCountEqual(ids, [product.pk for product in expected], params)
+        # Ties may come back in either order; the sort key sequence must match.
+        key = SORT_KEYS[parse_filters(params)['sort_by']]
+        values = Product.objects.in_bulk(ids)
+        self.assertEqual([getattr(values[pk], key) for pk in ids], [getattr(p, key) for p in expected], params)
+
+    def test_matches_the_orm_for_every_filter_combination(self):
+        options = [
+            [{}, {'category': 'OFFICE'}],
+            [{}, {'material': 'WOOD'}],
+            [{}, {'min_price': '100'}, {'min_price': '100', 'max_price': '150'}, {'max_price': '2'}],
+            [{}, {'requires_assembly': 'true'}, {'requires_assembly': 'false'}],
+            [{'sort_by': sort_by} for sort_by in SORT_KEYS],
+        ]
+        for parts in itertools.product(*options):
+            self.assertSameAsOrm({key: value for part in parts for key, value in part.items()})
+
+    def test_snapshot_follows_catalog_changes(self):
+        before = get_snapshot()
+        self.assertIs(get_snapshot(), before)
+        product = Product.objects.create(name='New Desk', price=1, category='OFFICE')
+        self.assertIn(product.pk, get_snapshot().query(category='OFFICE'))
+        self.assertIsNot(get_snapshot(), before)
+
+    @override_settings(CATALOG_ENGINE=True)
+    def test_get_products_returns_products_in_order(self):
+        params = {'category': 'KITCHEN', 'sort_by': '-price'}
+        self.assertEqual(get_products(params), list(filter_products(params).order_by('-price', '-pk')))
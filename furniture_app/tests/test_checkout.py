@@ -0,0 +1,155 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from furniture_app.archive import archive_batch, default_cutoff
+from furniture_app.cart import add_item
+from furniture_app.models import Address, ArchivedOrderItem, Cart, Order, OrderItem, OrderSummary, Product
+
+from . import FurnitureTestCase, MultiProcessTestCase
+
+
+class CheckoutTestCase(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('buyer', password='pw')
+        self.address = Address.objects.create(
+            user=self.user, street_address='1 Main St', city='Pune', state='MH', zip_code='411001', country='India',
+        )
+        self.products = [
+            Product.objects.create(name=f'Chair {i}', price=10 + i, category='BEDROOM', image=f'product_images/chair{i}.jpg')
+            for i in range(20)
+        ]
+        self.cart = Cart.objects.create(user=self.user)
+        self.client.force_login(self.user)
+
+    def fill_cart(self, lines):
+        for product in self.products[:lines]:
+            add_item(self.cart, product, 2, product.price)
+
+    def place_order(self, **data):
+        return self.client.post('/checkout/', {'shipping_address': self.address.pk, **data})
+
+
+class OrderSnapshotTests(CheckoutTestCase):
+    def test_checkout_copies_product_details_onto_items(self):
+        self.fill_cart(3)
+        self.assertEqual(self.place_order().status_code, 302)
+        order = Order.objects.get()
+        self.assertEqual(
+            list(order.items.order_by('pk').values_list('product_name', 'product_image', 'product_category', 'quantity')),
+            [(p.name, p.image.name, 'BEDROOM', 2) for p in self.products[:3]],
+        )
+        self.assertEqual(OrderSummary.objects.get(user=self.user).items_purchased, 6)
+        self.assertFalse(self.cart.items.exists())
+
+    def test_checkout_queries_do_not_grow_with_lines(self):
+        counts = []
+        # The first order also creates the user's order summary.
+        for lines in (1, 3, 15):
+            self.fill_cart(lines)
+            with CaptureQueriesContext(connection) as queries:
+                self.place_order()
+            counts.append(len(queries))
+        self.assertEqual(counts[1], counts[2])
+
+    def test_order_pages_never_read_products(self):
+        self.fill_cart(5)
+        self.place_order()
+        order = Order.objects.get()
+        for url in (f'/order/{order.pk}/', '/profile/orders/'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse([q['sql'] for q in queries if 'furniture_app_product' in q['sql']], url)
+
+    def test_deleting_a_product_keeps_its_order_lines(self):
+        self.fill_cart(2)
+        self.place_order()
+        order = Order.objects.get()
+        self.products[0].delete()
+        self.assertEqual(order.items.count(), 2)
+        self.assertContains(self.client.get(f'/order/{order.pk}/'), 'Chair 0')
+
+    def test_backfill_fills_missing_snapshots(self):
+        self.fill_cart(3)
+        self.place_order()
+        OrderItem.objects.update(product_name='', product_image='', product_category='')
+        call_command('backfill_order_item_snapshots', '--batch-size', '2', stdout=StringIO())
+        self.assertEqual(
+            sorted(OrderItem.objects.values_list('product_name', flat=True)),
+            [p.name for p in self.products[:3]],
+        )
+
+    def test_backfill_handles_products_without_an_image(self):
+        self.fill_cart(2)
+        self.place_order()
+        order = Order.objects.get()
+        Order.objects.filter(pk=order.pk).update(status='DELIVERED', order_date=timezone.now() - timedelta(days=400))
+        self.fill_cart(2)
+        self.place_order()
+        archive_batch(default_cutoff())
+        Product.objects.update(image=None)
+        for model in (OrderItem, ArchivedOrderItem):
+            model.objects.update(product_name='', product_image='', product_category='')
+
+        call_command('backfill_order_item_snapshots', stdout=StringIO())
+        for model in (OrderItem, ArchivedOrderItem):
+            self.assertEqual(
+                sorted(model.objects.values_list('product_name', 'product_image', 'product_category')),
+                [(p.name, '', 'BEDROOM') for p in self.products[:2]],
+            )
+
+
+class CheckoutKeyTests(CheckoutTestCase):
+    def test_resubmitting_a_key_shows_the_same_order(self):
+        self.fill_cart(2)
+        first = self.place_order(checkout_key='key-1')
+        again = self.place_order(checkout_key='key-1')
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(again['Location'], first['Location'])
+        self.assertEqual(first['Location'], f'/order/{Order.objects.get().pk}/')
+
+    def test_a_new_key_places_a_new_order(self):
+        self.fill_cart(1)
+        self.place_order(checkout_key='key-1')
+        self.fill_cart(1)
+        self.place_order(checkout_key='key-2')
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_new_key_with_an_empty_cart_places_nothing(self):
+        self.fill_cart(1)
+        self.place_order(checkout_key='key-1')
+        response = self.place_order(checkout_key='key-2')
+        self.assertEqual(response['Location'], '/cart/')
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_checkout_page_hands_out_a_fresh_key(self):
+        self.fill_cart(1)
+        keys = {self.client.get('/checkout/').context['checkout_key'] for _ in range(2)}
+        self.assertEqual(len(keys), 2)
+
+
+class ConcurrentCheckoutTests(MultiProcessTestCase):
+    def test_simultaneous_submits_place_one_order(self):
+        ids = self.run_script('checkout_worker', 'setup')
+        start_at = time.time() + 3
+        processes = [
+            self.start('checkout_worker', 'place', ids['user'], ids['address'], 'same-key', 4, start_at)
+            for _ in range(3)
+        ]
+        results = [result for process in processes for result in self.result(process)]
+
+        state = self.run_script('checkout_worker', 'state', ids['user'])
+        self.assertEqual(len(state['orders']), 1)
+        # Every submit, winner or not, lands on that order's page.
+        self.assertEqual(results, [[302, f"/order/{state['orders'][0]}/"]] * 12)
+        self.assertEqual(state['items'], [2])
+        self.assertEqual(state['cart_item_count'], 0)
+        self.assertEqual(state['summary'], [1, 2])
@@ -0,0 +1,58 @@
+import gzip
+import zlib
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.utils.cache import patch_vary_headers
+
+from furniture_app import compression
+from furniture_app.compression import CompressionMiddleware
+
+PAGE = ('<p>Oak chair, walnut table, teak bench.</p>\n' * 200).encode()
+
+
+def filename_length(body):
+    assert body[3] & gzip.FNAME
+    return body.index(b'\x00', 10) - 10
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def respond(self, response, accept_encoding='gzip, br'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip_body_is_padded_with_a_random_filename(self):
+        bodies = [self.respond(HttpResponse(PAGE)).content for _ in range(20)]
+        for body in bodies:
+            self.assertEqual(gzip.decompress(body), PAGE)
+        self.assertGreater(len({filename_length(body) for body in bodies}), 1)
+        self.assertTrue(all(filename_length(body) < compression.GZIP_RANDOM_BYTES for body in bodies))
+
+    def test_streamed_gzip_is_padded_and_decodes_chunk_by_chunk(self):
+        chunks = [PAGE[:4000], PAGE[4000:]]
+        response = self.respond(StreamingHttpResponse(iter(chunks)))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        parts = list(response.streaming_content)
+
+        # The first chunk is readable on its own, before the rest arrives.
+        self.assertEqual(zlib.decompressobj(31).decompress(parts[0]), chunks[0])
+        body = b''.join(parts)
+        self.assertLess(filename_length(body), compression.GZIP_RANDOM_BYTES)
+        self.assertEqual(gzip.decompress(body), PAGE)
+
+    def test_refused_and_small_responses_are_left_alone(self):
+        self.assertFalse(self.respond(HttpResponse(PAGE), 'gzip;q=0').has_header('Content-Encoding'))
+        self.assertFalse(self.respond(HttpResponse(b'tiny')).has_header('Content-Encoding'))
+
+    @mock.patch.object(compression, 'brotli')
+    def test_brotli_only_for_responses_shared_by_every_visitor(self, brotli):
+        brotli.compress.return_value = b'brotli'
+        shared = self.respond(HttpResponse(PAGE))
+        self.assertEqual((shared['Content-Encoding'], shared.content), ('br', b'brotli'))
+
+        per_visitor = HttpResponse(PAGE)
+        patch_vary_headers(per_visitor, ('Cookie',))
+        per_visitor = self.respond(per_visitor)
+        self.assertEqual(per_visitor['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(per_visitor.content), PAGE)
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.test import RequestFactory, override_settings
+
+from furniture_app.caching import page_cache_key
+from furniture_app.models import Cart, Product
+
+from . import FurnitureTestCase
+
+
+class AnonymousPageCacheTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = Product.objects.create(name='Oak Chair', price=100, category='OFFICE')
+
+    def test_repeat_visit_is_served_without_queries(self):
+        first = self.client.get('/', {'category': 'OFFICE', 'utm_source': 'mail'})
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            second = self.client.get('/', {'utm_source': 'ad', 'category': 'OFFICE'})
+        self.assertEqual(second.content, first.content)
+
+    def test_every_value_of_a_repeated_param_is_in_the_key(self):
+        request = RequestFactory().get('/?category=OFFICE&category=BEDROOM&utm_source=ad')
+        keys = {
+            page_cache_key(RequestFactory().get(f'/?{query}'), 'index')
+            for query in ('category=OFFICE&category=BEDROOM', 'category=BEDROOM&category=OFFICE',
+                          'category=BEDROOM', 'category=BEDROOM&category=', 'category=OFFICE%26category%3DBEDROOM')
+        }
+        self.assertEqual(len(keys), 5)
+        self.assertIn(page_cache_key(request, 'index'), keys)
+
+    def test_cached_page_has_no_per_visitor_content(self):
+        response = self.client.get(f'/product/{self.product.pk}/')
+        self.assertContains(response, 'data-cart-summary-url')
+        self.assertNotContains(response, 'name="csrfmiddlewaretoken"')
+        self.assertEqual(Cart.objects.count(), 0)
+
+    def test_product_change_invalidates_cached_pages(self):
+        self.client.get('/')
+        Product.objects.create(name='Walnut Table', price=50)
+        self.assertContains(self.client.get('/'), 'Walnut Table')
+
+    def test_logged_in_pages_are_not_cached(self):
+        User.objects.create_user('buyer', password='pw')
+        self.client.login(username='buyer', password='pw')
+        response = self.client.get('/')
+        self.assertNotContains(response, 'data-cart-summary-url')
+        self.assertContains(response, 'name="csrfmiddlewaretoken"')
+
+    @override_settings(ANONYMOUS_PAGE_CACHE=False)
+    def test_cache_can_be_turned_off(self):
+        self.client.get('/')
+        # Without a signal to bump the catalog version, only a fresh render shows this.
+        Product.objects.filter(pk=self.product.pk).update(name='Renamed Chair')
+        self.assertContains(self.client.get('/'), 'Renamed Chair')
+
+    def test_cart_summary_fills_in_the_badge(self):
+        response = self.client.get('/cart/summary/')
+        self.assertEqual(response.json()['cart_item_count'], 0)
+        self.assertIn('csrftoken', response.cookies)
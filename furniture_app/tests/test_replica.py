@@ -0,0 +1,82 @@
+import time
+from contextvars import copy_context
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import caches
+from django.test import override_settings
+
+from furniture_app import routers
+from furniture_app.models import Order, Product
+from furniture_app.routers import REPLICA_SYNCED_AT_KEY, ReplicaRouter
+
+from . import FurnitureTestCase, MultiProcessTestCase
+
+
+class ReplicaRouterTests(FurnitureTestCase):
+    router = ReplicaRouter()
+
+    def setUp(self):
+        super().setUp()
+        routers._freshness['checked_at'] = 0.0
+        self.addCleanup(routers._freshness.update, checked_at=0.0)
+
+    def read_db(self, *steps):
+        """The database a product read goes to after ``steps``, in a fresh request context."""
+        def run():
+            routers._pinned.set(False)
+            for step in steps:
+                step()
+            return self.router.db_for_read(Product)
+        return copy_context().run(run)
+
+    def with_replica(self, synced_seconds_ago=0):
+        caches['default'].set(REPLICA_SYNCED_AT_KEY, time.time() - synced_seconds_ago, None)
+        return mock.patch.dict(settings.DATABASES, replica={})
+
+    def test_without_a_replica_reads_stay_on_the_primary(self):
+        caches['default'].set(REPLICA_SYNCED_AT_KEY, time.time(), None)
+        self.assertEqual(self.read_db(), 'default')
+
+    def test_catalog_reads_go_to_a_fresh_replica(self):
+        with self.with_replica():
+            self.assertEqual(self.read_db(), 'replica')
+            self.assertIsNone(self.router.db_for_read(Order))
+
+    def test_stale_replica_falls_back_to_the_primary(self):
+        with self.with_replica(synced_seconds_ago=settings.REPLICA_MAX_LAG + 1):
+            self.assertEqual(self.read_db(), 'default')
+
+    def test_a_write_pins_reads_but_asking_for_a_write_db_does_not(self):
+        with self.with_replica():
+            self.assertEqual(self.read_db(lambda: self.router.db_for_write(Product)), 'replica')
+            self.assertEqual(self.read_db(lambda: SessionStore().save()), 'replica')
+            self.assertEqual(self.read_db(lambda: Product.objects.create(name='Oak Chair', price=10)), 'default')
+            self.assertEqual(self.read_db(lambda: Product.objects.update(price=12)), 'default')
+            # The pin ends with the request.
+            self.assertEqual(self.read_db(), 'replica')
+
+    def test_database_cache_writes_do_not_pin(self):
+        def write(sql):
+            return lambda: routers.pin_on_write(lambda *args: None, sql, [], False, {})
+        database_cache = {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'furniture_cache'}
+        with self.with_replica(), override_settings(CACHES={**settings.CACHES, 'pages': database_cache}):
+            self.assertEqual(self.read_db(write('INSERT INTO "furniture_cache" VALUES (%s)')), 'replica')
+            self.assertEqual(self.read_db(write('  update "furniture_app_product" SET price = 1')), 'default')
+
+
+class ReplicaRoutingTests(MultiProcessTestCase):
+    """A second SQLite file as the replica, refreshed by sync_replica."""
+    extra_env = {'DB_REPLICA_PATH': '{tmp}/replica.sqlite3'}
+
+    def test_reads_before_and_after_a_write(self):
+        result = self.run_script('replica_worker', 'routing')
+        self.assertEqual(result['fresh'], ['replica', 'Oak Chair'])
+        self.assertEqual(result['asked_for_write_db'], ['replica', 'Oak Chair'])
+        self.assertEqual(result['saved_session'], ['replica', 'Oak Chair'])
+        # The request that wrote reads its own write; the next one reads the
+        # replica again, which has not been synced since.
+        self.assertEqual(result['after_save'], ['default', 'Teak Chair'])
+        self.assertEqual(result['next_request'], ['replica', 'Oak Chair'])
+        self.assertEqual(result['stale'], ['default', 'Teak Chair'])
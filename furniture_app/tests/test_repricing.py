@@ -0,0 +1,47 @@
+from django.test import override_settings
+
+from furniture_app.cart import add_item
+from furniture_app.models import Cart, CartItem, Product
+from furniture_app.repricing import reprice_product
+
+from . import FurnitureTestCase, MultiProcessTestCase
+
+
+@override_settings(CART_REPRICING_BACKGROUND=False)
+class RepriceTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = Product.objects.create(name='Oak Chair', price=100)
+        self.carts = [Cart.objects.create() for _ in range(5)]
+        for cart in self.carts:
+            add_item(cart, self.product, 2, self.product.price)
+
+    def test_price_change_moves_every_cart_line(self):
+        self.product.on_sale = True
+        self.product.discount_percentage = 25
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+        self.assertEqual(set(CartItem.objects.values_list('price', flat=True)), {75})
+        for cart in Cart.objects.all():
+            self.assertEqual((cart.total_price, cart.price_changed), (150, True))
+
+    def test_runs_in_chunks_and_repeats_safely(self):
+        Product.objects.filter(pk=self.product.pk).update(price=90)
+        self.assertEqual(reprice_product(self.product.pk, chunk_size=2), 5)
+        self.assertEqual(reprice_product(self.product.pk, chunk_size=2), 0)
+
+    def test_unrelated_saves_do_not_touch_carts(self):
+        self.product.name = 'Oak Armchair'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+        self.assertFalse(Cart.objects.filter(price_changed=True).exists())
+
+
+class ReplicaRepriceTests(MultiProcessTestCase):
+    extra_env = {'DB_REPLICA_PATH': '{tmp}/replica.sqlite3'}
+
+    def test_background_reprice_reads_the_new_price_from_the_primary(self):
+        result = self.run_script('replica_worker', 'reprice', 5)
+        # The replica still has the old price; the carts must not.
+        self.assertEqual(result['replica_price'], '100.00')
+        self.assertEqual((result['line_price'], result['cart_total']), ('80.00', '160.00'))
@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from myfurniture_app.static_serving import StaticFilesMiddleware
+
+
+class PickEncodingTests(SimpleTestCase):
+    def setUp(self):
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        for name in ('app.css', 'app.css.gz', 'app.css.br', 'plain.css', 'gzip-only.css', 'gzip-only.css.gz'):
+            (root / name).write_text(name)
+        self.middleware = StaticFilesMiddleware(None, root)
+        self.root = self.middleware.root
+
+    def pick(self, name, accept_encoding):
+        environ = {'HTTP_ACCEPT_ENCODING': accept_encoding} if accept_encoding is not None else {}
+        encoding, path = self.middleware.pick_encoding(environ, f'{self.root}/{name}')
+        return encoding, Path(path).name
+
+    def test_prefers_brotli_then_gzip(self):
+        self.assertEqual(self.pick('app.css', 'gzip, deflate, br'), ('br', 'app.css.br'))
+        self.assertEqual(self.pick('app.css', 'gzip'), ('gzip', 'app.css.gz'))
+        self.assertEqual(self.pick('app.css', '*'), ('br', 'app.css.br'))
+
+    def test_q_zero_refuses_a_coding(self):
+        self.assertEqual(self.pick('app.css', 'br;q=0, gzip'), ('gzip', 'app.css.gz'))
+        self.assertEqual(self.pick('app.css', 'gzip;q=0, br;q=0'), (None, 'app.css'))
+        self.assertEqual(self.pick('app.css', '*;q=0'), (None, 'app.css'))
+
+    def test_no_substring_matches(self):
+        self.assertEqual(self.pick('app.css', 'x-gzip-custom'), (None, 'app.css'))
+        self.assertEqual(self.pick('app.css', 'identity'), (None, 'app.css'))
+        self.assertEqual(self.pick('app.css', None), (None, 'app.css'))
+
+    def test_only_existing_copies_are_offered(self):
+        self.assertEqual(self.pick('gzip-only.css', 'br, gzip'), ('gzip', 'gzip-only.css.gz'))
+        self.assertEqual(self.pick('gzip-only.css', 'br'), (None, 'gzip-only.css'))
+        self.assertEqual(self.pick('plain.css', 'br, gzip'), (None, 'plain.css'))
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.test import RequestFactory, override_settings
+
+from furniture_app.throttle import client_ip
+
+from . import FurnitureTestCase
+
+RATES = {'login_ip': '3/m', 'login_username': '100/m', 'signup_ip': '5/m'}
+
+
+def request_from(remote_addr, forwarded_for=None):
+    extra = {'HTTP_X_FORWARDED_FOR': forwarded_for} if forwarded_for is not None else {}
+    return RequestFactory().get('/', REMOTE_ADDR=remote_addr, **extra)
+
+
+class ClientIpTests(FurnitureTestCase):
+    def test_direct_connections_ignore_forwarded_for(self):
+        self.assertEqual(client_ip(request_from('203.0.113.5', '198.51.100.1')), '203.0.113.5')
+
+    @override_settings(NUM_PROXIES=1)
+    def test_one_proxy_uses_the_address_it_appended(self):
+        self.assertEqual(client_ip(request_from('127.0.0.1', '203.0.113.5')), '203.0.113.5')
+        # A client-supplied entry sits further left and is skipped.
+        self.assertEqual(client_ip(request_from('127.0.0.1', '1.2.3.4, 203.0.113.5')), '203.0.113.5')
+
+    @override_settings(NUM_PROXIES=2)
+    def test_two_proxies(self):
+        self.assertEqual(client_ip(request_from('127.0.0.1', 'spoofed, 203.0.113.5, 10.0.0.2')), '203.0.113.5')
+        # Too few entries: the chain is not the expected one.
+        self.assertEqual(client_ip(request_from('127.0.0.1', '203.0.113.5')), '127.0.0.1')
+
+    @override_settings(NUM_PROXIES=1)
+    def test_missing_header_falls_back_to_remote_addr(self):
+        self.assertEqual(client_ip(request_from('127.0.0.1')), '127.0.0.1')
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES, NUM_PROXIES=1)
+class LoginThrottleTests(FurnitureTestCase):
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user('buyer', password='correct horse')
+
+    def attempt(self, forwarded_for, password='wrong'):
+        return self.client.post(
+            '/login/', {'username': 'buyer', 'password': password},
+            REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR=forwarded_for,
+        )
+
+    def test_clients_behind_the_proxy_have_their_own_limits(self):
+        codes = [self.attempt('203.0.113.5').status_code for _ in range(4)]
+        self.assertEqual(codes, [200, 200, 200, 429])
+        self.assertTrue(self.attempt('203.0.113.5')['Retry-After'])
+        self.assertEqual(self.attempt('198.51.100.7').status_code, 200)
+
+    def test_spoofed_entries_do_not_reset_the_limit(self):
+        codes = [self.attempt(f'10.9.9.{i}, 203.0.113.5').status_code for i in range(4)]
+        self.assertEqual(codes[-1], 429)
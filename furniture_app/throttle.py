@@ -0,0 +1,78 @@
+"""
+Token-bucket throttling for the login and signup forms.
+
+Buckets live in the shared default cache, so every worker sees the same
+counts. Each bucket is stored as a single "theoretical arrival time" (GCRA):
+an attempt is let through if it does not push that time more than a full
+bucket ahead of now. The read and write are not atomic, so a burst across
+workers can slip a few extra attempts through; it never blocks legitimate
+users by mistake.
+
+Checks run before the form is validated, so rejected attempts never reach
+the password hasher.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULT_RATES = {
+    'login_ip': '30/m',
+    'login_username': '10/m',
+    'signup_ip': '5/m',
+}
+PERIODS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def parse_rate(rate):
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period[:1]]
+
+
+def client_ip(request):
+    """
+    The address a request came from. Behind NUM_PROXIES reverse proxies that
+    is the NUM_PROXIES-th X-Forwarded-For entry from the right (each proxy
+    appends the address it was reached from); anything further left was
+    sent by the client and cannot be trusted.
+    """
+    num_proxies = getattr(settings, 'NUM_PROXIES', 0)
+    if num_proxies:
+        forwarded = [addr.strip() for addr in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if addr.strip()]
+        if len(forwarded) >= num_proxies:
+            return forwarded[-num_proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def consume(scope, key, rate):
+    """
+    Take one token from the ``scope`` bucket for ``key``. Returns 0 if the
+    attempt is allowed, otherwise the number of seconds until it would be.
+    """
+    count, period = parse_rate(rate)
+    interval = period / count
+    cache = caches['default']
+    cache_key = 'throttle:{}:{}'.format(scope, hashlib.sha256(key.encode()).hexdigest()[:32])
+
+    now = time.time()
+    arrival = max(cache.get(cache_key, now), now) + interval
+    if arrival - now > period:
+        return arrival - now - period
+    cache.set(cache_key, arrival, int(period) + 1)
+    return 0
+
+
+def check_auth_throttle(request, action, username=None):
+    """Seconds to wait before ``action`` ('login' or 'signup') is allowed again, or 0."""
+    rates = {**DEFAULT_RATES, **getattr(settings, 'AUTH_THROTTLE_RATES', {})}
+    checks = [(f'{action}_ip', client_ip(request))]
+    if username:
+        checks.append((f'{action}_username', username.strip().lower()))
+
+    wait = 0
+    for scope, key in checks:
+        if scope in rates and rates[scope]:
+            wait = max(wait, consume(scope, key, rates[scope]))
+    return wait
@@ -1,27 +1,42 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'furniture_app'
 
+# The cart and order JSON endpoints have async versions for ASGI deployments.
+if settings.ASYNC_VIEWS:
+    from . import async_views as json_views
+else:
+    json_views = views
+
 urlpatterns = [
     path('', views.index, name='index'),
+    path('catalog/products/', views.catalog_fragment, name='catalog_fragment'),
+    path('api/v1/products/', api.product_list, name='api_product_list'),
+    path('api/v1/products/<int:pk>/', api.product_detail, name='api_product_detail'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('signup/', views.signup_view, name='signup'),
     path('product/<int:pk>/', views.product_detail, name='product_detail'),
-    path('add_to_cart/<int:product_pk>/', views.add_to_cart, name='add_to_cart'),
+    path('add_to_cart/<int:product_pk>/', json_views.add_to_cart, name='add_to_cart'),
     path('cart/', views.view_cart, name='view_cart'),
-    path('remove_from_cart/<int:item_pk>/', views.remove_from_cart, name='remove_from_cart'),
-    path('cart/update_quantity/<int:item_pk>/', views.update_cart_item_quantity, name='update_cart_item_quantity'),
+    path('cart/summary/', views.cart_summary, name='cart_summary'),
+    path('remove_from_cart/<int:item_pk>/', json_views.remove_from_cart, name='remove_from_cart'),
+    path('cart/update_quantity/<int:item_pk>/', json_views.update_cart_item_quantity, name='update_cart_item_quantity'),
     path('profile/', views.user_profile, name='user_profile'),
+    path('profile/orders/', views.user_order_history, name='user_order_history'),
     path('checkout/', views.checkout, name='checkout'),
     path('place_order/', views.checkout, name='place_order'),
     path('order/<int:order_pk>/', views.order_detail, name='order_detail'),
     path('admin-dashboard/orders/', views.admin_orders_dashboard, name='admin_view_all_orders'),
-    path('order/<int:order_pk>/update_status/', views.update_order_status, name='update_order_status'),
+    path('admin-dashboard/orders/bulk_status/', views.bulk_update_order_status, name='bulk_update_order_status'),
+    path('admin-dashboard/profiles/', views.request_profiles, name='request_profiles'),
+    path('admin-dashboard/profiles/<str:profile_id>/', views.download_request_profile, name='download_request_profile'),
+    path('order/<int:order_pk>/update_status/', json_views.update_order_status, name='update_order_status'),
     path('address/edit/<int:pk>/', views.edit_address, name='edit_address'),
     path('profile/add_address/', views.add_address, name='add_address'),
     path('profile/set_default_address/<int:pk>/', views.set_default_address, name='set_default_address'),
     path('profile/delete_address/<int:pk>/', views.delete_address, name='delete_address'),
-    path('order/<int:order_pk>/delete/', views.delete_order, name='delete_order'),
+    path('order/<int:order_pk>/delete/', json_views.delete_order, name='delete_order'),
 ]
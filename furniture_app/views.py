@@ -1,142 +1,138 @@
 import json
+import math
+import secrets
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
-from django.db.models import Q, F, Sum
-from django.utils import timezone
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
+from django.template.loader import render_to_string
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.db import IntegrityError, transaction
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import login, logout
 from django.contrib.auth.forms import AuthenticationForm
 
-from .models import Product, SaleBanner, Cart, CartItem, Address, Order, OrderItem
+from .models import Product, Cart, CartItem, Address, Order, OrderItem, ArchivedOrder
 from .forms import AddressForm, UserProfileForm, CustomUserCreationForm
+from .caching import anonymous_page_cache
+from .cart import cart_for_session, add_item, set_item_quantity, remove_item, clear_cart, refresh_totals
+from .catalog import SORT_OPTIONS, get_products
+from .archive import delete_archived_order, find_order, order_history
+from .banners import get_active_banners
+from .order_summary import apply_summary_delta, get_order_summary
+from .order_states import bulk_transition, can_transition, transition_order
+from .product_stats import count_product_views, record_add_to_cart
+from .profiling import list_profiles, make_profile_token, profile_path
+from .routers import reporting_db
+from .streaming import stream_list_template
+from .throttle import check_auth_throttle
 
 
 def get_or_create_cart(request):
-    cart_id = request.session.get('cart_id')
-    cart = None
-    cart_item_count = 0
+    cart, notice = cart_for_session(request.user, request.session.get('cart_id'))
+    if notice:
+        messages.info(request, notice)
+    request.session['cart_id'] = cart.id
+    request.session['cart_item_count'] = cart.item_count
+    return cart, cart.item_count
+
 
+def get_cart_item_count(request):
+    # Read-only variant of get_or_create_cart for pages that only show the badge.
     if request.user.is_authenticated:
-        try:
-            cart = Cart.objects.get(user=request.user)
-            if cart_id and str(cart.id) != cart_id:
-                try:
-                    anon_cart = Cart.objects.get(id=cart_id, user__isnull=True)
-                    for item in anon_cart.items.all():
-                        cart_item, created = CartItem.objects.get_or_create(
-                            cart=cart,
-                            product=item.product,
-                            defaults={'quantity': item.quantity, 'price': item.price}
-                        )
-                        if not created:
-                            cart_item.quantity += item.quantity
-                            cart_item.save()
-                    anon_cart.delete()
-                    messages.info(request, "Your previous cart items have been merged with your account cart.")
-                except Cart.DoesNotExist:
-                    pass
-            request.session['cart_id'] = cart.id
-        except Cart.DoesNotExist:
-            if cart_id:
-                try:
-                    cart = Cart.objects.get(id=cart_id, user__isnull=True)
-                    cart.user = request.user
-                    cart.save()
-                    messages.info(request, "Your previous cart has been associated with your account.")
-                except Cart.DoesNotExist:
-                    cart = Cart.objects.create(user=request.user)
-            else:
-                cart = Cart.objects.create(user=request.user)
-            request.session['cart_id'] = cart.id
-    else:
-        if cart_id:
-            try:
-                cart = Cart.objects.get(id=cart_id, user__isnull=True)
-            except Cart.DoesNotExist:
-                cart = Cart.objects.create(user=None)
-                request.session['cart_id'] = cart.id
-        else:
-            cart = Cart.objects.create(user=None)
-            request.session['cart_id'] = cart.id
+        return get_or_create_cart(request)[1]
+    cart_id = request.session.get('cart_id')
+    if not cart_id:
+        return 0
+    return Cart.objects.filter(
+        id=cart_id, user__isnull=True
+    ).values_list('item_count', flat=True).first() or 0
+
 
-    cart_item_count = cart.items.aggregate(total_quantity=Sum('quantity'))['total_quantity'] or 0
-    request.session['cart_item_count'] = cart_item_count
-    return cart, cart_item_count
+@ensure_csrf_cookie
+def cart_summary(request):
+    return JsonResponse({
+        'cart_item_count': get_cart_item_count(request),
+        'messages': [
+            {'message': str(message), 'tags': message.tags}
+            for message in messages.get_messages(request)
+        ],
+    })
 
 
+@anonymous_page_cache('index')
 def index(request):
     product_categories = Product.CATEGORY_CHOICES
     product_materials = Product.MATERIAL_CHOICES
+    products = get_products(request.GET)
 
-    sort_options = [
-        {'value': '-created_at', 'label': 'Newest Arrivals'},
-        {'value': 'price', 'label': 'Price: Low to High'},
-        {'value': '-price', 'label': 'Price: High to Low'},
-        {'value': 'name', 'label': 'Name: A-Z'},
-    ]
-
-    products = Product.objects.filter(is_available=True)
-
-    category = request.GET.get('category')
-    if category:
-        products = products.filter(category=category)
-
-    material = request.GET.get('material')
-    if material:
-        products = products.filter(material=material)
-
-    min_price = request.GET.get('min_price')
-    if min_price:
-        try:
-            min_price = float(min_price)
-            products = products.filter(price__gte=min_price)
-        except ValueError:
-            pass
-
-    max_price = request.GET.get('max_price')
-    if max_price:
-        try:
-            max_price = float(max_price)
-            products = products.filter(price__lte=max_price)
-        except ValueError:
-            pass
-
-    requires_assembly = request.GET.get('requires_assembly')
-    if requires_assembly == 'true':
-        products = products.filter(requires_assembly=True)
-    elif requires_assembly == 'false':
-        products = products.filter(requires_assembly=False)
-
-    is_available_param = request.GET.get('is_available')
-    if is_available_param == 'true':
-        products = products.filter(is_available=True)
-
-    sort_by = request.GET.get('sort_by', '-created_at')
-    if sort_by in [opt['value'] for opt in sort_options]:
-        products = products.order_by(sort_by)
-    else:
-        products = products.order_by('-created_at')
-
-    active_sale_banners = SaleBanner.objects.filter(
-        is_active=True,
-        sale_end_date__gte=timezone.now()
-    ).order_by('-updated_at')
+    active_sale_banners = get_active_banners()
 
-    cart, cart_item_count = get_or_create_cart(request)
+    if request.cacheable_page:
+        cart_item_count = 0
+    else:
+        cart, cart_item_count = get_or_create_cart(request)
 
     context = {
         'product_categories': product_categories,
         'product_materials': product_materials,
-        'sort_options': sort_options,
+        'sort_options': SORT_OPTIONS,
         'products': products,
         'active_sale_banners': active_sale_banners,
         'cart_item_count': cart_item_count,
+        'cacheable_page': request.cacheable_page,
     }
     return render(request, 'index.html', context)
 
 
+@anonymous_page_cache('catalog_fragment')
+def catalog_fragment(request):
+    # Just the product grid, for filter changes on the index page.
+    products = get_products(request.GET)
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'products': [
+                {
+                    'id': product.pk,
+                    'name': product.name,
+                    'price': str(product.price),
+                    'sale_price': str(product.get_discounted_price()) if product.on_sale else None,
+                    'image': product.image.url if product.image else None,
+                }
+                for product in products
+            ]
+        })
+
+    return render(request, 'product_grid.html', {
+        'products': products,
+        'cacheable_page': request.cacheable_page,
+    })
+
+
+def requested_quantity(request):
+    # Validate quantity input
+    try:
+        quantity = int(request.POST.get('quantity', 1))
+    except (ValueError, TypeError):
+        return 1
+    return max(quantity, 1)
+
+
+def cart_price(product):
+    return product.get_discounted_price() if product.on_sale else product.price
+
+
+def added_to_cart(request, product, cart_item_count):
+    messages.success(request, f"{product.name} added to cart!")
+    return JsonResponse({
+        'success': True,
+        'message': f'{product.name} added to cart!',
+        'cart_item_count': cart_item_count
+    })
+
+
 def add_to_cart(request, product_pk):
     if not request.user.is_authenticated:
         messages.warning(request, "Please log in or create an account to add items to your cart.")
@@ -144,39 +140,19 @@ def add_to_cart(request, product_pk):
 
     if request.method == 'POST':
         product = get_object_or_404(Product, pk=product_pk)
-
-        # Validate quantity input
-        try:
-            quantity = int(request.POST.get('quantity', 1))
-            if quantity < 1:
-                quantity = 1
-        except (ValueError, TypeError):
-            quantity = 1
-
         cart, _ = get_or_create_cart(request)
-        price_to_store = product.get_discounted_price() if product.on_sale else product.price
 
-        cart_item, created = CartItem.objects.get_or_create(
-            cart=cart,
-            product=product,
-            defaults={'quantity': quantity, 'price': price_to_store}
-        )
-        if not created:
-            cart_item.quantity += quantity
-            cart_item.save()
+        add_item(cart, product, requested_quantity(request), cart_price(product))
+        record_add_to_cart(product.pk)
 
-        cart_item_count = cart.items.aggregate(total_quantity=Sum('quantity'))['total_quantity'] or 0
+        cart_item_count, _ = refresh_totals(cart)
         request.session['cart_item_count'] = cart_item_count
-        messages.success(request, f"{product.name} added to cart!")
-
-        return JsonResponse({
-            'success': True,
-            'message': f'{product.name} added to cart!',
-            'cart_item_count': cart_item_count
-        })
+        return added_to_cart(request, product, cart_item_count)
     return JsonResponse({'success': False, 'message': 'Invalid request.'})
 
 
+@count_product_views
+@anonymous_page_cache('product_detail')
 def product_detail(request, pk):
     product = get_object_or_404(Product, pk=pk)
     
@@ -185,96 +161,155 @@ def product_detail(request, pk):
         is_available=True
     ).exclude(pk=product.pk).order_by('?')[:4]
 
-    cart, cart_item_count = get_or_create_cart(request)
+    if request.cacheable_page:
+        cart_item_count = 0
+    else:
+        cart, cart_item_count = get_or_create_cart(request)
 
     context = {
         'product': product,
         'related_products': related_products,
         'cart_item_count': cart_item_count,
+        'cacheable_page': request.cacheable_page,
     }
     return render(request, 'product_detail.html', context)
 
 
 def view_cart(request):
     cart, cart_item_count = get_or_create_cart(request)
-    cart_items = cart.items.select_related('product').all()
+    # prefetch rather than join: carts may be in their own database.
+    cart_items = cart.items.prefetch_related('product')
+    price_changed = cart.price_changed
+    if price_changed:
+        Cart.objects.filter(pk=cart.pk).update(price_changed=False)
     context = {
         'cart': cart,
         'cart_items': cart_items,
         'cart_item_count': cart_item_count,
+        'price_changed': price_changed,
     }
     return render(request, 'cart.html', context)
 
 
+def removed_from_cart(request, cart_item_count, cart_total_price):
+    messages.info(request, "Item removed from cart.")
+    return JsonResponse({
+        'success': True,
+        'message': 'Item removed from cart.',
+        'cart_item_count': cart_item_count,
+        'cart_total_price': float(cart_total_price),
+    })
+
+
 def remove_from_cart(request, item_pk):
     if request.method == 'POST':
-        cart_item = get_object_or_404(CartItem, pk=item_pk)
-        cart_item.delete()
-        
-        cart, cart_item_count = get_or_create_cart(request)
-        cart_total_price = float(cart.get_total_price())
+        cart, _ = get_or_create_cart(request)
+        if not remove_item(cart, item_pk):
+            return JsonResponse({'success': False, 'message': 'Item not found in your cart.'}, status=404)
 
-        messages.info(request, "Item removed from cart.")
-        return JsonResponse({
-            'success': True,
-            'message': 'Item removed from cart.',
-            'cart_item_count': cart_item_count,
-            'cart_total_price': cart_total_price,
-        })
+        cart_item_count, cart_total_price = refresh_totals(cart)
+        request.session['cart_item_count'] = cart_item_count
+        return removed_from_cart(request, cart_item_count, cart_total_price)
     return JsonResponse({'success': False, 'message': 'Invalid request.'})
 
 
+def quantity_update(request, cart_item, cart):
+    """
+    The new quantity and expected version posted for ``cart_item``, or an
+    error response if the line is not in ``cart`` or the body is invalid.
+    """
+    def rejected(message, status):
+        return JsonResponse({'success': False, 'message': message, 'current_quantity': cart_item.quantity}, status=status)
+
+    if cart_item.cart_id != cart.id:
+        return rejected('Unauthorized action.', 403)
+
+    try:
+        data = json.loads(request.body)
+        new_quantity = int(data.get('quantity'))
+        expected_version = data.get('version')
+        if expected_version is not None:
+            expected_version = int(expected_version)
+    except (json.JSONDecodeError, ValueError, TypeError):
+        return rejected('Invalid quantity provided.', 400)
+
+    if new_quantity < 0:
+        return rejected('Quantity cannot be negative.', 400)
+    return new_quantity, expected_version
+
+
+def quantity_conflict(current_quantity, version):
+    # The line changed in another tab or request since the client read it.
+    return JsonResponse({
+        'success': False,
+        'message': 'Your cart was updated elsewhere. Quantity refreshed.',
+        'current_quantity': current_quantity,
+        'version': version,
+    }, status=409)
+
+
+def quantity_updated(cart_item, new_quantity, current_quantity, version, cart_item_count, cart_total_price):
+    item_total = 0.0
+    if new_quantity == 0:
+        message = f"{cart_item.product.name} removed from cart."
+    else:
+        item_total = float(current_quantity * cart_item.price)
+        message = f"Quantity for {cart_item.product.name} updated."
+
+    return JsonResponse({
+        'success': True,
+        'message': message,
+        'new_quantity': current_quantity,
+        'version': version,
+        'item_total': item_total,
+        'cart_item_count': cart_item_count,
+        'cart_total_price': float(cart_total_price),
+    })
+
+
 @login_required
 def update_cart_item_quantity(request, item_pk):
     if request.method == 'POST':
-        cart_item = get_object_or_404(CartItem, pk=item_pk)
+        cart_item = get_object_or_404(CartItem.objects.prefetch_related('product'), pk=item_pk)
         cart, _ = get_or_create_cart(request)
 
-        current_quantity_before_change = cart_item.quantity
+        update = quantity_update(request, cart_item, cart)
+        if isinstance(update, JsonResponse):
+            return update
+        new_quantity, expected_version = update
 
-        if cart_item.cart != cart:
-            return JsonResponse({'success': False, 'message': 'Unauthorized action.', 'current_quantity': current_quantity_before_change}, status=403)
+        applied, current_quantity, version = set_item_quantity(cart_item, new_quantity, expected_version)
+        if not applied:
+            return quantity_conflict(current_quantity, version)
 
-        try:
-            data = json.loads(request.body)
-            new_quantity = int(data.get('quantity'))
-        except (json.JSONDecodeError, ValueError, TypeError):
-            return JsonResponse({'success': False, 'message': 'Invalid quantity provided.', 'current_quantity': current_quantity_before_change}, status=400)
-
-        if new_quantity < 0:
-            return JsonResponse({'success': False, 'message': 'Quantity cannot be negative.', 'current_quantity': current_quantity_before_change}, status=400)
-
-        # Capture item_total BEFORE potential deletion
-        item_total = 0.0
-        if new_quantity == 0:
-            product_name = cart_item.product.name
-            cart_item.delete()
-            message = f"{product_name} removed from cart."
-        else:
-            cart_item.quantity = new_quantity
-            cart_item.save()
-            item_total = float(cart_item.get_total())
-            message = f"Quantity for {cart_item.product.name} updated."
-
-        cart_item_count = cart.items.aggregate(total_quantity=Sum('quantity'))['total_quantity'] or 0
-        cart_total_price = float(cart.get_total_price())
+        cart_item_count, cart_total_price = refresh_totals(cart)
         request.session['cart_item_count'] = cart_item_count
-
-        return JsonResponse({
-            'success': True,
-            'message': message,
-            'new_quantity': new_quantity,
-            'item_total': item_total,
-            'cart_item_count': cart_item_count,
-            'cart_total_price': cart_total_price,
-        })
+        return quantity_updated(cart_item, new_quantity, current_quantity, version, cart_item_count, cart_total_price)
     return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
 
 
+def placed_order_redirect(user, checkout_key):
+    # The order already placed with this key, if any: a double-click or retry.
+    order_pk = Order.objects.filter(user=user, checkout_key=checkout_key).values_list('pk', flat=True).first()
+    if order_pk is not None:
+        return redirect('furniture_app:order_detail', order_pk=order_pk)
+    return None
+
+
 @login_required
 def checkout(request):
+    checkout_key = request.POST.get('checkout_key', '')[:64] or None
+    if checkout_key:
+        replay = placed_order_redirect(request.user, checkout_key)
+        if replay is not None:
+            return replay
+
     cart, cart_item_count = get_or_create_cart(request)
-    if not cart.items.exists():
+    if not cart.item_count:
+        # The first submit may have emptied the cart since the check above.
+        replay = checkout_key and placed_order_redirect(request.user, checkout_key)
+        if replay:
+            return replay
         messages.warning(request, "Your cart is empty. Please add items before checking out.")
         return redirect('furniture_app:view_cart')
 
@@ -302,22 +337,50 @@ def checkout(request):
                 messages.error(request, "Please select a shipping address.")
                 return redirect('furniture_app:checkout')
 
-            total_price = cart.get_total_price()
-            order = Order.objects.create(
-                user=request.user,
-                total_price=total_price,
-                status='PENDING',
-                shipping_address=shipping_address,
-                payment_method='COD'
-            )
-            for item in cart.items.all():
-                OrderItem.objects.create(
-                    order=order,
-                    product=item.product,
-                    quantity=item.quantity,
-                    price=item.price
-                )
-            cart.items.all().delete()
+            # The cart lines and the products may be in different databases,
+            # so they are read separately and joined here.
+            total_price = cart.total_price
+            lines = list(cart.items.values_list('product_id', 'quantity', 'price'))
+            products = {
+                pk: (name, image, category)
+                for pk, name, image, category in Product.objects.filter(
+                    pk__in=[product_id for product_id, _, _ in lines]
+                ).values_list('pk', 'name', 'image', 'category')
+            }
+            try:
+                with transaction.atomic():
+                    order = Order.objects.create(
+                        user=request.user,
+                        total_price=total_price,
+                        status='PENDING',
+                        shipping_address=shipping_address,
+                        payment_method='COD',
+                        checkout_key=checkout_key,
+                    )
+                    items = OrderItem.objects.bulk_create([
+                        OrderItem(
+                            order=order,
+                            product_id=product_id,
+                            quantity=quantity,
+                            price=price,
+                            product_name=products[product_id][0],
+                            product_image=products[product_id][1] or '',
+                            product_category=products[product_id][2],
+                        )
+                        for product_id, quantity, price in lines
+                        if product_id in products
+                    ])
+                    # bulk_create skips the post_save signal that keeps the summary's item count.
+                    apply_summary_delta(request.user.pk, items=sum(item.quantity for item in items))
+            except IntegrityError:
+                # A concurrent submit with the same key placed the order first.
+                replay = placed_order_redirect(request.user, checkout_key)
+                if replay is None:
+                    raise
+                return replay
+            # Cleared once the order has committed, in the cart's own database.
+            # Should this fail, the checkout key still stops a second order.
+            clear_cart(cart)
             request.session['cart_item_count'] = 0
             messages.success(request, f"Your order #{order.id} has been placed successfully!")
             return redirect('furniture_app:order_detail', order_pk=order.pk)
@@ -331,14 +394,23 @@ def checkout(request):
         'cart_item_count': cart_item_count,
         'user_addresses': user_addresses,
         'address_form': address_form,
+        'checkout_key': secrets.token_urlsafe(32),
     }
     return render(request, 'payment_method.html', context)
 
 
+def get_order_history_page(user, page):
+    page_size = getattr(settings, 'ORDER_HISTORY_PAGE_SIZE', 10)
+    offset = (page - 1) * page_size
+    orders = order_history(user, offset, page_size + 1)
+    return orders[:page_size], len(orders) > page_size
+
+
 @login_required
 def user_profile(request):
     addresses = request.user.addresses.all()
-    orders = request.user.orders.all().order_by('-order_date').prefetch_related('items__product')
+    orders, has_more_orders = get_order_history_page(request.user, 1)
+    order_summary = get_order_summary(request.user)
 
     # Always initialize both forms so templates never get an unbound variable
     user_profile_form = UserProfileForm(instance=request.user)
@@ -371,6 +443,8 @@ def user_profile(request):
         'user': request.user,
         'addresses': addresses,
         'orders': orders,
+        'has_more_orders': has_more_orders,
+        'order_summary': order_summary,
         'cart_item_count': cart_item_count,
         'user_profile_form': user_profile_form,
         'address_form': address_form,
@@ -378,6 +452,23 @@ def user_profile(request):
     return render(request, 'userprofile.html', context)
 
 
+@login_required
+def user_order_history(request):
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except (ValueError, TypeError):
+        page = 1
+
+    orders, has_more_orders = get_order_history_page(request.user, page)
+    html = render_to_string('order_history_items.html', {'orders': orders}, request=request)
+    return JsonResponse({
+        'success': True,
+        'html': html,
+        'has_next': has_more_orders,
+        'next_page': page + 1 if has_more_orders else None,
+    })
+
+
 @login_required
 def add_address(request):
     if request.method == 'POST':
@@ -445,27 +536,54 @@ def delete_address(request, pk):
 
 @staff_member_required
 def admin_orders_dashboard(request):
-    all_orders = Order.objects.select_related('user', 'shipping_address').prefetch_related('items__product').order_by('-order_date')
+    all_orders = Order.objects.using(reporting_db()).select_related('user', 'shipping_address').order_by('-order_date')
     status_choices = Order.STATUS_CHOICES
 
     cart, cart_item_count = get_or_create_cart(request)
 
     context = {
-        'all_orders': all_orders,
+        'has_orders': all_orders.exists(),
         'status_choices': status_choices,
         'cart_item_count': cart_item_count,
     }
+    if getattr(settings, 'STREAM_LIST_PAGES', True):
+        return stream_list_template(
+            request, 'admin_orders_dashboard.html', 'admin_order_rows.html', context, all_orders, 'orders'
+        )
+    context['all_orders'] = all_orders
     return render(request, 'admin_orders_dashboard.html', context)
 
 
-@login_required 
-def update_order_status(request, order_pk):
-    order = get_object_or_404(Order, pk=order_pk)
+@staff_member_required
+def request_profiles(request):
+    cart, cart_item_count = get_or_create_cart(request)
+
+    context = {
+        'profiles': list_profiles(),
+        'profiling_enabled': getattr(settings, 'PROFILE_REQUESTS', False),
+        'sample_rate': getattr(settings, 'PROFILE_SAMPLE_RATE', 0),
+        'profile_token': make_profile_token(request.user),
+        'token_minutes': getattr(settings, 'PROFILE_TOKEN_MAX_AGE', 3600) // 60,
+        'cart_item_count': cart_item_count,
+    }
+    return render(request, 'request_profiles.html', context)
+
+
+@staff_member_required
+def download_request_profile(request, profile_id):
+    path = profile_path(profile_id)
+    if path is None:
+        raise Http404("No profile matches the given query.")
 
-    is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest' or \
-              request.META.get('HTTP_X_REQUESTED_WITH') == 'XMLHttpRequest'
-    if not request.user.is_staff:
-        if order.user != request.user:
+    # Collapsed stacks, for flamegraph.pl or speedscope.
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name, content_type='text/plain; charset=utf-8')
+
+
+def change_order_status(request, user, order):
+    """The response to ``user`` posting a status change for ``order``."""
+    is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
+    if not user.is_staff:
+        if order.user_id != user.pk:
             message = 'You do not have permission to update this order.'
             if is_ajax:
                 return JsonResponse({'success': False, 'message': message}, status=403)
@@ -485,8 +603,13 @@ def update_order_status(request, order_pk):
         new_status = request.POST.get('status')
 
         if new_status and new_status in [choice[0] for choice in Order.STATUS_CHOICES]:
-            order.status = new_status
-            order.save()
+            if not can_transition(order.status, new_status) or not transition_order(order, new_status):
+                message = f"Order #{order.id} cannot be moved from {order.get_status_display()} to {dict(Order.STATUS_CHOICES)[new_status]}."
+                if is_ajax:
+                    return JsonResponse({'success': False, 'message': message, 'current_status_value': order.status}, status=400)
+                messages.error(request, message)
+                return redirect('furniture_app:admin_view_all_orders' if user.is_staff else 'furniture_app:user_profile')
+
             message = f"Order #{order.id} status updated to {order.get_status_display()}."
 
             if is_ajax:
@@ -510,31 +633,81 @@ def update_order_status(request, order_pk):
     if is_ajax:
         return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
     else:
-        if request.user.is_staff:
+        if user.is_staff:
             return redirect('furniture_app:admin_orders_dashboard')
         else:
-            return redirect('furniture_app:order_detail', order_pk=order_pk)
+            return redirect('furniture_app:order_detail', order_pk=order.pk)
+
+
+@login_required
+def update_order_status(request, order_pk):
+    order = get_object_or_404(Order, pk=order_pk)
+    return change_order_status(request, request.user, order)
+
+
+@staff_member_required
+def bulk_update_order_status(request):
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
+
+    new_status = request.POST.get('status')
+    try:
+        order_ids = [int(pk) for pk in request.POST.getlist('order_ids')]
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Invalid order ids.'}, status=400)
+    if not order_ids:
+        return JsonResponse({'success': False, 'message': 'No orders selected.'}, status=400)
+
+    try:
+        results = bulk_transition(order_ids, new_status)
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Invalid status provided.'}, status=400)
+
+    updated = sum(1 for result in results if result['success'])
+    return JsonResponse({
+        'success': True,
+        'message': f"{updated} of {len(results)} orders updated.",
+        'updated': updated,
+        'results': results,
+    })
+
+
+def remove_order(user, order):
+    """Delete ``order`` (live or archived) from ``user``'s list if they may."""
+    if order.user_id != user.pk and not user.is_staff:
+        return JsonResponse({'success': False, 'message': 'You do not have permission to delete this order.'}, status=403)
+    
+    if order.status != 'CANCELLED' and not user.is_staff:
+        return JsonResponse({'success': False, 'message': 'Only cancelled orders can be removed from your list.'}, status=400)
+    
+    message = f'Order #{order.pk} has been removed from your list.'
+    if getattr(order, 'is_archived', False):
+        delete_archived_order(order)
+    else:
+        order.delete()
+    return JsonResponse({'success': True, 'message': message})
 
 
 @login_required
 def delete_order(request, order_pk):
     if request.method == 'POST':
-        order = get_object_or_404(Order, pk=order_pk)
-        if order.user != request.user and not request.user.is_staff:
-            return JsonResponse({'success': False, 'message': 'You do not have permission to delete this order.'}, status=403)
-        
-        if order.status != 'CANCELLED' and not request.user.is_staff:
-            return JsonResponse({'success': False, 'message': 'Only cancelled orders can be removed from your list.'}, status=400)
-        
-        order.delete()
-        return JsonResponse({'success': True, 'message': f'Order #{order_pk} has been removed from your list.'})
+        order = find_order(order_pk)
+        if order is None:
+            raise Http404("No order matches the given query.")
+        return remove_order(request.user, order)
     return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
 
 
 def signup_view(request):
+    status = 200
     if request.method == 'POST':
         form = CustomUserCreationForm(request.POST)
-        if form.is_valid():
+        wait = check_auth_throttle(request, 'signup')
+        if wait:
+            form = CustomUserCreationForm(initial={'username': request.POST.get('username', '')})
+            messages.error(request, f"Too many sign-up attempts. Please try again in {math.ceil(wait)} seconds.")
+            status = 429
+        elif form.is_valid():
             user = form.save()
             login(request, user)
             messages.success(request, "Account created successfully!")
@@ -542,18 +715,27 @@ def signup_view(request):
     else:
         form = CustomUserCreationForm()
     
-    cart, cart_item_count = get_or_create_cart(request)
     context = {
         'form': form,
-        'cart_item_count': cart_item_count,
+        'cart_item_count': get_cart_item_count(request),
     }
-    return render(request, 'signup.html', context)
+    response = render(request, 'signup.html', context, status=status)
+    if status == 429:
+        response['Retry-After'] = str(math.ceil(wait))
+    return response
 
 
 def login_view(request):
+    status = 200
     if request.method == 'POST':
         form = AuthenticationForm(request, data=request.POST)
-        if form.is_valid():
+        # Throttled attempts are turned away before the password is hashed.
+        wait = check_auth_throttle(request, 'login', request.POST.get('username'))
+        if wait:
+            form = AuthenticationForm(request, initial={'username': request.POST.get('username', '')})
+            messages.error(request, f"Too many login attempts. Please try again in {math.ceil(wait)} seconds.")
+            status = 429
+        elif form.is_valid():
             user = form.get_user()
             login(request, user)
             messages.success(request, f"Welcome back, {user.username}!")
@@ -561,12 +743,14 @@ def login_view(request):
     else:
         form = AuthenticationForm()
     
-    cart, cart_item_count = get_or_create_cart(request)
     context = {
         'form': form,
-        'cart_item_count': cart_item_count,
+        'cart_item_count': get_cart_item_count(request),
     }
-    return render(request, 'login.html', context)
+    response = render(request, 'login.html', context, status=status)
+    if status == 429:
+        response['Retry-After'] = str(math.ceil(wait))
+    return response
 
 
 def logout_view(request):
@@ -576,12 +760,18 @@ def logout_view(request):
 
 
 def order_detail(request, order_pk):
-    order = get_object_or_404(Order.objects.select_related('user', 'shipping_address'), pk=order_pk)
+    order = find_order(
+        order_pk,
+        Order.objects.select_related('user', 'shipping_address'),
+        ArchivedOrder.objects.select_related('user', 'shipping_address'),
+    )
+    if order is None:
+        raise Http404("No order matches the given query.")
     if not request.user.is_staff and order.user != request.user:
         messages.error(request, "You do not have permission to view this order.")
         return redirect('furniture_app:user_profile')
 
-    order_items = order.items.select_related('product').all()
+    order_items = order.items.all()
     
     cart, cart_item_count = get_or_create_cart(request)
 
@@ -0,0 +1,110 @@
+"""
+Warm a freshly started process before it serves traffic.
+
+Each stage takes one kind of cold-start cost off the first requests:
+
+* modules: import every app module and build the URL resolver's reverse maps.
+* templates: compile every template, which fills the cached template loader
+  (used whenever DEBUG is off) and loads the template tag libraries.
+* database: scan the catalog tables and the trending index so their pages
+  are in the OS page cache.
+* caches: prime the banner schedule, the catalog snapshot (with
+  CATALOG_ENGINE), and the anonymous page cache for the index page, each
+  category and the WARM_PRODUCT_PAGES most popular products.
+
+``manage.py warm_caches`` runs the stages after a deploy; gunicorn.conf.py
+runs them in the master before workers fork, so every worker starts warm.
+"""
+
+import pkgutil
+import time
+from importlib import import_module
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Count, Max
+from django.template import TemplateSyntaxError, engines
+from django.test import RequestFactory
+from django.urls import get_resolver, reverse
+
+from . import views
+from .banners import get_banner_schedule
+from .models import Product, ProductStats, SaleBanner
+
+
+def warm_modules():
+    package = import_module(__package__)
+    names = [name for _, name, _ in pkgutil.iter_modules(package.__path__) if name != 'tests']
+    for name in names:
+        import_module(f'{__package__}.{name}')
+    resolver = get_resolver()
+    resolver.reverse_dict
+    return f'{len(names)} modules, {len(resolver.url_patterns)} URL patterns'
+
+
+def warm_templates():
+    compiled = failed = 0
+    for engine in engines.all():
+        for directory in map(Path, dict.fromkeys(engine.template_dirs)):
+            for path in sorted(p for p in directory.rglob('*') if p.is_file()):
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                    compiled += 1
+                except (TemplateSyntaxError, UnicodeDecodeError):
+                    failed += 1
+    return f'{compiled} templates' + (f', {failed} skipped' if failed else '')
+
+
+def warm_database():
+    # Aggregates over unindexed columns read every table page; COUNT of the
+    # trending score walks its index.
+    products = Product.objects.aggregate(n=Count('name'), latest=Max('updated_at'))['n']
+    stats = ProductStats.objects.aggregate(n=Count('trending_score'))['n']
+    banners = SaleBanner.objects.aggregate(n=Count('title'))['n']
+    return f'{products} products, {stats} product stats, {banners} banners'
+
+
+def _render_anonymous(view, path, **kwargs):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return view(request, **kwargs).status_code == 200
+
+
+def warm_caches():
+    schedule = get_banner_schedule()
+    if getattr(settings, 'CATALOG_ENGINE', False):
+        from .catalog_engine import get_snapshot
+        get_snapshot()
+
+    if not getattr(settings, 'ANONYMOUS_PAGE_CACHE', True):
+        return f'{len(schedule[0])} banners'
+
+    index_url = reverse('furniture_app:index')
+    pages = [_render_anonymous(views.index, index_url)]
+    pages += [_render_anonymous(views.index, f'{index_url}?category={value}') for value, _ in Product.CATEGORY_CHOICES]
+
+    count = getattr(settings, 'WARM_PRODUCT_PAGES', 50)
+    product_ids = list(ProductStats.objects.order_by('-trending_score').values_list('product_id', flat=True)[:count])
+    product_ids += [banner.featured_product_id for banner in schedule[0] if banner.featured_product_id not in product_ids]
+    # Skip count_product_views: warming is not a visit.
+    product_detail = views.product_detail.__wrapped__
+    for pk in product_ids:
+        pages.append(_render_anonymous(product_detail, reverse('furniture_app:product_detail', args=[pk]), pk=pk))
+    return f'{len(schedule[0])} banners, {sum(pages)} pages'
+
+
+STAGES = {
+    'modules': warm_modules,
+    'templates': warm_templates,
+    'database': warm_database,
+    'caches': warm_caches,
+}
+
+
+def warm_up(stages=tuple(STAGES)):
+    """Run ``stages`` in order, yielding ``(stage, seconds, summary)`` for each."""
+    for stage in stages:
+        start = time.perf_counter()
+        summary = STAGES[stage]()
+        yield stage, time.perf_counter() - start, summary
@@ -0,0 +1,40 @@
+"""
+gunicorn settings: ``gunicorn -c gunicorn.conf.py``
+
+The app is loaded once in the master and warmed there (furniture_app.warmup)
+before any worker forks, so workers inherit the imported code and compiled
+templates and find the shared caches and OS page cache already filled. Set
+GUNICORN_PRELOAD=false (for example to use --reload) and each worker warms
+itself after loading the app instead.
+"""
+
+import os
+
+wsgi_app = 'myfurniture_app.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+
+def _warm(log):
+    from furniture_app.warmup import warm_up
+
+    for stage, seconds, summary in warm_up():
+        log.info("warm-up %s: %.0f ms (%s)", stage, seconds * 1000, summary)
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from django.core.cache import caches
+    from django.db import connections
+
+    _warm(server.log)
+    # Workers must open their own database and cache connections.
+    connections.close_all()
+    caches.close_all()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        _warm(worker.log)
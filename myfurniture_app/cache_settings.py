@@ -0,0 +1,59 @@
+"""
+Cache configuration for myfurniture_app.
+
+Every gunicorn worker has to see the same cache, otherwise invalidating the
+catalog in one worker leaves stale pages in the others. The backend is picked
+from the CACHE_BACKEND environment variable:
+
+    file    (default) a directory shared by all workers on the host
+    db      a SQLite table, created with ``manage.py createcachetable``
+    redis   Redis at REDIS_URL, falling back to ``file`` if redis-py is missing
+    locmem  per-process memory, only useful for local experiments
+
+The file backend's add() is not atomic across processes, so the recompute
+locks in furniture_app.caching only cut a stampede down rather than removing
+it; db and redis give a real lock.
+
+Each subsystem gets its own alias with a KEY_PREFIX so keys never collide and
+one namespace can be cleared without touching the others.
+"""
+
+import importlib.util
+import os
+
+CACHE_NAMESPACES = ('catalog', 'cart', 'product', 'sessions')
+
+
+def _backend(base_dir):
+    kind = os.environ.get('CACHE_BACKEND', 'file')
+
+    if kind == 'redis' and importlib.util.find_spec('redis'):
+        return {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+        }
+    if kind == 'db':
+        return {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'furniture_cache',
+            'OPTIONS': {'MAX_ENTRIES': 50000},
+        }
+    if kind == 'locmem':
+        return {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'furniture',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', str(base_dir / '.cache')),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    }
+
+
+def build_caches(base_dir):
+    backend = _backend(base_dir)
+    caches = {'default': {**backend, 'KEY_PREFIX': 'default'}}
+    for namespace in CACHE_NAMESPACES:
+        caches[namespace] = {**backend, 'KEY_PREFIX': namespace}
+    return caches
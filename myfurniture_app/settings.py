@@ -2,9 +2,12 @@
 Django settings for myfurniture_app project.
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
+from .cache_settings import build_caches
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-dev-key-change-me-in-production'
@@ -24,7 +27,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'furniture_app.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'furniture_app.compression.CompressionMiddleware',
+    'furniture_app.routers.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -56,10 +62,77 @@ WSGI_APPLICATION = 'myfurniture_app.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DB_PATH', BASE_DIR / 'db.sqlite3'),
+        # Take the write lock when a transaction starts rather than failing
+        # with "database is locked" when a read transaction tries to upgrade.
+        # Under ASGI many requests in one process hold connections at once.
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
     }
 }
 
+# Optional read replica for catalog and reporting reads. Locally this is a
+# second SQLite file refreshed with ``manage.py sync_replica``.
+if os.environ.get('DB_REPLICA_PATH'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DB_REPLICA_PATH'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Optional separate database for carts, cart lines and sessions, so their
+# writes take a different SQLite write lock from orders and admin edits. Run
+# ``manage.py migrate --database carts`` after setting it.
+if os.environ.get('DB_CARTS_PATH'):
+    DATABASES['carts'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DB_CARTS_PATH'],
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+    }
+
+DATABASE_ROUTERS = ['furniture_app.routers.CartsRouter', 'furniture_app.routers.ReplicaRouter']
+
+# Seconds since the last sync before the replica counts as stale, and how long
+# a browser keeps reading from the primary after it writes.
+REPLICA_MAX_LAG = 60
+REPLICA_STICKY_SECONDS = 10
+
+CACHES = build_caches(BASE_DIR)
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Hit/miss counters for the cache helpers in furniture_app.caching. Each
+# count is an extra read-modify-write on the shared cache (it doubles the
+# cost of a page-cache hit on the file backend, and concurrent processes
+# there can lose increments), so only turn this on while investigating.
+CACHE_STATS = os.environ.get('CACHE_STATS', 'false').lower() == 'true'
+
+# Hash new passwords with Argon2 or bcrypt when their packages are installed.
+# PBKDF2 stays in the list so existing hashes still verify; Django rehashes
+# them with the preferred hasher on the user's next successful login.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if importlib.util.find_spec('bcrypt'):
+    PASSWORD_HASHERS.insert(0, 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher')
+if importlib.util.find_spec('argon2'):
+    PASSWORD_HASHERS.insert(0, 'django.contrib.auth.hashers.Argon2PasswordHasher')
+
+# Token-bucket limits for login/signup attempts (furniture_app.throttle).
+AUTH_THROTTLE_RATES = {
+    'login_ip': '30/m',
+    'login_username': '10/m',
+    'signup_ip': '5/m',
+}
+# How many reverse proxies sit in front of the app. gunicorn.conf.py binds to
+# 127.0.0.1 for a proxy such as nginx, so set NUM_PROXIES=1 there; otherwise
+# every request has the proxy's address and the per-IP limits above become
+# one limit shared by all clients. Leave it at 0 when clients connect
+# directly, or they could pick their own address with X-Forwarded-For.
+NUM_PROXIES = int(os.environ.get('NUM_PROXIES', 0))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -74,6 +147,18 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'furniture_app' / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Serve the per-page CSS and JavaScript bundles built by
+# `manage.py build_assets` (hashed, pre-compressed, collected into
+# STATIC_ROOT) and let wsgi.py serve STATIC_ROOT with far-future cache
+# headers. Off in development.
+ASSET_BUNDLES = os.environ.get('ASSET_BUNDLES', 'false').lower() == 'true'
+if ASSET_BUNDLES:
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'furniture_app.storage.CompressedManifestStaticFilesStorage'},
+    }
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'furniture_app' / 'media'
@@ -83,3 +168,61 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/login/'
+
+# Full-page HTML cache for logged-out visitors on the storefront pages.
+ANONYMOUS_PAGE_CACHE = True
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 300
+
+# Orders shown per page in the profile's order history.
+ORDER_HISTORY_PAGE_SIZE = 10
+
+# Delivered and cancelled orders older than this are moved to the archive
+# tables by `manage.py archive_orders`.
+ORDER_ARCHIVE_AFTER_DAYS = 365
+
+# Answer index filters from an in-process snapshot of the catalog instead of
+# querying Product on every request (furniture_app.catalog_engine).
+CATALOG_ENGINE = False
+
+# Responses smaller than this (in bytes) are sent uncompressed.
+COMPRESSION_MIN_SIZE = 1024
+
+# Stream long list pages (the admin orders dashboard) row chunk by row chunk
+# instead of rendering them whole before sending anything.
+STREAM_LIST_PAGES = True
+
+# Product view/add-to-cart counters are buffered per process and written to
+# ProductStats at most this often (seconds) or once this many products are
+# waiting. Trending scores halve in weight every TRENDING_HALF_LIFE_HOURS.
+PRODUCT_STATS_FLUSH_INTERVAL = 30
+PRODUCT_STATS_MAX_PENDING = 500
+TRENDING_HALF_LIFE_HOURS = 24
+
+# Cart lines follow product price/sale changes (furniture_app.repricing),
+# this many lines per transaction, on a background thread after commit.
+CART_REPRICING_CHUNK_SIZE = 5000
+CART_REPRICING_BACKGROUND = True
+
+# Route the cart and order JSON endpoints to furniture_app.async_views. Turn
+# on when serving myfurniture_app.asgi; under WSGI the sync views are faster.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'false').lower() == 'true'
+
+# Product changelist for very large catalogs: estimated counts, keyset pages,
+# cached filter counts and full-text search (furniture_app.admin_performance).
+ADMIN_PERFORMANCE_MODE = os.environ.get('ADMIN_PERFORMANCE_MODE', 'false').lower() == 'true'
+
+# Product pages primed in the anonymous page cache by `manage.py warm_caches`
+# and the gunicorn warm-up (furniture_app.warmup), most popular first.
+WARM_PRODUCT_PAGES = 50
+
+# Request profiling (furniture_app.profiling). When on, requests with a valid
+# X-Profile token from the staff profiles page, and one in PROFILE_SAMPLE_RATE
+# requests if that is set, have their stack sampled every PROFILE_INTERVAL
+# seconds. The last PROFILE_KEEP profiles are kept in PROFILE_DIR. When off,
+# the middleware is not loaded at all.
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS', 'false').lower() == 'true'
+PROFILE_SAMPLE_RATE = int(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_INTERVAL = 0.001
+PROFILE_TOKEN_MAX_AGE = 3600
+PROFILE_KEEP = 200
+PROFILE_DIR = BASE_DIR / '.profiles'
@@ -0,0 +1,104 @@
+"""
+WSGI middleware that serves collected static files straight from STATIC_ROOT,
+ahead of Django.
+
+Files whose names carry a manifest hash are immutable, so they get a one-year
+Cache-Control; anything else is revalidated after a short max-age. When the
+client accepts it, the pre-built .br or .gz copy is sent instead of the
+original.
+"""
+
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote
+
+from furniture_app.compression import accepted_encoding
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticFilesMiddleware:
+    def __init__(self, application, root, prefix='/static/'):
+        self.application = application
+        self.root = os.path.realpath(root)
+        self.prefix = prefix
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if not path.startswith(self.prefix) or environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            return self.application(environ, start_response)
+
+        filename = self.find_file(path[len(self.prefix):])
+        if filename is None:
+            return self.application(environ, start_response)
+        return self.serve(environ, start_response, filename)
+
+    def find_file(self, name):
+        filename = os.path.realpath(os.path.join(self.root, unquote(name)))
+        if not filename.startswith(self.root + os.sep) or not os.path.isfile(filename):
+            return None
+        return filename
+
+    def pick_encoding(self, environ, filename):
+        available = [encoding for encoding, suffix in ENCODINGS if os.path.isfile(filename + suffix)]
+        encoding = accepted_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''), available)
+        if not encoding:
+            return None, filename
+        return encoding, filename + dict(ENCODINGS)[encoding]
+
+    def serve(self, environ, start_response, filename):
+        encoding, path = self.pick_encoding(environ, filename)
+        stat = os.stat(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+        content_type, _ = mimetypes.guess_type(filename)
+        if content_type and (content_type.startswith('text/') or content_type == 'application/javascript'):
+            content_type += '; charset=utf-8'
+
+        headers = [
+            ('Cache-Control', IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(filename) else DEFAULT_CACHE_CONTROL),
+            ('ETag', etag),
+            ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        if self.not_modified(environ, etag, stat.st_mtime):
+            start_response('304 Not Modified', headers)
+            return []
+
+        headers += [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Content-Length', str(stat.st_size)),
+        ]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+
+        f = open(path, 'rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper:
+            return file_wrapper(f, 64 * 1024)
+        return _iter_file(f)
+
+    def not_modified(self, environ, etag, mtime):
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def _iter_file(f, block_size=64 * 1024):
+    with f:
+        while chunk := f.read(block_size):
+            yield chunk
@@ -1,5 +1,10 @@
 import os
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myfurniture_app.settings')
 application = get_wsgi_application()
+
+if settings.ASSET_BUNDLES:
+    from .static_serving import StaticFilesMiddleware
+    application = StaticFilesMiddleware(application, settings.STATIC_ROOT, settings.STATIC_URL)